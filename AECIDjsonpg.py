@@ -25,23 +25,36 @@ __maintainer__ = "Georg Hoeld"
 __status__ = "Production"
 __version__ = "1.0.0"
 
+import argparse
+import ast
+import contextlib
+import functools
+import gzip
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import re
+import signal
+import sys
+import threading
+import time
+import zlib
+
+import JSONPGColumns
 import JSONPGConfig
+import JSONPGInput
+import JSONPGStatistics
 
 
-# Sanitizes entry by replacing the backslashes of escape characters with double backslashes
+# Sanitizes entry by replacing the backslashes of escape characters with double backslashes. The backslashes are replaced first,
+# so that the backslashes of the replaced tabulators and quotation marks are not doubled.
 def sanitize_entry(entry):
     if type(entry) is str:
-        return_string = ''
-        for i in range(len(entry)):
-            if entry[i] == '\t':
-                return_string += '\\t'
-            elif entry[i] == '\\':
-                return_string += '\\\\'
-            elif entry[i] == '\"':
-                return_string += '\\"'
-            else:
-                return_string += entry[i]
-        return return_string
+        return entry.replace('\\', '\\\\').replace('\t', '\\t').replace('"', '\\"')
     return entry
 
 
@@ -75,6 +88,78 @@ def follows_format(string_format, word):
     except:
         return False
 
+# Regular expression for the strings that can be converted with int().
+int_pattern = r'\s*[+-]?\d+(?:_\d+)*\s*'
+
+# This function compiles the string_format into a fast and an exact regular expression for follows_format or returns None.
+def compile_date_format(string_format):
+    if len(string_format) < 2 or string_format[0] != '%':
+        return None
+    pattern = ''
+    digit_pattern = ''
+    i = 0
+    while i < len(string_format):
+        # Every wildcard consists of '%' and one character.
+        if string_format[i] != '%' or i + 1 >= len(string_format):
+            return None
+        i += 2
+        if i == len(string_format):
+            # follows_format accepts any single character or a number after the last separator.
+            pattern += '(?:.|' + int_pattern + ')'
+            digit_pattern += '(?:.|[0-9]+)'
+            break
+        separator = string_format[i]
+        i += 1
+        if separator == '%' or separator.isdigit() or separator == '_':
+            return None
+        # The number of a wildcard ends at the first occurrence of the separator after its first character, so the separator is
+        # only allowed as first character of the number.
+        escaped_separator = re.escape(separator)
+        if separator in '+-':
+            other_sign = '+' if separator == '-' else '-'
+            pattern += '(?:' + escaped_separator + r'\d+(?:_\d+)*\s*|\s*' + re.escape(other_sign) + r'?\d+(?:_\d+)*\s*)'
+        elif separator.isspace():
+            other_space = r'[^\S' + escaped_separator + ']'
+            pattern += '(?:' + escaped_separator + '|' + other_space + ')?' + other_space + r'*[+-]?\d+(?:_\d+)*' + other_space + '*'
+        else:
+            pattern += int_pattern
+        pattern += escaped_separator
+        digit_pattern += '[0-9]+' + escaped_separator
+        if i == len(string_format):
+            # follows_format also accepts a last separator that is the start of a number.
+            if separator in '+-':
+                pattern += r'(?:\d+(?:_\d+)*\s*)?'
+            elif separator.isspace():
+                pattern += '(?:' + int_pattern + ')?'
+    return re.compile(digit_pattern, re.DOTALL), re.compile(pattern, re.DOTALL)
+
+# This function returns the cached function that checks if a word follows the date_format.
+def get_date_format_matcher(date_format):
+    if date_format not in date_format_matchers:
+        regexes = compile_date_format(date_format)
+        if regexes is None:
+            date_format_matchers[date_format] = lambda word: follows_format(date_format, word)
+        else:
+            digit_fullmatch = regexes[0].fullmatch
+            fullmatch = regexes[1].fullmatch
+            date_format_matchers[date_format] = lambda word: type(word) is str and (
+                    digit_fullmatch(word) is not None or fullmatch(word) is not None)
+    return date_format_matchers[date_format]
+
+# This function returns a function that checks if all strings of a column follow the date_format. The strings are matched in one batch
+# with the regular expressions of the date format like by get_date_format_matcher.
+def get_date_format_column_matcher(date_format):
+    if date_format not in date_format_column_matchers:
+        regexes = compile_date_format(date_format)
+        if regexes is None:
+            matcher = get_date_format_matcher(date_format)
+            date_format_column_matchers[date_format] = lambda strings: all(map(matcher, strings))
+        else:
+            digit_fullmatch = regexes[0].fullmatch
+            fullmatch = regexes[1].fullmatch
+            date_format_column_matchers[date_format] = lambda strings: JSONPGColumns.match_all(strings, digit_fullmatch, fullmatch)
+    return date_format_column_matchers[date_format]
+
 # This function returns the string and adds quotation marks, if the string starts with a not alphabetical character.
 def add_quotation_marks(string):
     if string[0].isalpha() or (
@@ -87,134 +172,1257 @@ def add_quotation_marks(string):
 
 # This function removes all characters of char_list from the string and adds quotation marks if the string is a integer or float.
 def remove_characters(string, char_list):
+    return remove_characters_cached(string, tuple(char_list))
+
+# This function implements remove_characters. The results are cached, because the same ids are generated many times while the
+# parser is emitted.
+@functools.lru_cache(maxsize=None, typed=True)
+def remove_characters_cached(string, char_tuple):
     if  type(string) is int or type(string) is float or ('_' in string and (string[:string.index('_')].isdigit() or (
             '.' in string and string[:string.index('.')].isdigit() and string[string.index('.') + 1:string.index('_')].isdigit()))) or (
             string.isdigit() or ('.' in string and string[:string.index('.')].isdigit() and string[string.index('.') + 1:].isdigit())):
         string = "\"" + str(string) + "\""
     elif type(string) is str:
-        for i in range(len(string)-1, -1, -1):
-            if string[i] in char_list:
-                string = string[:i] + string[i + 1:]
+        string = string.translate(str.maketrans('', '', ''.join(char for char in char_tuple if len(char) == 1)))
     return string
 
-# This function returns True if a dictionary is included in the object and False otherwise.
-def includes_dict(obj):
-    if type(obj) is dict:
-        return True
-    elif type(obj) is list:
-        return any(includes_dict(sublist) for sublist in obj)
-    else:
+# This function returns True if a dictionary is included in the object and False otherwise. The nested lists are searched with a
+# stack. If dict_lists is set, the results of the object and of all searched nested lists are stored in it by the ids of the lists,
+# so that the nested lists of a record are not searched again at every level. It must only be used while the lists exist.
+def includes_dict(obj, dict_lists=None):
+    if type(obj) is not list:
+        return type(obj) is dict
+    if dict_lists is None:
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            if type(obj) is dict:
+                return True
+            if type(obj) is list:
+                stack.extend(obj)
         return False
+    found = dict_lists.get(id(obj))
+    if found is not None:
+        return found
+    # The stack holds the lists with the iterators of their remaining elements. A list includes a dictionary if one of its elements
+    # is a dictionary or a list, which includes a dictionary.
+    stack = [(obj, iter(obj))]
+    found = False
+    while stack:
+        current, elements = stack[-1]
+        if not found:
+            for element in elements:
+                if type(element) is dict:
+                    found = True
+                    break
+                if type(element) is list:
+                    found = dict_lists.get(id(element))
+                    if found is None:
+                        found = False
+                        stack.append((element, iter(element)))
+                        break
+                    if found:
+                        break
+            else:
+                dict_lists[id(current)] = False
+                stack.pop()
+                continue
+            if not found:
+                # Search the nested list first.
+                continue
+        dict_lists[id(current)] = True
+        stack.pop()
+    return found
 
-# This function converts all lists into tuples.
+# This function converts all lists into tuples. The stack holds the iterators of the nested lists with their converted entries.
 def convert_to_tuples(dictionary):
-    if type(dictionary) is list:
-        return_tuple = []
-        for entry in dictionary:
-            return_tuple.append(convert_to_tuples(entry))
-        return_tuple = tuple(return_tuple)
-        return return_tuple
-    return sanitize_entry(dictionary)
-
-# This function converts all tuples and sets into lists.
+    if type(dictionary) is not list:
+        return sanitize_entry(dictionary)
+    stack = [(iter(dictionary), [])]
+    while True:
+        entries, return_tuple = stack[-1]
+        for entry in entries:
+            if type(entry) is list:
+                stack.append((iter(entry), []))
+                break
+            return_tuple.append(sanitize_entry(entry))
+        else:
+            stack.pop()
+            if not stack:
+                return tuple(return_tuple)
+            stack[-1][1].append(tuple(return_tuple))
+
+# This function converts all tuples and sets into lists. The nested tuples and sets are converted with a stack like in
+# convert_to_tuples.
 def convert_to_lists(dictionary):
-    if type(dictionary) is set or type(dictionary) is tuple:
-        return_list = []
-        for entry in dictionary:
-            return_list.append(convert_to_lists(entry))
-        return return_list
-    return dictionary
+    if type(dictionary) is not set and type(dictionary) is not tuple:
+        return dictionary
+    stack = [(iter(dictionary), [])]
+    while True:
+        entries, return_list = stack[-1]
+        for entry in entries:
+            if type(entry) is set or type(entry) is tuple:
+                stack.append((iter(entry), []))
+                break
+            return_list.append(entry)
+        else:
+            stack.pop()
+            if not stack:
+                return return_list
+            stack[-1][1].append(return_list)
+
+# This function returns the string of the value, in which all tuples and sets are written as lists, like str(convert_to_lists()).
+# The nested tuples and sets are written with a stack.
+def convert_to_string(value):
+    if type(value) is not set and type(value) is not tuple and type(value) is not list:
+        return str(value)
+    parts = ['[']
+    stack = [iter(value)]
+    first = True
+    while stack:
+        for entry in stack[-1]:
+            if not first:
+                parts.append(', ')
+            if type(entry) is set or type(entry) is tuple or type(entry) is list:
+                parts.append('[')
+                stack.append(iter(entry))
+                first = True
+                break
+            parts.append(repr(entry))
+            first = False
+        else:
+            stack.pop()
+            parts.append(']')
+            first = False
+    return ''.join(parts)
+
+# The number of distinct values of an end node, which are not stored, is estimated with a HyperLogLog sketch of
+# 2**distinct_sketch_bits registers, which has a standard error of about 3 %. The values are collected and added to the
+# sketch in batches of unsketched_value_max_num distinct values.
+distinct_sketch_bits = 10
+unsketched_value_max_num = 1024
+
+# This function adds the values to the HyperLogLog sketch. The values are hashed with crc32 instead of hash, which differs
+# between the processes, and the checksum is mixed so that all bits are distributed evenly.
+def add_to_sketch(sketch, values):
+    rank_bits = 32 - distinct_sketch_bits
+    rank_mask = (1 << rank_bits) - 1
+    crc32 = zlib.crc32
+    for value in values:
+        if type(value) is not str:
+            value = repr(value)
+        value_hash = (crc32(value.encode('utf-8', 'surrogatepass')) * 0x9E3779B1) & 0xffffffff
+        value_hash ^= value_hash >> 16
+        # The first bits select the register, which holds the maximal position of the first set bit of the other bits.
+        rank = rank_bits - (value_hash & rank_mask).bit_length() + 1
+        if rank > sketch[value_hash >> rank_bits]:
+            sketch[value_hash >> rank_bits] = rank
+
+# This function returns the estimated number of distinct values of the HyperLogLog sketch. Small numbers are estimated from the
+# number of empty registers.
+def get_sketch_estimate(sketch):
+    register_num = len(sketch)
+    estimate = 0.7213 / (1 + 1.079 / register_num) * register_num * register_num / sum(2.0 ** -rank for rank in sketch)
+    empty_register_num = sketch.count(0)
+    if estimate <= 2.5 * register_num and empty_register_num > 0:
+        estimate = register_num * math.log(register_num / empty_register_num)
+    return estimate
+
+# This class summarizes the values of an end node of the parser_dict. Instead of storing every value that appears, it stores
+# at most list_element_max_num + 1 distinct values and updates the properties that are needed to choose the type of the end
+# node whenever a new value is added. Lists are stored as tuples and their types and date formats are derived from the first
+# element of the tuple. The number of distinct values beyond the stored values is estimated with a sketch.
+class LeafSummary:
+    __slots__ = ('values', 'has_tuple', 'has_non_tuple', 'all_int', 'all_number', 'negative', 'date_formats', 'chars', 'fragment',
+                 'distinct_sketch', 'unsketched_values')
+
+    def __init__(self, value=None):
+        # The stored distinct values. If the number of values exceeds list_element_max_num no further values are stored.
+        self.values = set()
+        # The HyperLogLog sketch of all distinct values, which is generated when the first value is not stored, and the values,
+        # which still have to be added to the sketch.
+        self.distinct_sketch = None
+        self.unsketched_values = None
+        self.has_tuple = False
+        self.has_non_tuple = False
+        self.all_int = True
+        self.all_number = True
+        self.negative = False
+        # The date formats of date_format_list that all values follow.
+        self.date_formats = list(date_format_list)
+        # The characters that appear in the values and the sequences of multi_char_sequences that appear in the values.
+        self.chars = set()
+        # The rendered fragment of the parser node of the summary, which is invalidated when the end node changes.
+        self.fragment = None
+        if value is not None:
+            self.add(value)
+
+    # The rendered fragments are not pickled, e.g., in snapshots.
+    def __getstate__(self):
+        return get_slot_state(self)
+
+    def __setstate__(self, state):
+        # Snapshots of earlier versions do not hold the sketch.
+        self.distinct_sketch = None
+        self.unsketched_values = None
+        set_slot_state(self, state)
+
+    # This method adds a sanitized value to the summary and counts its changes in model_change_count and structure_change_count.
+    def add(self, value):
+        global model_change_count, structure_change_count
+        values = self.values
+        if value in values:
+            return
+        change_count = model_change_count
+        if len(values) <= max(list_element_max_num, 1):
+            # The values are stored until the list is exceeded, i.e., until the wordlist turns into a variable.
+            if len(values) == 0:
+                structure_change_count += 1
+            values.add(value)
+            model_change_count += 1
+        else:
+            if self.distinct_sketch is None:
+                self.update_sketch()
+            self.unsketched_values.add(value)
+            if len(self.unsketched_values) >= unsketched_value_max_num:
+                self.update_sketch()
+
+        if type(value) is tuple:
+            if not self.has_tuple:
+                self.has_tuple = True
+                model_change_count += 1
+                structure_change_count += 1
+            first_value = value[0] if len(value) > 0 else None
+            strings = [val for val in value if type(val) is str]
+        else:
+            if not self.has_non_tuple:
+                self.has_non_tuple = True
+                model_change_count += 1
+                structure_change_count += 1
+            first_value = value
+            strings = [value] if type(value) is str else []
+
+        if type(first_value) is not int and self.all_int:
+            self.all_int = False
+            model_change_count += 1
+        if type(first_value) is not int and type(first_value) is not float and self.all_number:
+            self.all_number = False
+            model_change_count += 1
+        if (type(first_value) is int or type(first_value) is float) and first_value < 0 and not self.negative:
+            self.negative = True
+            model_change_count += 1
+        for date_format in self.date_formats:
+            if not get_date_format_matcher(date_format)(first_value):
+                self.date_formats = [date_format for date_format in self.date_formats if
+                                     get_date_format_matcher(date_format)(first_value)]
+                model_change_count += 1
+                break
+        chars = self.chars
+        char_num = len(chars)
+        for string in strings:
+            chars.update(string)
+            # Sequences of several characters in optional_dict_chars, like the sanitized escape characters, are added separately.
+            for sequence in multi_char_sequences:
+                if sequence not in chars and sequence in string:
+                    chars.add(sequence)
+        if len(chars) != char_num:
+            model_change_count += 1
+        if model_change_count != change_count:
+            invalidate_fragment(self.fragment)
+
+    # This method adds the values of a column, i.e., the values of the end node in a batch of log lines, to the summary like add in
+    # the order of the column. The values are sanitized and the new distinct values are classified in one batch with the checks of
+    # JSONPGColumns. The column must neither hold lists nor null values. The values are added one by one if the summary is empty,
+    # since the first value changes the structure, or if the column holds integers and floats, since add skips a value, which is
+    # equal to a stored value of the other type.
+    def add_column(self, column):
+        global model_change_count
+        values = self.values
+        distinct_values = list(dict.fromkeys(column))
+        types = JSONPGColumns.get_value_types(distinct_values)
+        if not values or self.has_tuple or not self.has_non_tuple or tuple in types or list in types or (
+                int in types and float in types):
+            for value in column:
+                self.add(sanitize_entry(value))
+            return
+        if str in types:
+            strings = distinct_values if len(types) == 1 else [value for value in distinct_values if type(value) is str]
+            if JSONPGColumns.contains_any(strings, ('\\', '\t', '"')):
+                distinct_values = [sanitize_entry(value) for value in distinct_values]
+        new_values = [value for value in distinct_values if value not in values]
+        if not new_values:
+            return
+
+        change_count = model_change_count
+        max_num = max(list_element_max_num, 1)
+        stored_num = 0
+        for value in new_values:
+            # The values are stored until the list is exceeded, i.e., until the wordlist turns into a variable.
+            if len(values) > max_num:
+                break
+            values.add(value)
+            stored_num += 1
+            model_change_count += 1
+        if stored_num < len(new_values):
+            self.add_distinct(new_values[stored_num:])
+        types = JSONPGColumns.get_value_types(new_values)
+        if self.all_int and types != {int}:
+            self.all_int = False
+            model_change_count += 1
+        if self.all_number and not types <= {int, float}:
+            self.all_number = False
+            model_change_count += 1
+        if not self.negative and (int in types or float in types):
+            numbers = new_values if types <= {int, float} else [value for value in new_values if type(value) in (int, float)]
+            if JSONPGColumns.has_negative(numbers):
+                self.negative = True
+                model_change_count += 1
+        strings = new_values if types == {str} else [value for value in new_values if type(value) is str]
+        if self.date_formats:
+            if types == {str}:
+                date_formats = [date_format for date_format in self.date_formats if
+                                get_date_format_column_matcher(date_format)(strings)]
+            else:
+                date_formats = []
+            if len(date_formats) != len(self.date_formats):
+                self.date_formats = date_formats
+                model_change_count += 1
+        if strings:
+            chars = self.chars
+            char_num = len(chars)
+            chars.update(JSONPGColumns.get_chars(strings))
+            # Sequences of several characters in optional_dict_chars, like the sanitized escape characters, are added separately.
+            for sequence in multi_char_sequences:
+                if sequence not in chars and JSONPGColumns.contains_sequence(strings, sequence):
+                    chars.add(sequence)
+            if len(chars) != char_num:
+                model_change_count += 1
+        if model_change_count != change_count:
+            invalidate_fragment(self.fragment)
+
+    # This method adds all values of another summary to this summary.
+    def merge(self, other):
+        unstored_values = []
+        for value in other.values:
+            if value in self.values:
+                continue
+            if len(self.values) > max(list_element_max_num, 1):
+                unstored_values.append(value)
+                continue
+            self.values.add(value)
+        if unstored_values or other.distinct_sketch is not None:
+            self.add_distinct(unstored_values)
+            if other.distinct_sketch is not None:
+                self.add_distinct(other.unsketched_values)
+                self.distinct_sketch = bytearray(map(max, self.distinct_sketch, other.distinct_sketch))
+        self.has_tuple = self.has_tuple or other.has_tuple
+        self.has_non_tuple = self.has_non_tuple or other.has_non_tuple
+        self.all_int = self.all_int and other.all_int
+        self.all_number = self.all_number and other.all_number
+        self.negative = self.negative or other.negative
+        self.date_formats = [date_format for date_format in self.date_formats if date_format in other.date_formats]
+        self.chars |= other.chars
+        invalidate_fragment(self.fragment)
+
+    # This method adds the unsketched values to the sketch. The sketch is generated from the stored values when the first value is
+    # not stored.
+    def update_sketch(self):
+        if self.distinct_sketch is None:
+            self.distinct_sketch = bytearray(1 << distinct_sketch_bits)
+            add_to_sketch(self.distinct_sketch, self.values)
+        else:
+            add_to_sketch(self.distinct_sketch, self.unsketched_values)
+        self.unsketched_values = set()
+
+    # This method adds distinct values, which are not stored, to the sketch.
+    def add_distinct(self, values):
+        if self.distinct_sketch is None:
+            self.update_sketch()
+        self.unsketched_values.update(values)
+        if len(self.unsketched_values) >= unsketched_value_max_num:
+            self.update_sketch()
+
+    # This method returns the number of distinct values, which is estimated if not all values are stored.
+    def get_distinct_count(self):
+        if self.distinct_sketch is None:
+            return len(self.values)
+        self.update_sketch()
+        return max(len(self.values), round(get_sketch_estimate(self.distinct_sketch)))
+
+    # This method returns True if no values have been added.
+    def is_empty(self):
+        return len(self.values) == 0
+
+    # This method returns True if only null values have been added.
+    def is_null(self):
+        return self.values == {'null'}
+
+    # This method returns True if all values are lists.
+    def included_in_tuple(self):
+        return not self.has_non_tuple
+
+    # This method returns True if more than list_element_max_num distinct values have been added.
+    def exceeds_list(self):
+        return len(self.values) > list_element_max_num
+
+
+# This function returns True if the object is a LeafSummary which only contains null values.
+def is_null_leaf(obj):
+    return type(obj) is LeafSummary and obj.is_null()
+
+
+# This class holds the rendered yml of a parser node and its subnodes. The program is a list of the strings of the tree_buffer, the
+# programs of the subnodes, the numbers of characters, which are removed from the end of the tree_buffer, and the end nodes, whose
+# ids are assigned by the EndNodeRegistry when the program is executed by execute_parser_tree_program. The program is valid as long as
+# neither the node nor its subnodes change and it can only be reused in the same context, i.e., with the same fragment_epoch,
+# depth, self_id and with or without a list marker in front of the node. The parent is the fragment of the node above the node.
+class RenderedFragment:
+    __slots__ = ('program', 'parent', 'context', 'valid')
+
+    def __init__(self):
+        self.program = None
+        self.parent = None
+        self.context = None
+        self.valid = False
+
+# This function marks the rendered fragment and the fragments of the nodes above it as invalid. The walk stops at the first
+# invalid fragment, since the fragments above an invalid fragment are always invalid, too.
+def invalidate_fragment(fragment):
+    while fragment is not None and fragment.valid:
+        fragment.valid = False
+        fragment = fragment.parent
+
+
+# This class is a node of the parser dictionary, which maps the keys of the log lines to their nodes. The flag optional states if
+# the key does not appear in all log lines, nullable if its value can be null and inconsistent if values of different types
+# appeared. The subnodes of the node are situated in following_nodes. The yml of the node and its subnodes is cached in fragment.
+class ParserNode:
+    __slots__ = ('following_nodes', 'optional', 'nullable', 'inconsistent', 'fragment')
+
+    def __init__(self, optional=False):
+        self.following_nodes = None
+        self.optional = optional
+        self.nullable = False
+        self.inconsistent = False
+        self.fragment = None
+
+    # The rendered fragments are not pickled, e.g., in snapshots.
+    def __getstate__(self):
+        return get_slot_state(self)
+
+    def __setstate__(self, state):
+        set_slot_state(self, state)
+
+    # This method sets the flag nullable and counts the change of the parser model.
+    def set_nullable(self):
+        global model_change_count, structure_change_count
+        if not self.nullable:
+            self.nullable = True
+            model_change_count += 1
+            structure_change_count += 1
+            invalidate_fragment(self.fragment)
+
+    # This method sets the flag inconsistent and counts the change of the parser model.
+    def set_inconsistent(self):
+        global model_change_count, structure_change_count
+        if not self.inconsistent:
+            self.inconsistent = True
+            model_change_count += 1
+            structure_change_count += 1
+            invalidate_fragment(self.fragment)
+
+
+# This class is a list of the parser dictionary. The flag contains_dict states if a dictionary is included in the list, which is
+# checked by every traversal of the list and therefore determined once when the list is generated instead of searching the
+# whole list every time. Only lists that contain dictionaries are adapted to later log lines and all other lists only contain
+# end nodes, so the flag only changes if an end node that only contains null values is replaced by merge_parser_dicts. The
+# fragment is the rendered fragment of the parser node of the list.
+class ParserList(list):
+    __slots__ = ('contains_dict', 'fragment')
+
+    def __init__(self, elements=(), contains_dict=False):
+        super().__init__(elements)
+        self.contains_dict = contains_dict
+        self.fragment = None
+
+    # The rendered fragments are not pickled, e.g., in snapshots.
+    def __getstate__(self):
+        return get_slot_state(self)
+
+    def __setstate__(self, state):
+        set_slot_state(self, state)
+
+
+# This function returns the state of an object of the parser dictionary with slots for pickle without the rendered fragment.
+def get_slot_state(obj):
+    return None, {name: getattr(obj, name) for name in obj.__slots__ if name != 'fragment'}
+
+# This function sets the state of an object of the parser dictionary with slots, which was returned by get_slot_state.
+def set_slot_state(obj, state):
+    for name, value in state[1].items():
+        setattr(obj, name, value)
+    obj.fragment = None
+
 
 # This function receives a new dictionary and saves its values in the structure of the parser_dictionary.
 # It checks if the values are optional and if the entries are lists, etc.
-def fill_parser_dict(new_dict, parser_dict=None, previous_dict=None, initialize=False):
-    # Initalize the parser dict.
-    if initialize:
-        # Differentiate between the different types for the new dictionary and recursively generate the parser dictionary.
-        if type(new_dict) is dict:
-            parser_dict = {}
-            for key in new_dict:
-                # The parser dict always has the entries following_nodes and optional. The parameter optional states if
-                # the current node is optional and the subnodes of the node is situated in the entry of following_nodes.
-                parser_dict[key] = {'following_nodes': None, 'optional': False, 'nullable': False, 'inconsistent': False}
-                parser_dict[key]['following_nodes'] = fill_parser_dict(new_dict[key], initialize=True, previous_dict=parser_dict[key])
-        elif type(new_dict) is list and len(new_dict) > 0 and includes_dict(new_dict):
-            parser_dict = []
-            for sub_new_dict in new_dict:
-                if type(sub_new_dict) is dict:
-                    parser_dict.append({})
-                    for key in sub_new_dict:
-                        # The parser dict always has the entries following_nodes and optional. The parameter optional states if
-                        # the current node is optional and the subnodes of the node is situated in the entry of following_nodes.
-                        parser_dict[-1][key] = {'following_nodes': None, 'optional': False, 'nullable': False, 'inconsistent': False}
-                        parser_dict[-1][key]['following_nodes'] = fill_parser_dict(
-                                sub_new_dict[key], initialize=True, previous_dict=parser_dict[-1][key])
-                elif type(sub_new_dict) is list:
-                    parser_dict.append([])
-                    for index in range(len(sub_new_dict)):
-                        # The parser dict always has the entries following_nodes and optional. The parameter optional states if
-                        # the current node is optional and the subnodes of the node is situated in the entry of following_nodes.
-                        parser_dict[-1].append(fill_parser_dict(sub_new_dict[index], initialize=True, previous_dict=parser_dict[-1]))
+# The parts of the new dictionary, which still have to be folded, are processed from a stack of tasks. Every task holds the
+# object and the key or index, where the part of the parser dictionary is stored, which is looked up when the task is processed.
+# If rejected_nodes is set, the values, which a node rejects or ignores, are folded by record_rejected_value. The lists of the new
+# dictionary, which include dictionaries, are stored in dict_lists by includes_dict.
+def fill_parser_dict(new_dict, parser_dict=None, previous_dict=None, initialize=False, dict_lists=None):
+    global model_change_count, structure_change_count
+    if dict_lists is None:
+        dict_lists = {}
+    result = [parser_dict]
+    tasks = [(new_dict, previous_dict, initialize, result, 0)]
+    while tasks:
+        task = tasks.pop()
+        if type(task) is ListElementFolder:
+            task.fold(tasks, dict_lists)
+            continue
+        new_dict, previous_dict, initialize, target, index = task
+        if index is None:
+            parser_dict = target.following_nodes
+        else:
+            parser_dict = target[index]
+        part = parser_dict
+        # Initalize the parser dict.
+        if initialize:
+            model_change_count += 1
+            structure_change_count += 1
+            # Differentiate between the different types for the new dictionary and generate the parser dictionary.
+            if type(new_dict) is dict:
+                parser_dict = {}
+                for key in new_dict:
+                    # The parser dict maps every key to a ParserNode, which holds the flags and the subnodes of the key.
+                    node = parser_dict[sys.intern(key)] = ParserNode()
+                    tasks.append((new_dict[key], node, True, node, None))
+            elif type(new_dict) is list and len(new_dict) > 0 and includes_dict(new_dict, dict_lists):
+                parser_dict = ParserList(contains_dict=True)
+                for sub_new_dict in new_dict:
+                    if type(sub_new_dict) is dict:
+                        parser_dict.append({})
+                        for key in sub_new_dict:
+                            # The parser dict maps every key to a ParserNode, which holds the flags and the subnodes of the key.
+                            node = parser_dict[-1][sys.intern(key)] = ParserNode()
+                            tasks.append((sub_new_dict[key], node, True, node, None))
+                    elif type(sub_new_dict) is list:
+                        # The elements of the nested list are stored at their indices when their tasks are processed.
+                        parser_dict.append(ParserList([None] * len(sub_new_dict), includes_dict(sub_new_dict, dict_lists)))
+                        for sub_index in range(len(sub_new_dict)):
+                            tasks.append((sub_new_dict[sub_index], parser_dict[-1], True, parser_dict[-1], sub_index))
+                    else:
+                        parser_dict.append(LeafSummary(convert_to_tuples(sub_new_dict)))
+            else:
+                if type(new_dict) is list:
+                    parser_dict = LeafSummary(convert_to_tuples(new_dict))
+                else:
+                    parser_dict = LeafSummary(sanitize_entry(new_dict))
+                    if new_dict == 'null' and type(previous_dict) is ParserNode:
+                        previous_dict.nullable = True
+                        invalidate_fragment(previous_dict.fragment)
+        elif parser_dict is None:
+            # Initialize the parser if the dictionary is empty.
+            tasks.append((new_dict, None, True, target, index))
+            continue
+        else:
+            # Adapt the parser dictionary to the structure of the new dictionary.
+            if type(parser_dict) is dict:
+                if type(new_dict) is dict:
+                    for key, node in parser_dict.items():
+                        if not node.optional and key not in new_dict:
+                            # Set the parameter optional to True if the node of the parser dictionary does not appear in the new dictionary.
+                            node.optional = True
+                            model_change_count += 1
+                            structure_change_count += 1
+                            invalidate_fragment(node.fragment)
+                    for key in new_dict:
+                        if key not in parser_dict:
+                            # Add a optional node in the parser dictionary if a new node appears in new dictionary.
+                            node = parser_dict[sys.intern(key)] = ParserNode(optional=True)
+                            tasks.append((new_dict[key], node, True, node, None))
+                            if previous_dict is not None:
+                                invalidate_fragment(previous_dict.fragment)
+                        else:
+                            # Adapt the following nodes if they appear in both the parser and the new dictionary.
+                            node = parser_dict[key]
+                            tasks.append((new_dict[key], node, False, node, None))
+                elif type(previous_dict) is not ParserNode:
+                    # The log lines and the elements of lists have no flags, so values of other types are skipped.
+                    if rejected_nodes is not None and previous_dict is not None:
+                        record_rejected_value(new_dict, previous_dict, tasks)
+                elif new_dict == 'null':
+                    previous_dict.set_nullable()
                 else:
-                    parser_dict.append({convert_to_tuples(sub_new_dict)})
+                    previous_dict.set_inconsistent()
+                    if rejected_nodes is not None:
+                        record_rejected_value(new_dict, previous_dict, tasks)
+            elif type(parser_dict) is ParserList:
+                if type(new_dict) is list and parser_dict.contains_dict and len(new_dict) > 0:
+                    if list_element_fold_num != 1 and len(new_dict) > 1:
+                        # Fold the further elements of the list after the first element.
+                        tasks.append(ListElementFolder(new_dict, parser_dict))
+                    # Adapt the following nodes of the list in both the parser and the new dictionary.
+                    tasks.append((new_dict[0], parser_dict, False, parser_dict, 0))
+                if rejected_nodes is not None and previous_dict is not None and (
+                        not parser_dict.contains_dict or type(new_dict) is not list or not includes_dict(new_dict, dict_lists)):
+                    # Lists of dictionaries ignore all other values, including null values, and lists without dictionaries
+                    # ignore all values.
+                    record_rejected_value(new_dict, previous_dict, tasks)
+            elif type(parser_dict) is LeafSummary:
+                if parser_dict.is_null() and new_dict != 'null':
+                    parser_dict = LeafSummary()
+                # Add new values of the lists of the parser dictionary.
+                if type(new_dict) is list:
+                    if parser_dict.is_empty() and includes_dict(new_dict, dict_lists):
+                        # A list of dictionaries after null values turns into a list of the parser dictionary.
+                        tasks.append((new_dict, previous_dict, True, target, index))
+                        continue
+                    elif parser_dict.has_non_tuple or includes_dict(new_dict, dict_lists):
+                        if type(previous_dict) is ParserNode:
+                            previous_dict.set_inconsistent()
+                        if rejected_nodes is not None and previous_dict is not None:
+                            record_rejected_value(new_dict, previous_dict, tasks)
+                    else:
+                        parser_dict.add(sanitize_entry(convert_to_tuples(new_dict)))
+                elif type(new_dict) is dict:
+                    if parser_dict.is_empty():
+                        tasks.append((new_dict, previous_dict, True, target, index))
+                        continue
+                    else:
+                        if type(previous_dict) is ParserNode:
+                            previous_dict.set_inconsistent()
+                        if rejected_nodes is not None and previous_dict is not None:
+                            record_rejected_value(new_dict, previous_dict, tasks)
+                elif type(previous_dict) is not ParserNode:
+                    if new_dict != 'null' and not parser_dict.has_tuple:
+                        parser_dict.add(sanitize_entry(new_dict))
+                    elif rejected_nodes is not None and previous_dict is not None:
+                        record_rejected_value(new_dict, previous_dict, tasks)
+                elif new_dict == 'null':
+                    previous_dict.set_nullable()
+                elif parser_dict.has_tuple:
+                    previous_dict.set_inconsistent()
+                    if rejected_nodes is not None:
+                        record_rejected_value(new_dict, previous_dict, tasks)
+                else:
+                    parser_dict.add(sanitize_entry(new_dict))
+
+        if parser_dict is not part:
+            # The rendered fragment of the node, whose part of the parser dictionary is replaced, is invalidated.
+            if index is None:
+                target.following_nodes = parser_dict
+                invalidate_fragment(target.fragment)
+            else:
+                target[index] = parser_dict
+                if type(target) is ParserList:
+                    invalidate_fragment(target.fragment)
+
+    return result[0]
+
+# This function puts the task on the tasks, which folds the value that the part of the parser dictionary of the node rejects into the
+# parser dictionary of the rejected values of the node in rejected_nodes. The rejected values of a node are the values of the types,
+# which the node does not accept, so they are again split by their types into further rejected values. The node is a ParserNode or
+# a ParserList, whose first element rejects the value. Since parser lists can not be hashed, the nodes are stored by their ids.
+def record_rejected_value(new_dict, node, tasks):
+    entry = rejected_nodes.get(id(node))
+    if entry is None:
+        rejected_node = ParserNode()
+        rejected_nodes[id(node)] = (node, rejected_node)
+        tasks.append((new_dict, rejected_node, True, rejected_node, None))
+    else:
+        tasks.append((new_dict, entry[1], False, entry[1], None))
+
+# This function appends the fingerprint of the structure of the new dictionary to the shape list and all values, which
+# fill_parser_dict may fold into end nodes, to the values list. The fingerprint consists of the keys of the dictionaries and of
+# markers for dictionaries, lists and values and distinguishes null values from other values. Of lists only the elements, which
+# may be folded by fill_parser_dict, are part of the fingerprint. The iterators of the items of the enclosing dictionaries and
+# lists are kept on a stack instead of recursive calls. The lists, which include dictionaries, are stored in dict_lists.
+def collect_record_shape(new_dict, shape, values, dict_lists=None):
+    if dict_lists is None:
+        dict_lists = {}
+    stack = []
+    items = None
+    while True:
+        if type(new_dict) is dict:
+            shape.append(dict)
+            stack.append(items)
+            items = iter(new_dict.items())
+        elif type(new_dict) is list:
+            shape.append(list)
+            values.append(new_dict)
+            if list_element_fold_num != 1 and len(new_dict) > 1 and (type(new_dict[0]) is dict or
+                                                                      includes_dict(new_dict, dict_lists)):
+                # The further elements of lists of dictionaries are folded as well, so they are part of the fingerprint with their
+                # indices in place of the keys. Lists with more elements than folded are marked with an Ellipsis.
+                element_num = get_folded_element_num(new_dict)
+                if element_num < len(new_dict):
+                    shape.append(Ellipsis)
+                stack.append(items)
+                items = enumerate(new_dict[:element_num])
+            elif len(new_dict) > 0:
+                if type(new_dict[0]) is not dict and includes_dict(new_dict, dict_lists):
+                    # Lists, which hold dictionaries after other values, are not folded like lists without dictionaries.
+                    shape.append(dict)
+                new_dict = new_dict[0]
+                continue
+            else:
+                shape.append(None)
         else:
-            if type(new_dict) is list:
-                parser_dict = {convert_to_tuples(new_dict)}
+            shape.append(1 if new_dict == 'null' else 0)
+            values.append(new_dict)
+
+        # Continue with the items of the innermost dictionary or list, which is not traversed completely, until a dictionary or a
+        # list is found. The function returns when all dictionaries and lists are traversed.
+        while items is not None:
+            for key, value in items:
+                shape.append(key)
+                if type(value) is dict or type(value) is list:
+                    break
+                # Values are handled directly, since most values of the records are no dictionaries or lists.
+                shape.append(1 if value == 'null' else 0)
+                values.append(value)
             else:
-                parser_dict = {sanitize_entry(new_dict)}
-                if new_dict == 'null':
-                    previous_dict['nullable'] = True
-    elif parser_dict is None:
-        # Initialize the parser if the dictionary is empty.
-        parser_dict = fill_parser_dict(new_dict, initialize=True)
+                shape.append(None)
+                items = stack.pop()
+                continue
+            new_dict = value
+            break
+        else:
+            return
+
+# This function appends the plan of the record to the plan list, which holds an entry for every value that collect_record_shape
+# appends to the values list. The plan must only be generated if folding the record did not change the structure of the parser
+# dictionary. The pairs of the parts of the record and of the parser dictionary are processed in the order of collect_record_shape.
+def build_shape_plan(new_dict, parser_dict, plan, dict_lists=None):
+    if dict_lists is None:
+        dict_lists = {}
+    stack = [(new_dict, parser_dict)]
+    while stack:
+        new_dict, parser_dict = stack.pop()
+        if type(new_dict) is dict:
+            if type(parser_dict) is dict:
+                stack.extend((value, parser_dict[key].following_nodes) for key, value in reversed(new_dict.items()))
+            else:
+                stack.extend((value, None) for value in reversed(new_dict.values()))
+        elif type(new_dict) is list:
+            if type(parser_dict) is ParserList and parser_dict.contains_dict:
+                plan.append(parser_dict)
+                element_parser_dict = parser_dict[0]
+            else:
+                if type(parser_dict) is LeafSummary and not parser_dict.has_non_tuple and not includes_dict(new_dict, dict_lists):
+                    plan.append((parser_dict, True))
+                else:
+                    plan.append(None)
+                element_parser_dict = None
+            if list_element_fold_num != 1 and len(new_dict) > 1 and (type(new_dict[0]) is dict or
+                                                                      includes_dict(new_dict, dict_lists)):
+                # The further elements are only folded into the first element if both are dictionaries.
+                for element in reversed(new_dict[1:get_folded_element_num(new_dict)]):
+                    if type(element) is dict and type(element_parser_dict) is dict:
+                        stack.append((element, element_parser_dict))
+                    else:
+                        stack.append((element, None))
+            if len(new_dict) > 0:
+                stack.append((new_dict[0], element_parser_dict))
+        elif type(parser_dict) is LeafSummary and new_dict != 'null' and not parser_dict.has_tuple:
+            plan.append((parser_dict, False))
+        else:
+            plan.append(None)
+
+# This function returns the plan of the new dictionary, which only holds the values that are folded into end nodes, with their
+# indices in the values list of collect_record_shape, and the indices of the lists, which are folded into parser lists.
+def get_shape_plan(new_dict, parser_dict, dict_lists=None):
+    plan = []
+    build_shape_plan(new_dict, parser_dict, plan, dict_lists)
+    return ([(index, target[0], target[1]) for index, target in enumerate(plan) if type(target) is tuple],
+            [index for index, target in enumerate(plan) if type(target) is ParserList])
+
+# This function folds the values of a record, which were collected by collect_record_shape, directly into the end nodes of the
+# plan of its shape.
+def fold_shape_values(plan, values):
+    for index, leaf, is_list in plan:
+        if is_list:
+            leaf.add(sanitize_entry(convert_to_tuples(values[index])))
+        else:
+            leaf.add(sanitize_entry(values[index]))
+
+# This function returns the number of the lists at the list_indices of the values, which are truncated by list_element_fold_num.
+def count_truncated_lists(list_indices, values):
+    if list_element_fold_num is None or list_element_fold_num == 1:
+        return 0
+    return sum(1 for index in list_indices if len(values[index]) > max(list_element_fold_num, 1))
+
+# This function returns the number of elements of the new list, which are folded into the parser dictionary.
+def get_folded_element_num(new_list):
+    if list_element_fold_num is None:
+        return len(new_list)
+    return min(len(new_list), list_element_fold_num)
+
+# This class caches the plans of the shapes of the records. Most log lines share a few shapes, i.e., the same keys and types of
+# values, and after a shape has been folded into the parser dictionary, further records of the same shape only change the values
+# of the end nodes. For these records the values are folded directly into the end nodes of the plan instead of walking through
+# the whole parser dictionary. The plans are only used as long as the structure of the parser dictionary does not change.
+class ShapeCache:
+    # This method initializes the cache, which holds at most max_size shapes.
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.plans = {}
+        self.hits = 0
+        self.misses = 0
+
+    # This method removes all plans, e.g., when the parser dictionary is replaced.
+    def clear(self):
+        self.plans = {}
+
+    # This method folds the values of a record of the shape into the end nodes of the plan of the shape.
+    def fold_values(self, shape, plan, values):
+        fold_shape_values(plan, values)
+
+    # This method folds the values, which have not been folded into the end nodes yet. The values are always folded immediately
+    # by the ShapeCache.
+    def flush(self):
+        pass
+
+    # This method folds the new dictionary into the parser dictionary like fill_parser_dict and returns the parser dictionary.
+    # The plans of the sub-models are distinguished by the value of the discriminator key.
+    def fill_parser_dict(self, new_dict, parser_dict, sub_model=None):
+        global truncated_list_count
+        if self.max_size == 0 or type(new_dict) is not dict or type(parser_dict) is not dict:
+            self.flush()
+            return fill_parser_dict(new_dict, parser_dict)
+        shape = [sub_model]
+        values = []
+        # The lists of the record, which include dictionaries, are shared by all traversals of the record.
+        dict_lists = {}
+        collect_record_shape(new_dict, shape, values, dict_lists)
+        shape = tuple(shape)
+        entry = self.plans.get(shape)
+        if entry is not None and entry[0] == structure_change_count:
+            self.hits += 1
+            self.fold_values(shape, entry[1], values)
+            truncated_list_count += count_truncated_lists(entry[2], values)
+            return parser_dict
+
+        self.misses += 1
+        # fill_parser_dict depends on the values of the end nodes, so all values of the previous records must be folded.
+        self.flush()
+        change_count = structure_change_count
+        parser_dict = fill_parser_dict(new_dict, parser_dict, dict_lists=dict_lists)
+        if structure_change_count == change_count and (entry is not None or len(self.plans) < self.max_size):
+            self.plans[shape] = (change_count,) + get_shape_plan(new_dict, parser_dict, dict_lists)
+        return parser_dict
+
+
+# This class is the columnar engine of the shape cache. Instead of folding the values of the records, whose shapes have plans,
+# one by one into the end nodes, the values are appended to a column of every end node. After batch_size records or before a
+# record, which must be folded by fill_parser_dict, the columns are folded into the end nodes. The values of a column are
+# classified in one batch by LeafSummary.add_column, so the costs mainly depend on the number of distinct values of the columns. The
+# records of plans do not change the structure of the parser dictionary and the summaries of the end nodes do not depend on
+# the order of the values of different end nodes, so the parser dictionary is the same as with the ShapeCache. Only
+# model_change_count changes when the columns are folded instead of with every record.
+class ColumnarShapeCache(ShapeCache):
+    # This method initializes the cache, which holds at most max_size shapes and folds the columns after batch_size records.
+    def __init__(self, max_size, batch_size):
+        super().__init__(max_size)
+        self.batch_size = batch_size
+        # The columns of the end nodes as tuples of the form (is_list, values) and the append methods of the columns of the values
+        # of every plan together with the indices of the values. The columns of the end nodes of old plans are removed whenever
+        # the structure of the parser dictionary has changed.
+        self.columns = {}
+        self.appenders = {}
+        self.column_change_count = structure_change_count
+        self.record_count = 0
+        self.batch_count = 0
+
+    # This method folds the pending values into the end nodes and removes all plans.
+    def clear(self):
+        self.flush()
+        super().clear()
+        self.columns = {}
+        self.appenders = {}
+
+    # This method appends the values of a record of the shape to the columns of the end nodes of the plan.
+    def fold_values(self, shape, plan, values):
+        entry = self.appenders.get(shape)
+        if entry is None or entry[0] is not plan:
+            entry = self.appenders[shape] = (plan, [(self.get_column(leaf, is_list).append, index) for index, leaf, is_list in plan])
+        for append, index in entry[1]:
+            append(values[index])
+        self.record_count += 1
+        if self.record_count >= self.batch_size:
+            self.flush()
+
+    # This method returns the column of the end node.
+    def get_column(self, leaf, is_list):
+        if leaf not in self.columns:
+            self.columns[leaf] = (is_list, [])
+        return self.columns[leaf][1]
+
+    # This method folds the columns into their end nodes. Lists are converted into tuples and added one by one.
+    def flush(self):
+        if self.record_count > 0:
+            for leaf, (is_list, column) in self.columns.items():
+                if not column:
+                    continue
+                if is_list:
+                    for value in column:
+                        leaf.add(sanitize_entry(convert_to_tuples(value)))
+                else:
+                    leaf.add_column(column)
+                column.clear()
+            self.record_count = 0
+            self.batch_count += 1
+        if self.column_change_count != structure_change_count:
+            self.column_change_count = structure_change_count
+            self.columns = {}
+            self.appenders = {}
+
+
+# This class is put on the tasks of fill_parser_dict and folds the further elements of a list into the first element of the parser
+# list, until list_element_fold_num elements are folded.
+class ListElementFolder:
+    def __init__(self, new_list, parser_list):
+        self.new_list = new_list
+        self.parser_list = parser_list
+        self.position = 1
+        self.element_num = get_folded_element_num(new_list)
+        self.plans = {}
+        # The shape of the element, which is currently folded by fill_parser_dict, and the structure_change_count before.
+        self.pending = None
+
+    # This method folds the next elements of the list. If an element must be folded by fill_parser_dict, it returns after putting
+    # itself and the task of the element on the tasks. The dict_lists of fill_parser_dict are passed on to includes_dict.
+    def fold(self, tasks, dict_lists):
+        global truncated_list_count
+        if self.pending is not None:
+            shape, element, change_count = self.pending
+            self.pending = None
+            if structure_change_count == change_count:
+                self.plans[shape] = (change_count,) + get_shape_plan(element, self.parser_list[0], dict_lists)
+
+        while self.position < self.element_num:
+            element = self.new_list[self.position]
+            self.position += 1
+            if type(element) is not dict or type(self.parser_list[0]) is not dict:
+                if rejected_nodes is not None:
+                    # The skipped element is folded into the rejected values of the list before the further elements.
+                    tasks.append(self)
+                    record_rejected_value(element, self.parser_list, tasks)
+                    return
+                continue
+            shape = []
+            values = []
+            collect_record_shape(element, shape, values, dict_lists)
+            shape = tuple(shape)
+            entry = self.plans.get(shape)
+            # The plans skip the values, which are rejected again, so they are not used if the rejected values are recorded.
+            if entry is not None and entry[0] == structure_change_count and rejected_nodes is None:
+                fold_shape_values(entry[1], values)
+                truncated_list_count += count_truncated_lists(entry[2], values)
+                continue
+            self.pending = (shape, element, structure_change_count)
+            tasks.append(self)
+            tasks.append((element, self.parser_list, False, self.parser_list, 0))
+            return
+
+        if self.element_num < len(self.new_list):
+            truncated_list_count += 1
+
+
+# This class holds the parser dictionaries of the sub-models, into which the log lines are split by the values of the
+# discriminator key. It maps every value to the parser dictionary of its log lines and counts the log lines of every value in
+# line_counts. The sub-model of the value None holds the log lines without a value and the log lines of further values after
+# discriminator_value_max_num sub-models have been generated.
+class ParserSplit(dict):
+    def __init__(self):
+        super().__init__()
+        self.line_counts = {}
+
+
+# This function returns the value of the discriminator key of the record, which selects the sub-model of the record. If the
+# discriminator key is a list of keys, they select a nested value. Only strings and numbers are used as values. The number of
+# sub-models is not limited if parser_split is None.
+def get_discriminator_value(record, parser_split):
+    if type(discriminator_key) is list:
+        keys = discriminator_key
     else:
-        # Adapt the parser dictionary to the structure of the new dictionary.
-        if type(parser_dict) is dict:
-            if type(new_dict) is dict:
+        keys = [discriminator_key]
+    value = record
+    for key in keys:
+        if type(value) is not dict:
+            return None
+        value = value.get(key)
+    if type(value) not in (str, int, float) or value == 'null':
+        return None
+    if parser_split is not None and value not in parser_split and len(parser_split) >= discriminator_value_max_num:
+        return None
+    return value
+
+# This function folds the record into the parser dictionary of the sub-model of its discriminator value and returns the parser
+# split. The plans of the shape cache are stored separately for every sub-model. If limited is False, every value gets its own
+# sub-model, e.g., in the worker processes, which do not know the values of the previous log lines.
+def fill_parser_split(record, parser_split, shape_cache, limited=True):
+    if parser_split is None:
+        parser_split = ParserSplit()
+    value = get_discriminator_value(record, parser_split if limited else None)
+    parser_split[value] = shape_cache.fill_parser_dict(record, parser_split.get(value), value)
+    parser_split.line_counts[value] = parser_split.line_counts.get(value, 0) + 1
+    return parser_split
+
+# This function returns the values of the sub-models of the parser_split, into which the sub-models of other_split, which was
+# generated from later log lines with a sub-model for every value, are merged. The values are assigned in the order of their first
+# log lines like in fill_parser_split, so the values beyond discriminator_value_max_num sub-models are assigned to the sub-model of
+# the value None.
+def get_split_targets(parser_split, other_split):
+    values = set(parser_split)
+    targets = []
+    for value in other_split:
+        if value not in values and len(values) >= discriminator_value_max_num:
+            value = None
+        values.add(value)
+        targets.append(value)
+    return targets
+
+# This function merges the sub-models of other_split into the sub-models of the parser_split, whose values are returned by
+# get_split_targets. The result is the same as if the log lines had been folded with fill_parser_split, as long as no two values
+# are merged into the same sub-model, since their log lines would have to be folded in their order. The rejected values of the
+# nodes of other_split are passed to merge_parser_dicts.
+def merge_parser_splits(parser_split, other_split, targets, other_rejected_nodes=None):
+    for target, (value, other_dict) in zip(targets, other_split.items()):
+        parser_split[target] = merge_parser_dicts(parser_split.get(target), other_dict, other_rejected_nodes=other_rejected_nodes)
+        parser_split.line_counts[target] = parser_split.line_counts.get(target, 0) + other_split.line_counts[value]
+    return parser_split
+
+# This function merges the parser dictionary other_dict, which was generated from later log lines, into the parser_dict. The
+# result is the same as if the log lines of other_dict had been folded into parser_dict with fill_parser_dict, which allows to
+# generate partial parser dictionaries in parallel. The flags of the nodes of other_dict are only merged where fill_parser_dict
+# would set them, e.g., a node that holds a list of dictionaries ignores null values and values of other types. The values, which
+# a node of other_dict rejected, because they are of another type than its first value, may be of the type of the node of the
+# parser_dict, so they are merged from other_rejected_nodes, which maps the ids of the nodes and of the parser lists, whose first
+# elements rejected values, to the parser nodes of their rejected values.
+def merge_parser_dicts(parser_dict, other_dict, previous_dict=None, other_rejected_nodes=None):
+    global fragment_epoch
+    # The merge changes the flags of the nodes directly, so all rendered fragments are invalidated.
+    fragment_epoch += 1
+    # The parts of the parser dictionaries are merged from a stack of tasks like in fill_parser_dict. Every task also holds the node
+    # of other_dict, whose flags are merged into the previous_dict.
+    result = [None]
+    tasks = [(parser_dict, other_dict, previous_dict, None, result, 0)]
+    while tasks:
+        parser_dict, other_dict, previous_dict, other_node, target, index = tasks.pop()
+        rejected_node = None
+        if other_rejected_nodes and other_node is not None:
+            rejected_node = other_rejected_nodes.get(id(other_node))
+        if type(previous_dict) is not ParserNode or type(parser_dict) is ParserList:
+            # The elements of lists have no flags and fill_parser_dict does not change the flags of nodes that hold lists.
+            other_node = None
+        if other_node is not None:
+            previous_dict.nullable = previous_dict.nullable or other_node.nullable
+            previous_dict.inconsistent = previous_dict.inconsistent or other_node.inconsistent
+
+        if parser_dict is None or (type(parser_dict) is LeafSummary and parser_dict.is_null()):
+            # The part of other_dict was generated from the same values, which are folded into the part of the parser_dict, so
+            # the rejected values of the node were also rejected by fill_parser_dict.
+            parser_dict = other_dict
+            rejected_node = None
+        elif other_dict is None:
+            pass
+        elif type(parser_dict) is dict:
+            if type(other_dict) is dict:
                 for key in parser_dict:
-                    if key not in new_dict and not parser_dict[key]['optional']:
-                        # Set the parameter optional to True if the node of the parser dictionary does not appear in the new dictionary.
-                        parser_dict[key]['optional'] = True
-                for key in new_dict:
+                    if key not in other_dict:
+                        # Set the parameter optional to True if the node does not appear in the later log lines.
+                        parser_dict[key].optional = True
+                for key in other_dict:
                     if key not in parser_dict:
-                        # Add a optional node in the parser dictionary if a new node appears in new dictionary.
-                        parser_dict[key] = {'following_nodes': None, 'optional': True, 'nullable': False, 'inconsistent': False}
-                        parser_dict[key]['following_nodes'] = fill_parser_dict(
-                                new_dict[key], initialize=True, previous_dict=parser_dict[key])
+                        # Add the node as optional node if it only appears in the later log lines.
+                        parser_dict[key] = other_dict[key]
+                        parser_dict[key].optional = True
                     else:
-                        # Recusively adapt the following nodes if they appear in both the parser and the new dictionary.
-                        parser_dict[key]['following_nodes'] = fill_parser_dict(
-                                new_dict[key], parser_dict=parser_dict[key]['following_nodes'], previous_dict=parser_dict[key])
-            elif new_dict == 'null':
-                previous_dict['nullable'] = True
-            elif previous_dict is not None:
-                previous_dict['inconsistent'] = True
-        elif type(parser_dict) is list and type(new_dict) is list and includes_dict(parser_dict):
-            # Recursively adapt the following nodes of the list in both the parser and the new dictionary.
-            parser_dict[0] = fill_parser_dict(new_dict[0], parser_dict=parser_dict[0], previous_dict=parser_dict)
-        elif type(parser_dict) is set:
-            if parser_dict == {'null'} and new_dict != 'null':
-                parser_dict = set()
-            # Add new values of the lists of the parser dictionary.
-            if type(new_dict) is list:
-                if any(type(val) is not tuple for val in parser_dict):
-                    previous_dict['inconsistent'] = True
-                else:
-                    parser_dict.add(sanitize_entry(convert_to_tuples(new_dict)))
-            elif type(new_dict) is dict:
-                if parser_dict == set():
-                    parser_dict = fill_parser_dict(new_dict, initialize=True, previous_dict=previous_dict)
-                elif previous_dict is not None:
-                    previous_dict['inconsistent'] = True
+                        node = parser_dict[key]
+                        node.optional = node.optional or other_dict[key].optional
+                        tasks.append((node.following_nodes, other_dict[key].following_nodes, node, other_dict[key], node, None))
+            elif type(previous_dict) is not ParserNode:
+                pass
+            elif is_null_leaf(other_dict):
+                previous_dict.nullable = True
             else:
-                if new_dict == 'null':
-                    previous_dict['nullable'] = True
-                elif any(type(val) is tuple for val in parser_dict):
-                    previous_dict['inconsistent'] = True
+                previous_dict.inconsistent = True
+        elif type(parser_dict) is ParserList:
+            if parser_dict.contains_dict and type(other_dict) is ParserList and other_dict.contains_dict:
+                # Merge the following nodes of the lists. The list of other_dict is passed on to merge its rejected values.
+                tasks.append((parser_dict[0], other_dict[0], parser_dict, other_dict, parser_dict, 0))
+        elif type(parser_dict) is LeafSummary:
+            if type(other_dict) is LeafSummary:
+                if other_dict.is_null():
+                    if type(previous_dict) is ParserNode:
+                        previous_dict.nullable = True
+                elif (parser_dict.has_tuple and other_dict.has_non_tuple) or (parser_dict.has_non_tuple and other_dict.has_tuple):
+                    if type(previous_dict) is ParserNode:
+                        previous_dict.inconsistent = True
                 else:
-                    parser_dict.add(sanitize_entry(new_dict))
+                    parser_dict.merge(other_dict)
+            elif type(previous_dict) is ParserNode:
+                previous_dict.inconsistent = True
 
-    return parser_dict
+        if rejected_node is not None:
+            # Merge the rejected values of the node like the values of a further node of other_dict.
+            tasks.append((parser_dict, rejected_node.following_nodes, previous_dict, rejected_node, target, index))
+
+        if index is None:
+            target.following_nodes = parser_dict
+        else:
+            target[index] = parser_dict
+            if type(target) is ParserList and (type(parser_dict) is dict or type(parser_dict) is ParserList):
+                # An end node of the list was replaced by a dictionary or by a list, which always contains dictionaries.
+                target.contains_dict = True
+
+    return result[0]
+
+# This function yields the decoded records of the log lines in a byte range of an input file. The log lines, which can not be
+# decoded or are no JSON objects, are appended to the failures as tuples of the form (offset, line, error).
+def decode_chunk(chunk, failures):
+    input_file, start, end = chunk
+    loads = JSONPGInput.get_json_loads(json_backend)
+    for _, offset, line in JSONPGInput.clean_located_lines(input_file, start, end):
+        try:
+            log_line = loads(line)
+        except (ValueError, RecursionError) as e:
+            # The json backend raises a RecursionError instead of a ValueError if the log line is nested too deeply.
+            failures.append((offset, line, str(e)))
+            continue
+        if type(log_line) is not dict:
+            failures.append((offset, line, no_object_error))
+            continue
+        yield JSONPGInput.replace_literals(log_line)
+
+# This function generates the parser dictionary of the log lines in a byte range of an input file. It is executed by the worker
+# processes if the input files are analyzed in parallel. If a discriminator key is configured, the parser dictionary is a parser
+# split with a sub-model for every value. The rejected values of the nodes are returned for merge_parser_dicts, so the log lines
+# are folded without the shape cache, whose plans skip the values that are rejected again. The log lines, which can not be decoded
+# or are no JSON objects, are returned as tuples of the form (offset, line, error) together with the number of the folded log lines.
+def fill_parser_dict_chunk(chunk):
+    global rejected_nodes
+    shape_cache = ShapeCache(0)
+    parser_dict = None
+    line_count = 0
+    failures = []
+    rejected_nodes = {}
+    try:
+        for log_line in decode_chunk(chunk, failures):
+            if discriminator_key is None:
+                parser_dict = fill_parser_dict(log_line, parser_dict)
+            else:
+                parser_dict = fill_parser_split(log_line, parser_dict, shape_cache, False)
+            line_count += 1
+        # The rejected values are returned with their nodes in the same object as the parser dictionary, so that pickle keeps the
+        # identity of the nodes.
+        return parser_dict, list(rejected_nodes.values()), line_count, failures
+    finally:
+        rejected_nodes = None
+
+# The error of the log lines, which are valid JSON, but no JSON objects, e.g., null or a string.
+no_object_error = 'The log line is not a JSON object'
+
+# This function splits the byte ranges of the input files into chunks, generates the parser dictionaries of the chunks in a pool
+# of worker processes and merges them in the order of the chunks into the parser dictionary. The log lines of every chunk, which
+# can not be decoded, are passed to add_chunk_failures together with the input file and the number of the read log lines. The
+# import is stopped if it returns True. If a discriminator key is configured, the sub-models of the chunks are merged into the
+# sub-models of the parser split.
+def fill_parser_dict_parallel(input_ranges, worker_num, chunk_size, parser_dict=None, add_chunk_failures=None):
+    line_count = 0
+    read_line_count = 0
+    chunks = JSONPGInput.split_input_ranges(input_ranges, chunk_size)
+    print('Import ' + str(len(chunks)) + ' chunks of ' + str(len(input_ranges)) + ' input files with ' + str(worker_num) +
+          ' processes!')
+
+    # The configuration is passed to the worker processes, since they do not share the module-level variables on every platform.
+    with multiprocessing.Pool(worker_num, initializer=configure, initargs=(get_config(),)) as pool:
+        for chunk, (chunk_parser_dict, chunk_rejected_values, chunk_line_count, failures) in zip(
+                chunks, pool.imap(fill_parser_dict_chunk, chunks)):
+            chunk_rejected_nodes = {id(node): rejected_node for node, rejected_node in chunk_rejected_values}
+            if discriminator_key is None:
+                parser_dict = merge_parser_dicts(parser_dict, chunk_parser_dict, other_rejected_nodes=chunk_rejected_nodes)
+            elif chunk_parser_dict is not None:
+                if parser_dict is None:
+                    parser_dict = ParserSplit()
+                targets = get_split_targets(parser_dict, chunk_parser_dict)
+                if targets.count(None) > 1:
+                    # The log lines of several values of the chunk belong to the sub-model of the value None, so the chunk is
+                    # folded again in the order of its log lines. The failures have already been returned by the worker process.
+                    shape_cache = ShapeCache(0)
+                    for log_line in decode_chunk(chunk, []):
+                        parser_dict = fill_parser_split(log_line, parser_dict, shape_cache)
+                else:
+                    parser_dict = merge_parser_splits(parser_dict, chunk_parser_dict, targets, chunk_rejected_nodes)
+            line_count += chunk_line_count
+            read_line_count += chunk_line_count + len(failures)
+            if add_chunk_failures is not None and add_chunk_failures(chunk[0], chunk_line_count + len(failures), failures):
+                break
+
+    # The log lines, which could not be decoded, are counted as read like in import_log_lines.
+    print('Total amount of log lines read: ' + str(read_line_count))
+    return parser_dict, line_count
+
+# This function returns the byte ranges of the input files that have not been analyzed yet as tuples of the form
+# (input_file, start, end). The file_offsets dictionary holds the number of bytes of each file that were already analyzed.
+def get_input_ranges(input_files, file_offsets):
+    input_ranges = []
+    for input_file in input_files:
+        file_size = os.path.getsize(input_file)
+        start = file_offsets.get(os.path.abspath(input_file), 0)
+        if start > file_size:
+            # The file is smaller than at the last analysis, so it has been replaced in the meantime.
+            start = 0
+        elif 0 < start < file_size and JSONPGInput.get_compression(input_file) is not None:
+            # A compressed file, which has changed since the last analysis, can only be analyzed as a whole.
+            start = 0
+        input_ranges.append((input_file, start, file_size))
+    return input_ranges
+
+# This class restricts the classes, which can be loaded from a snapshot, to the classes of the parser dictionary.
+class SnapshotUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if name == 'LeafSummary':
+            return LeafSummary
+        if name == 'ParserNode':
+            return ParserNode
+        if name == 'ParserList':
+            return ParserList
+        if name == 'ParserSplit':
+            return ParserSplit
+        raise pickle.UnpicklingError('The class ' + module + '.' + name + ' is not allowed in a snapshot.')
+
+# This function saves the parser dictionary with its flags and the summaries of the values of the end nodes, together with the
+# analyzed byte offsets of the input files, in a compressed snapshot file.
+def save_snapshot(snapshot_file, parser_dict, file_offsets):
+    snapshot = {'version': snapshot_version, 'config': get_snapshot_config(), 'parser_dict': parser_dict, 'file_offsets': file_offsets}
+    # Write a temporary file first, so that the previous snapshot stays intact if the program is interrupted.
+    temp_file = snapshot_file + '.tmp'
+    with gzip.open(temp_file, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, snapshot_file)
+
+# This function loads a snapshot file and returns the parser dictionary and the analyzed byte offsets of the input files.
+def load_snapshot(snapshot_file):
+    with gzip.open(snapshot_file, 'rb') as f:
+        snapshot = SnapshotUnpickler(f).load()
+    if snapshot['version'] != snapshot_version:
+        raise ValueError('The snapshot ' + snapshot_file + ' has the unsupported version ' + str(snapshot['version']) + '.')
+    if snapshot['config'] != get_snapshot_config():
+        raise ValueError('The snapshot ' + snapshot_file + ' was generated with a different configuration of list_element_max_num, '
+                         'list_element_fold_num, date_format_list, optional_dict_chars, discriminator_key or '
+                         'discriminator_value_max_num.')
+    return snapshot['parser_dict'], snapshot['file_offsets']
+
+# This function returns the configuration parameters that influence the summaries of the values in the parser dictionary.
+def get_snapshot_config():
+    return {'list_element_max_num': list_element_max_num, 'list_element_fold_num': list_element_fold_num,
+            'date_format_list': list(date_format_list),
+            'optional_dict_chars': list(optional_dict_chars), 'discriminator_key': discriminator_key,
+            'discriminator_value_max_num': discriminator_value_max_num}
 
 # This function returns the first two key_prefix in the list that does not appear at the beginning of any key of the parser_dict.
 def generate_key_prefixes(parser_dict, key_prefix_list):
@@ -229,388 +1437,1085 @@ def generate_key_prefixes(parser_dict, key_prefix_list):
 
     raise ValueError('Too many prefixes appear at the start of the dictionary keys. Please add characters to key_prefix_list.')
 
-# This function returns all keys of the parser_dict.
+# This function returns all keys of the parser_dict. The keys are put on the stack in front of the subnodes, so that the keys are
+# returned in the same order as by a recursive traversal.
 def get_dictionary_keys(parser_dict):
     keys = []
-    if type(parser_dict) is dict:
-        for key in parser_dict:
-            if includes_dict(parser_dict[key]):
-                if type(parser_dict[key]) is dict:
-                    keys += [key]
-                    keys += get_dictionary_keys(parser_dict[key]['following_nodes'])
-                elif type(parser_dict[key]) is list:
-                    keys += [key]
-                    keys += get_dictionary_keys(parser_dict[key])
-    elif type(parser_dict) is list:
-        for sub_parser_dict in parser_dict:
-            keys += get_dictionary_keys(sub_parser_dict)
+    stack = [parser_dict]
+    while stack:
+        parser_dict = stack.pop()
+        if type(parser_dict) is str:
+            keys.append(parser_dict)
+        elif type(parser_dict) is dict:
+            for key, node in reversed(parser_dict.items()):
+                stack.append(node.following_nodes)
+                stack.append(key)
+        elif type(parser_dict) is ParserList:
+            stack.extend(reversed(parser_dict))
+        elif type(parser_dict) is ParserSplit:
+            stack.extend(reversed(list(parser_dict.values())))
     return keys
 
+# This class collects the strings of the generated parser in a list, so that the parser is built in linear time instead of
+# copying the whole string whenever a part is appended.
+class YmlBuffer:
+    def __init__(self, string=''):
+        self.parts = [string]
+
+    # This method appends the string to the buffer.
+    def append(self, string):
+        self.parts.append(string)
+
+    # This method returns True if the buffer ends with the suffix.
+    def endswith(self, suffix):
+        return self.get_tail(len(suffix)) == suffix
+
+    # This method returns the last characters of the buffer.
+    def get_tail(self, length):
+        tail = ''
+        for part in reversed(self.parts):
+            tail = part + tail
+            if len(tail) >= length:
+                return tail[len(tail) - length:]
+        return tail[-length:]
+
+    # This method removes the last characters of the buffer.
+    def truncate(self, length):
+        while length > 0 and self.parts:
+            part = self.parts.pop()
+            if len(part) > length:
+                self.parts.append(part[:len(part) - length])
+            length -= len(part)
+
+    # This method writes the buffer to the file, which must be opened in binary mode.
+    def write(self, file):
+        for part in self.parts:
+            file.write(part.encode())
+
+    # This method returns the content of the buffer as string.
+    def getvalue(self):
+        return ''.join(self.parts)
+
+
 '''
 This function returns the strings of the generated parser tree in yml format.
 @param dictionary dictionary of the parser tree.
 @param depth current depth of the parser node.
-@param end_node_string string for the definition of the end nodes in the parser.
-@param tree_string string for the structure of the tree in the parser.
-@param used_ids dictionary for the ids of the end nodes. Possible entries to a variable name are
-['time', 'val', 'int', 'intopt', 'float', 'floatopt', 'var'].
+@param end_node_buffer YmlBuffer for the definition of the end nodes in the parser.
+@param tree_buffer YmlBuffer for the structure of the tree in the parser.
+@param used_ids EndNodeRegistry for the ids of the end nodes. Possible kinds of end nodes of a variable name are
+['time', 'val', 'list', 'int', 'intopt', 'float', 'floatopt', 'var'].
 @param self_id ID of the current node.
 '''
-def get_parser_tree_yml(dictionary, depth=6, end_node_string='', tree_string='', used_ids={}, self_id=''):
-    if type(dictionary) is dict:
-        # Add the current parser node to the tree_string.
-        if 'following_nodes' in dictionary:
+def get_parser_tree_yml(dictionary, depth=6, end_node_buffer=None, tree_buffer=None, used_ids=None, self_id=''):
+    global fragment_epoch, fragment_config
+    if end_node_buffer is None:
+        end_node_buffer = YmlBuffer()
+    if tree_buffer is None:
+        tree_buffer = YmlBuffer()
+    if used_ids is None:
+        used_ids = EndNodeRegistry(share_end_nodes)
+
+    # The rendered fragments can not be reused if the configuration, which changes the yml of the nodes, changed.
+    config = (tab_string, optional_key_prefix, nullable_key_prefix, tuple(problematic_chars), tuple(optional_dict_chars),
+              list_element_max_num)
+    if config != fragment_config:
+        fragment_config = config
+        fragment_epoch += 1
+
+    program = get_parser_tree_program(dictionary, depth, self_id, tree_buffer.endswith('- '))
+    execute_parser_tree_program(program, end_node_buffer, tree_buffer, used_ids)
+    return end_node_buffer, tree_buffer
+
+# This function returns the program of the parser tree, which is executed by execute_parser_tree_program. The programs of the
+# parser nodes are stored in their rendered fragments and only the nodes, whose fragments are invalid or were rendered in another
+# context, are rendered again. Every entry of the stack holds the program, to which the node is added, and the fragment of the
+# parser node above it. after_marker is True if the program ends with a list marker.
+def get_parser_tree_program(dictionary, depth, self_id, after_marker):
+    program = []
+    stack = [(dictionary, depth, self_id, program, None)]
+    while stack:
+        dictionary, depth, self_id, node_program, parent = stack.pop()
+        if type(dictionary) is str:
+            node_program.append(dictionary)
+            # The self_id of strings is True if the string is a list marker.
+            after_marker = self_id
+
+        elif type(dictionary) is RenderedFragment:
+            # Merge the adjacent strings of the completed program.
+            merged_program = []
+            for item in node_program:
+                if type(item) is str and merged_program and type(merged_program[-1]) is str:
+                    merged_program[-1] += item
+                else:
+                    merged_program.append(item)
+            node_program[:] = merged_program
+            dictionary.valid = True
+
+        elif type(dictionary) is ParserNode:
+            fragment = dictionary.fragment
+            if fragment is None:
+                fragment = dictionary.fragment = RenderedFragment()
+            fragment.parent = parent
+            context = (fragment_epoch, depth, self_id, after_marker)
+            after_marker = False
+            if fragment.valid and fragment.context == context:
+                node_program.append(fragment.program)
+                continue
+            fragment.valid = False
+            fragment.context = context
+            fragment.program = []
+            node_program.append(fragment.program)
+            node_program = fragment.program
+
+            # Add the current parser node to the tree_buffer.
             # Check if inconsistencies appeared in the analysis of this node.
-            if dictionary['inconsistent']:
-                if tree_string[-2:] != '- ':
-                    tree_string += "\n" + depth * tab_string + "# Inconsistencies appeared in the analysis of the following node!"
+            if dictionary.inconsistent:
+                if not context[3]:
+                    node_program.append("\n" + depth * tab_string + "# Inconsistencies appeared in the analysis of the following node!")
                 else:
-                    tree_string = tree_string[:-2] + "# Inconsistencies appeared in the analysis of the following node!\n" +\
-                        depth * tab_string + '- '
+                    node_program.append(2)
+                    node_program.append("# Inconsistencies appeared in the analysis of the following node!\n" + depth * tab_string + '- ')
 
             # Add tabs.
-            if tree_string[-2:] != '- ':
-                tree_string += "\n" + depth * tab_string
+            if not context[3]:
+                node_program.append("\n" + depth * tab_string)
 
             # Differentiate if the node is optional and/or nullable.
             key_sting = str(self_id)
-            if dictionary['optional']:
+            if dictionary.optional:
                 key_sting = optional_key_prefix + key_sting
-            if dictionary['nullable'] and dictionary['following_nodes'] != {'null'}:
+            if dictionary.nullable and not is_null_leaf(dictionary.following_nodes):
                 key_sting = nullable_key_prefix + key_sting
-            tree_string += add_quotation_marks(key_sting) + ":"
+            node_program.append(add_quotation_marks(key_sting) + ":")
 
             # Append the following nodes to the strings.
-            [end_node_string, tree_string] = get_parser_tree_yml(dictionary['following_nodes'], depth+1, date_format_list, end_node_string,
-                    tree_string, used_ids, self_id)
+            stack.append((fragment, depth, self_id, node_program, parent))
+            stack.append((dictionary.following_nodes, depth+1, self_id, node_program, fragment))
 
-        elif dictionary == {}:
-            tree_string += " EMPTY_OBJECT"
+        elif type(dictionary) is dict:
+            if dictionary == {}:
+                node_program.append(" EMPTY_OBJECT")
+                after_marker = False
 
-        else:
-            # Add the keys of the dictionary as nodes.
-            for key in dictionary:
-                # Check if inconsistencies appeared in the analysis of this node.
-                if dictionary[key]['inconsistent']:
-                    if tree_string[-2:] != '- ':
-                        tree_string += "\n" + depth * tab_string + "# Inconsistencies appeared in the analysis of the following node!"
-                    else:
-                        tree_string = tree_string[:-2] + "# Inconsistencies appeared in the analysis of the following node!\n" +\
-                            depth * tab_string + '- '
-
-                # Add tabs.
-                if tree_string[-2:] != '- ':
-                    tree_string += "\n" + depth * tab_string
-
-                # Differentiate if the node is optional and/or nullable.
-                key_sting = str(key)
-                if dictionary[key]['optional']:
-                    key_sting = optional_key_prefix + key_sting
-                if dictionary[key]['nullable'] and dictionary[key]['following_nodes'] != {'null'}:
-                    key_sting = nullable_key_prefix + key_sting
-                tree_string += add_quotation_marks(key_sting) + ":"
+            else:
+                # Add the keys of the dictionary as parser nodes.
+                stack.extend((dictionary[key], depth, str(key), node_program, parent) for key in reversed(dictionary))
 
+        elif type(dictionary) is ParserList and dictionary.contains_dict:
+            dictionary.fragment = parent
+            # Add the list elements to the parser tree.
+            for i in reversed(range(len(dictionary))):
                 # Append the following nodes to the strings.
-                [end_node_string, tree_string] = get_parser_tree_yml(dictionary[key]['following_nodes'], depth+1,
-                        end_node_string, tree_string, used_ids, str(key))
+                if type(dictionary[i]) is dict:
+                    stack.append((dictionary[i], depth+1, self_id, node_program, parent))
+                    stack.append(("\n" + depth * tab_string + "- ", depth, True, node_program, parent))
+                else:
+                    stack.append(("\n" + depth * tab_string + "# Arrays of arrays are not yet supported by the JSON parser!", depth,
+                                  False, node_program, parent))
+
+        elif type(dictionary) is LeafSummary:
+            dictionary.fragment = parent
+            node_program.append(get_end_node_program(dictionary, depth, self_id))
+            after_marker = False
+
+    return program
+
+# This function returns the program of the end node of the LeafSummary. Empty arrays and null objects are returned as strings.
+# Otherwise a tuple is returned, which holds the name of the node in the EndNodeRegistry, the kind of the end node, the value,
+# which is numbered in the EndNodeRegistry, or None if the id is not numbered, the id of the node, the suffix of the id, the type
+# and the further lines of the end node and the string in front of the id in the tree_buffer.
+def get_end_node_program(dictionary, depth, self_id):
+    included_in_tuple = dictionary.included_in_tuple()
+    values = dictionary.values
+    if included_in_tuple:
+        tree_prefix = "\n" + depth * tab_string + "- "
+    else:
+        tree_prefix = " "
+
+    # Add a time stamp end node
+    if dictionary.date_formats:
+        #Find the fitting date_format
+        date_format = dictionary.date_formats[0]
+        kind, suffix, value, type_name = 'time', '_time', date_format, 'DateTimeModelElement'
+        tail = "\n" + 5 * tab_string + "date_format: '" + date_format + "'\n"
+
+    # Add a fixed element end node.
+    elif len(values) == 1:
+        if values == {tuple([])}:
+            # Check if the only entry is a empty list.
+            return "\n" + depth * tab_string + '"EMPTY_ARRAY"'
+        elif dictionary.is_null():
+            # Check if the only entry is a empty list.
+            return "\n" + depth * tab_string + '"NULL_OBJECT"'
+        kind, suffix, type_name = 'val', '_str', 'FixedDataModelElement'
+        # Remove the dictionary, if the entry is included in one.
+        if included_in_tuple:
+            value = next(iter(values))[0]
+            value_string = convert_to_string(value)
+        else:
+            value = next(iter(values))
+            value_string = str(value)
 
-    elif type(dictionary) is list and includes_dict(dictionary):
-        # Add the list elements to the parser tree.
-        for i in range(len(dictionary)):
-            # Append the following nodes to the strings.
-            if type(dictionary[i]) is dict:
-                tree_string += "\n" + depth * tab_string + "- "
+        # Change quotation marks if they appear in the value.
+        if "'" in value_string:
+            tail = "\n" + 5 * tab_string + "args: \"" + value_string + "\"\n"
+        else:
+            tail = "\n" + 5 * tab_string + "args: '" + value_string + "'\n"
 
-                [end_node_string, tree_string] = get_parser_tree_yml(dictionary[i], depth+1, end_node_string, tree_string, used_ids,
-                        self_id)
-            else:
-                tree_string += "\n" + depth * tab_string + "# Arrays of arrays are not yet supported by the JSON parser!"
-
-    elif type(dictionary) is set:
-        # Add the elements of the lists to the tree_string.
-        # Check if the name of the current node must be added to the used_ids.
-        included_in_tuple = all(type(val) is tuple for val in dictionary)
-
-        if remove_characters(self_id, problematic_chars) not in used_ids:
-            used_ids[remove_characters(self_id, problematic_chars)] = {}
-
-        # Add a time stamp end node
-        if any(all(follows_format(date_format, val) for val in dictionary) for date_format in date_format_list) or (
-                included_in_tuple and dictionary != {tuple([])} and
-                any(all(follows_format(date_format, val[0]) for val in dictionary) for date_format in date_format_list)):
-            if 'time' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                used_ids[remove_characters(self_id, problematic_chars)]['time'] = []
-
-            #Find the fitting date_format
-            date_format = ''
-            for d_format in date_format_list:
-                if (included_in_tuple and follows_format(d_format, next(iter(dictionary))[0])) or (
-                        follows_format(d_format, next(iter(dictionary)))):
-                    date_format = d_format
-                    break
+    # Add a list node.
+    elif not dictionary.exceeds_list():
+        kind, suffix, type_name = 'list', '_list', 'FixedWordlistDataModelElement'
+        value = convert_to_lists(values)
+        try:
+            value.sort()
+        except RecursionError:
+            # Nested lists, which are too deep to be compared, are sorted by their strings.
+            value.sort(key=convert_to_string)
+
+        if included_in_tuple:
+            value = [val[0] for val in value]
+
+        tail = "\n" + 5 * tab_string + "args:"
+        for val in value:
+            tail += "\n" + 5 * tab_string + "- \"" + convert_to_string(val) + "\""
+        tail += "\n" + 5 * tab_string
+
+    # Add a integer element end node.
+    elif dictionary.all_int:
+        value, type_name = None, 'DecimalIntegerValueModelElement'
+        # Check the value signs
+        if not dictionary.negative:
+            kind, suffix, tail = 'int', '_int', "\n"
+        else:
+            kind, suffix, tail = 'intopt', '_intopt', "\n" + 5 * tab_string + "value_sign_type: 'optional'" + "\n"
+
+    # Add a float end node.
+    elif dictionary.all_number:
+        value, type_name = None, 'DecimalFloatValueModelElement'
+        tail = "\n" + 5 * tab_string + "exponent_type: 'optional'"
+        # Check the value signs
+        if not dictionary.negative:
+            kind, suffix, tail = 'float', '_float', tail + "\n"
+        else:
+            kind, suffix, tail = 'floatopt', '_floatopt', tail + "\n" + 5 * tab_string + "value_sign_type: 'optional'" + "\n"
 
-            # Add the new date format to the end nodes
-            if date_format not in used_ids[remove_characters(self_id, problematic_chars)]['time']:
-                end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_time" +
-                        str(len(used_ids[remove_characters(self_id, problematic_chars)]['time'])), problematic_chars)
-                end_node_string += "\n" + 5 * tab_string + "type: DateTimeModelElement"
-                end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_time" +
-                        str(len(used_ids[remove_characters(self_id, problematic_chars)]['time'])), problematic_chars) + "'"
-                end_node_string += "\n" + 5 * tab_string + "date_format: '" + date_format + "'\n"
-                used_ids[remove_characters(self_id, problematic_chars)]['time'].append(date_format)
-
-            # Add the node to the tree
-            if included_in_tuple:
-                tree_string = "\n" + tree_string + depth * tab_string + "- " + remove_characters(str(self_id) + "_time" +
-                    str(used_ids[remove_characters(self_id, problematic_chars)]['time'].index(date_format)), problematic_chars)
-            else:
-                tree_string += " " + remove_characters(str(self_id) + "_time" +
-                    str(used_ids[remove_characters(self_id, problematic_chars)]['time'].index(date_format)), problematic_chars)
-
-        # Add a fixed element end node.
-        elif len(dictionary) == 1:
-            if dictionary == {tuple([])}:
-                # Check if the only entry is a empty list.
-                tree_string += "\n" + depth * tab_string + '"EMPTY_ARRAY"'
-            elif dictionary == {'null'}:
-                # Check if the only entry is a empty list.
-                tree_string += "\n" + depth * tab_string + '"NULL_OBJECT"'
+    # Add a variable end node.
+    else:
+        kind, suffix, type_name = 'var', '_var', 'VariableByteDataModelElement'
+        # Check what additional characters are needed in the variable.
+        value = ''
+        for char in optional_dict_chars:
+            # Test if the character appears in the strings or in any string if the following node is a list.
+            if char in dictionary.chars:
+                value += char
+        tail = "\n" + 5 * tab_string + 'args: "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_' + value + "\"\n"
+
+    return (remove_characters(self_id, problematic_chars), kind, value, str(self_id), suffix, "\n" + 5 * tab_string + "type: " +
+            type_name, tail, tree_prefix)
+
+# This class assigns the ids of the end nodes, which are looked up in dictionaries by their names, kinds and values. If
+# share_end_nodes is True, end nodes with the same type and arguments also share one id across the variable names.
+class EndNodeRegistry:
+    # The kinds of end nodes, which can be shared across the variable names.
+    shared_kinds = ('val', 'list', 'var')
+
+    # This method initializes an empty registry.
+    def __init__(self, share_end_nodes=False):
+        self.share_end_nodes = share_end_nodes
+        # The ids of the end nodes by their names, kinds and values and the numbers of the numbered values of every name and kind.
+        self.node_ids = {}
+        self.value_counts = {}
+        # The ids of the shared end nodes by their types and arguments.
+        self.shared_node_ids = {}
+        self.end_node_count = 0
+        self.deduplicated_count = 0
+
+    # This method returns the id of the end node and True if the id is new and the end node must be added to the end_node_buffer.
+    # The values of wordlists are lists, which are converted into tuples for the dictionary.
+    def get_node_id(self, name, kind, value, self_id, suffix, type_line, tail):
+        key = (name, kind, convert_to_tuples(value) if kind == 'list' else value)
+        node_id = self.node_ids.get(key)
+        if node_id is not None:
+            return node_id, False
+        if self.share_end_nodes and kind in self.shared_kinds:
+            shared_key = (type_line, tail)
+            node_id = self.shared_node_ids.get(shared_key)
+            if node_id is not None:
+                self.node_ids[key] = node_id
+                self.deduplicated_count += 1
+                return node_id, False
+        if value is None:
+            # The ids of integer and float end nodes are not numbered.
+            node_id = remove_characters(self_id + suffix, problematic_chars)
+        else:
+            count_key = (name, kind)
+            id_num = self.value_counts.get(count_key, 0)
+            self.value_counts[count_key] = id_num + 1
+            node_id = remove_characters(self_id + suffix + str(id_num), problematic_chars)
+        self.node_ids[key] = node_id
+        if self.share_end_nodes and kind in self.shared_kinds:
+            self.shared_node_ids[shared_key] = node_id
+        self.end_node_count += 1
+        return node_id, True
+
+# This function adds the program of the parser tree to the buffers and assigns the ids of the end nodes in the order of the tree.
+def execute_parser_tree_program(program, end_node_buffer, tree_buffer, used_ids):
+    stack = [iter(program)]
+    while stack:
+        for item in stack[-1]:
+            if type(item) is str:
+                tree_buffer.append(item)
+            elif type(item) is list:
+                stack.append(iter(item))
+                break
+            elif type(item) is int:
+                tree_buffer.truncate(item)
             else:
-                if 'val' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                    used_ids[remove_characters(self_id, problematic_chars)]['val'] = []
-
-                # Check if the value has already appeared with the name of the variable, or if it must be added to the used_ids and
-                # end_node_string.
-                if not included_in_tuple and next(iter(dictionary)) in used_ids[remove_characters(self_id, problematic_chars)]['val']:
-                    id_num = used_ids[remove_characters(self_id, problematic_chars)]['val'].index(next(iter(dictionary)))
-                elif included_in_tuple and next(iter(dictionary))[0] in used_ids[remove_characters(self_id, problematic_chars)]['val']:
-                    id_num = used_ids[remove_characters(self_id, problematic_chars)]['val'].index(next(iter(dictionary))[0])
-                else:
-                    id_num = len(used_ids[remove_characters(self_id, problematic_chars)]['val'])
-                    if included_in_tuple:
-                        used_ids[remove_characters(self_id, problematic_chars)]['val'].append(next(iter(dictionary))[0])
-                    else:
-                        used_ids[remove_characters(self_id, problematic_chars)]['val'].append(next(iter(dictionary)))
-                    end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_str" + str(id_num),
-                                                                                            problematic_chars)
-                    end_node_string += "\n" + 5 * tab_string + "type: FixedDataModelElement"
-                    end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_str" + str(id_num),
-                                                                                             problematic_chars) + "'"
-                    value_string = ''
-
-                    # Remove the dictionary, if the entry is included in one.
-                    if included_in_tuple:
-                        value_string = str(convert_to_lists(next(iter(dictionary))[0]))
-                    else:
-                        value_string = str(next(iter(dictionary)))
-
-                    # Change quotation marks if they appear in the value.
-                    if "'" in value_string:
-                        end_node_string += "\n" + 5 * tab_string + "args: \"" + value_string + "\"\n"
-                    else:
-                        end_node_string += "\n" + 5 * tab_string + "args: '" + value_string + "'\n"
-                # Add the list element if the value is of type list.
-                if included_in_tuple:
-                    tree_string += "\n" + depth * tab_string + "- " + remove_characters(str(self_id) + "_str" + str(id_num),
-                                                                                        problematic_chars)
-                else:
-                    tree_string += " " + remove_characters(str(self_id) + "_str" + str(id_num), problematic_chars)
-
-        # Add a list node.
-        elif len(dictionary) <= list_element_max_num:
-            if 'list' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                used_ids[remove_characters(self_id, problematic_chars)]['list'] = []
+                name, kind, value, self_id, suffix, type_line, tail, tree_prefix = item
+                # Check if the end node has already appeared, or if it must be added to the end_node_buffer.
+                node_id, new = used_ids.get_node_id(name, kind, value, self_id, suffix, type_line, tail)
+                if new:
+                    end_node_buffer.append("\n" + 4 * tab_string + "- id: " + node_id + type_line + "\n" + 5 * tab_string +
+                                           "name: '" + node_id + "'" + tail)
+                tree_buffer.append(tree_prefix + node_id)
+        else:
+            stack.pop()
 
-            dictionary = convert_to_lists(dictionary)
-            dictionary.sort()
 
-            if included_in_tuple:
-                reduced_dictionary = [val[0] for val in dictionary]
-            else:
-                reduced_dictionary = dictionary
-
-            # Add the list element to the end_node_string if the list element has not already appeared.
-            if reduced_dictionary not in used_ids[remove_characters(self_id, problematic_chars)]['list']:
-                id_num = len(used_ids[remove_characters(self_id, problematic_chars)]['list'])
-                used_ids[remove_characters(self_id, problematic_chars)]['list'].append(reduced_dictionary)
-                end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_list" + str(id_num),
-                                                                                        problematic_chars)
-                end_node_string += "\n" + 5 * tab_string + "type: FixedWordlistDataModelElement"
-                end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_list" + str(id_num),
-                                                                                         problematic_chars) + "'"
-                end_node_string += "\n" + 5 * tab_string + "args:"
-                for val in reduced_dictionary:
-                    end_node_string += "\n" + 5 * tab_string + "- \"" + str(val) + "\""
-                end_node_string += "\n" + 5 * tab_string
-            else:
-                id_num = used_ids[remove_characters(self_id, problematic_chars)]['list'].index(reduced_dictionary)
+# This function reads the byte ranges of the input files and yields the cleaned log lines one by one as tuples of the form
+# (input_file, offset, line). The lines are not buffered, so that every log line can be folded into the parser_dict as soon as it
+# is read and the memory usage does not depend on the size of the input files.
+def import_log_lines(input_ranges):
+    line_id = 0
+    for input_file, start, end in input_ranges:
+        print('Import ' + str(input_file) + '!')
 
-            # Check if the values are all contained in a list and add the variable element to the tree_string.
-            if included_in_tuple:
-                tree_string += "\n" + depth * tab_string + "- " + remove_characters(str(self_id) + "_list" + str(id_num), problematic_chars)
-            else:
-                tree_string += " " + remove_characters(str(self_id) + "_list" + str(id_num), problematic_chars)
-
-        # Add a integer element end node.
-        elif all(type(val) is int for val in dictionary) or (included_in_tuple and all(type(val[0]) is int for val in dictionary)):
-            # Check the value signs
-            if (included_in_tuple and all(val[0] >= 0 for val in dictionary)) or (
-                        not included_in_tuple and all(val >= 0 for val in dictionary)):
-                if 'int' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                    used_ids[remove_characters(self_id, problematic_chars)]['int'] = None
-                    end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_int", problematic_chars)
-                    end_node_string += "\n" + 5 * tab_string + "type: DecimalIntegerValueModelElement"
-                    end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_int",
-                                                                                         problematic_chars) + "'\n"
-
-                if included_in_tuple:
-                    tree_string += "\n" + depth * tab_string + "- " + remove_characters(str(self_id) + "_int", problematic_chars)
-                else:
-                    tree_string += " " + remove_characters(str(self_id) + "_int", problematic_chars)
-            else:
-                if 'intopt' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                    used_ids[remove_characters(self_id, problematic_chars)]['intopt'] = None
-                    end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_intopt", problematic_chars)
-                    end_node_string += "\n" + 5 * tab_string + "type: DecimalIntegerValueModelElement"
-                    end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_intopt",
-                                                                                         problematic_chars) + "'"
-                    end_node_string += "\n" + 5 * tab_string + "value_sign_type: 'optional'" + "\n"
-
-                if included_in_tuple:
-                    tree_string += "\n" + depth * tab_string + "- " + remove_characters(str(self_id) + "_intopt", problematic_chars)
-                else:
-                    tree_string += " " + remove_characters(str(self_id) + "_intopt", problematic_chars)
-
-        # Add a float end node.
-        elif all(type(val) is int or type(val) is float for val in dictionary) or (
-                included_in_tuple and all(type(val[0]) is int or type(val[0]) is float for val in dictionary)):
-            # Check the value signs
-            if (included_in_tuple and all(val[0] >= 0 for val in dictionary)) or (
-                        not included_in_tuple and all(val >= 0 for val in dictionary)):
-                if 'float' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                    used_ids[remove_characters(self_id, problematic_chars)]['float'] = None
-                    end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_float", problematic_chars)
-                    end_node_string += "\n" + 5 * tab_string + "type: DecimalFloatValueModelElement"
-                    end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_float",
-                                                                                         problematic_chars) + "'"
-                    end_node_string += "\n" + 5 * tab_string + "exponent_type: 'optional'" + "\n"
-
-                if included_in_tuple:
-                    tree_string += "\n" + depth * tab_string + "- " + remove_characters(str(self_id) + "_float", problematic_chars)
-                else:
-                    tree_string += " " + remove_characters(str(self_id) + "_float", problematic_chars)
-            else:
-                if 'floatopt' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                    used_ids[remove_characters(self_id, problematic_chars)]['floatopt'] = None
-                    end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_floatopt", problematic_chars)
-                    end_node_string += "\n" + 5 * tab_string + "type: DecimalFloatValueModelElement"
-                    end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_floatopt",
-                                                                                             problematic_chars) + "'"
-                    end_node_string += "\n" + 5 * tab_string + "exponent_type: 'optional'"
-                    end_node_string += "\n" + 5 * tab_string + "value_sign_type: 'optional'" + "\n"
-
-                if included_in_tuple:
-                    tree_string += "\n" + depth * tab_string + "- " + remove_characters(str(self_id) + "_floatopt", problematic_chars)
-                else:
-                    tree_string += " " + remove_characters(str(self_id) + "_floatopt", problematic_chars)
+        for log_line in JSONPGInput.clean_located_lines(input_file, start, end):
+            yield log_line
+            line_id += 1
 
-        # Add a variable end node.
-        else:
-            if 'var' not in used_ids[remove_characters(self_id, problematic_chars)]:
-                used_ids[remove_characters(self_id, problematic_chars)]['var'] = []
-
-            # Check what additional characters are needed in the variable.
-            additional_chars = ''
-            for char in optional_dict_chars:
-                # Test if the character appears in the strings or in any string if the following node is a list.
-                if any((type(val) is str and char in val) or (
-                        included_in_tuple and any(type(char) is str and char in val2 for val2 in val)) for val in dictionary):
-                    additional_chars += char
-
-            # Add the variable element to the end_node_string if the variable element with the additional_chars has not already appeared.
-            if additional_chars not in used_ids[remove_characters(self_id, problematic_chars)]['var']:
-                id_num = len(used_ids[remove_characters(self_id, problematic_chars)]['var'])
-                used_ids[remove_characters(self_id, problematic_chars)]['var'].append(additional_chars)
-                end_node_string += "\n" + 4 * tab_string + "- id: " + remove_characters(str(self_id) + "_var" + str(id_num),
-                                                                                        problematic_chars)
-                end_node_string += "\n" + 5 * tab_string + "type: VariableByteDataModelElement"
-                end_node_string += "\n" + 5 * tab_string + "name: '" + remove_characters(str(self_id) + "_var" + str(id_num),
-                                                                                         problematic_chars) + "'"
-                end_node_string += "\n" + 5 * tab_string + 'args: "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_'
-                end_node_string += additional_chars
-                end_node_string += "\"\n"
-            else:
-                id_num = used_ids[remove_characters(self_id, problematic_chars)]['var'].index(additional_chars)
+        print('Total amount of log lines read: ' + str(line_id))
 
-            # Check if the values are all contained in a list and add the variable element to the tree_string.
-            if included_in_tuple:
-                tree_string += "\n" + depth * tab_string + "- " + remove_characters(str(self_id) + "_var" + str(id_num), problematic_chars)
-            else:
-                tree_string += " " + remove_characters(str(self_id) + "_var" + str(id_num), problematic_chars)
+# This class passes the log lines of the form (input_file, offset, line) on and stores the offset of the last one of every file.
+class LineOffsetTracker:
+    def __init__(self, lines):
+        self.lines = lines
+        self.line_offsets = {}
+        self.complete = False
 
-    return end_node_string, tree_string
+    def __iter__(self):
+        line_offsets = self.line_offsets
+        for log_line in self.lines:
+            line_offsets[log_line[0]] = log_line[1]
+            yield log_line
+        self.complete = True
 
 
 # Load configuration
 input_files = JSONPGConfig.input_files
+parser_file = JSONPGConfig.parser_file
 date_format_list = JSONPGConfig.date_format_list
 key_prefix_list = JSONPGConfig.key_prefix_list
 optional_dict_chars = JSONPGConfig.optional_dict_chars
 problematic_chars = JSONPGConfig.problematic_chars
 tab_string = JSONPGConfig.tab_string
 list_element_max_num = JSONPGConfig.list_element_max_num
+json_backend = JSONPGConfig.json_backend
+parallel_processes = JSONPGConfig.parallel_processes
+parallel_chunk_size = JSONPGConfig.parallel_chunk_size
+snapshot_file = JSONPGConfig.snapshot_file
+convergence_lines = JSONPGConfig.convergence_lines
+sampling_mode = JSONPGConfig.sampling_mode
+sampling_stride = JSONPGConfig.sampling_stride
+sampling_size = JSONPGConfig.sampling_size
+sampling_seed = JSONPGConfig.sampling_seed
+progress_interval = JSONPGConfig.progress_interval
+statistics_file = JSONPGConfig.statistics_file
+profile_file = JSONPGConfig.profile_file
+shape_cache_size = JSONPGConfig.shape_cache_size
+list_element_fold_num = JSONPGConfig.list_element_fold_num
+discriminator_key = JSONPGConfig.discriminator_key
+discriminator_value_max_num = JSONPGConfig.discriminator_value_max_num
+follow_interval = JSONPGConfig.follow_interval
+follow_debounce = JSONPGConfig.follow_debounce
+quarantine_file = JSONPGConfig.quarantine_file
+decode_failure_rate_max = JSONPGConfig.decode_failure_rate_max
+decode_failure_min_lines = JSONPGConfig.decode_failure_min_lines
+fold_engine = JSONPGConfig.fold_engine
+column_batch_size = JSONPGConfig.column_batch_size
+share_end_nodes = JSONPGConfig.share_end_nodes
+
+# Names of the configuration parameters, which can be overridden with configure.
+config_parameter_names = ['input_files', 'parser_file', 'date_format_list', 'key_prefix_list', 'optional_dict_chars',
+                          'problematic_chars', 'tab_string', 'list_element_max_num', 'json_backend', 'parallel_processes',
+                          'parallel_chunk_size', 'snapshot_file', 'convergence_lines', 'sampling_mode', 'sampling_stride',
+                          'sampling_size', 'sampling_seed', 'progress_interval', 'statistics_file', 'profile_file',
+                          'shape_cache_size', 'list_element_fold_num', 'discriminator_key', 'discriminator_value_max_num',
+                          'follow_interval', 'follow_debounce', 'quarantine_file', 'decode_failure_rate_max',
+                          'decode_failure_min_lines', 'fold_engine', 'column_batch_size',
+                          'share_end_nodes']
+
+# The entries of optional_dict_chars that consist of more than one character.
+multi_char_sequences = [char for char in optional_dict_chars if len(char) != 1]
+
+# The compiled matchers of the date formats for single values and for columns.
+date_format_matchers = {}
+date_format_column_matchers = {}
+
+# Version of the format of the snapshot files.
+snapshot_version = 4
+
+# Number of changes of the parser model, i.e., of the structure, the flags and the summaries of the end nodes, which can change
+# the generated parser model.
+model_change_count = 0
+
+# Number of the changes of the structure of the parser dictionary, i.e., of the nodes, the flags and the types of the end nodes.
+structure_change_count = 0
+
+# Number of the lists of dictionaries, of which not all elements were folded because of list_element_fold_num.
+truncated_list_count = 0
+
+# The nodes and the parser nodes of the values, which the nodes of the parser dictionary rejected, by the ids of the nodes. The
+# rejected values are only recorded by the worker processes of the parallel analysis and None otherwise.
+rejected_nodes = None
+
+# Number of the invalidations of all rendered fragments, which is part of the context of the fragments, and the configuration, with
+# which the fragments were rendered.
+fragment_epoch = 0
+fragment_config = None
+
+# This function returns the current configuration parameters as dictionary.
+def get_config():
+    return {name: globals()[name] for name in config_parameter_names}
+
+# This function overrides the configuration parameters with the values of the config dictionary. The parameters are stored in
+# module-level variables, so the configuration applies to all functions of this module.
+def configure(config):
+    global multi_char_sequences
+    for name in config:
+        if name not in config_parameter_names:
+            raise ValueError('Unknown configuration parameter ' + str(name) + '. Possible parameters are: ' +
+                             ', '.join(config_parameter_names))
+    globals().update(config)
+    multi_char_sequences = [char for char in optional_dict_chars if len(char) != 1]
+
+# This function returns the statistics of the parser dictionary: the numbers of nodes, end nodes and optional, nullable and
+# inconsistent nodes, and the top_num end nodes with the most distinct values, which make the parser model large.
+# If the log lines are split into sub-models, the statistics also hold the numbers of log lines, nodes and end nodes of every
+# sub-model and the mean number of nodes of the sub-models of the log lines, which the parser has to check for every log line.
+def get_model_statistics(parser_dict, top_num=10):
+    statistics = {'nodes': 0, 'leaves': 0, 'optional_nodes': 0, 'nullable_nodes': 0, 'inconsistent_nodes': 0}
+    leaves = []
+    collect_model_statistics(parser_dict, '', statistics, leaves)
+    leaves.sort(key=lambda leaf: (-leaf['distinct_values'], -leaf['chars'], leaf['path']))
+    statistics['highest_cardinality_leaves'] = leaves[:top_num]
+    if type(parser_dict) is ParserSplit:
+        statistics['sub_models'] = []
+        node_sum = 0
+        for value, sub_parser_dict in parser_dict.items():
+            sub_statistics = get_model_statistics(sub_parser_dict, 0)
+            line_count = parser_dict.line_counts.get(value, 0)
+            statistics['sub_models'].append({'value': value, 'lines': line_count, 'nodes': sub_statistics['nodes'],
+                                             'leaves': sub_statistics['leaves']})
+            node_sum += line_count * sub_statistics['nodes']
+        line_count = sum(parser_dict.line_counts.values())
+        statistics['mean_nodes_per_line'] = node_sum / line_count if line_count > 0 else None
+    return statistics
+
+# This function counts the nodes of the parser dictionary in the statistics and appends the summaries of the end nodes with their
+# paths to the leaves list. The numbers of distinct values beyond list_element_max_num + 1 are estimated.
+def collect_model_statistics(parser_dict, path, statistics, leaves):
+    stack = [(parser_dict, path)]
+    while stack:
+        parser_dict, path = stack.pop()
+        if type(parser_dict) is dict:
+            for key, node in parser_dict.items():
+                statistics['nodes'] += 1
+                for flag in ['optional', 'nullable', 'inconsistent']:
+                    if getattr(node, flag):
+                        statistics[flag + '_nodes'] += 1
+                stack.append((node.following_nodes, path + '.' + key if path else key))
+        elif type(parser_dict) is ParserList:
+            for index, sub_parser_dict in enumerate(parser_dict):
+                stack.append((sub_parser_dict, path + '[' + str(index) + ']'))
+        elif type(parser_dict) is ParserSplit:
+            for value, sub_parser_dict in parser_dict.items():
+                stack.append((sub_parser_dict, '[' + repr(value) + ']'))
+        elif type(parser_dict) is LeafSummary:
+            statistics['leaves'] += 1
+            leaves.append({'path': path, 'distinct_values': parser_dict.get_distinct_count(),
+                           'distinct_values_estimated': parser_dict.distinct_sketch is not None,
+                           'exceeds_list': parser_dict.exceeds_list(), 'chars': len(parser_dict.chars)})
+
+# This function generates the yml of the parser model from the parser dictionary and returns the buffers of the end nodes and of
+# the parser tree, which form the parser model in this order. The key prefixes are generated if they are not given. The ids of the
+# end nodes are assigned by the EndNodeRegistry used_ids, which holds the numbers of the end nodes afterwards.
+def get_parser_buffers(parser_dict, key_prefixes=None, used_ids=None):
+    global optional_key_prefix, nullable_key_prefix
+    if key_prefixes is None:
+        key_prefixes = generate_key_prefixes(parser_dict, key_prefix_list)
+    optional_key_prefix = key_prefixes[0]
+    nullable_key_prefix = key_prefixes[1]
+    if used_ids is None:
+        used_ids = EndNodeRegistry(share_end_nodes)
+
+    end_node_buffer = YmlBuffer("\nParser:")
+
+    if type(parser_dict) is ParserSplit:
+        tree_buffer = YmlBuffer()
+        model_ids = []
+        # The sub-models are checked by the parser in the order of their numbers of log lines. The sub-model of the value None is
+        # checked last, since it holds the log lines of all further values.
+        values = sorted(parser_dict, key=lambda value: (value is None, -parser_dict.line_counts.get(value, 0)))
+        for value in values:
+            model_id = 'json' + str(len(model_ids))
+            model_ids.append(model_id)
+            tree_buffer.append("\n" + 4 * tab_string + "# " + str(discriminator_key) + ": " + repr(value))
+            tree_buffer.append(get_json_model_yml(model_id, 'model' + str(len(model_ids) - 1), False))
+            get_parser_tree_yml(parser_dict[value], depth=6, end_node_buffer=end_node_buffer, tree_buffer=tree_buffer,
+                                used_ids=used_ids)
+        tree_buffer.append("\n" + 4 * tab_string + "- id: json\n" + 5 * tab_string + "start: True\n" + 5 * tab_string +
+                           "type: FirstMatchModelElement\n" + 5 * tab_string + "name: 'model'\n" + 5 * tab_string + "args:")
+        for model_id in model_ids:
+            tree_buffer.append("\n" + 6 * tab_string + "- " + model_id)
+        return end_node_buffer, tree_buffer
+
+    tree_buffer = YmlBuffer(get_json_model_yml('json', 'model', True))
+
+    get_parser_tree_yml(parser_dict, depth=6, end_node_buffer=end_node_buffer, tree_buffer=tree_buffer, used_ids=used_ids)
+    return end_node_buffer, tree_buffer
+
+# This function returns the yml of a JsonModelElement up to its key_parser_dict. Only the start element of the parser model is
+# marked with start.
+def get_json_model_yml(model_id, name, start):
+    model_yml = "\n" + 4 * tab_string + "- id: " + model_id + "\n"
+    if start:
+        model_yml += 5 * tab_string + "start: True\n"
+    return (model_yml + 5 * tab_string + "type: JsonModelElement\n" + 5 * tab_string + "name: '" + name + "'\n" + 5 * tab_string +
+            "optional_key_prefix: '" + optional_key_prefix + "'\n" + 5 * tab_string + "nullable_key_prefix: '" + nullable_key_prefix +
+            "'\n" + 5 * tab_string + "key_parser_dict:")
+
+# This class is the programmatic interface of the parser generator. Log lines, decoded records, streams and input files are folded
+# into the parser dictionary one after another and the parser model can be generated at any time. The keyword arguments override
+# the configuration parameters of JSONPGConfig. Since the configuration is stored in module-level variables, it is applied
+# whenever a method of the generator is called, so that several generators with different configurations can be used.
+class ParserGenerator:
+    # This method initializes the generator with an empty parser dictionary.
+    def __init__(self, **config):
+        self.config = {name: getattr(JSONPGConfig, name) for name in config_parameter_names}
+        self.config.update(config)
+        configure(self.config)
+        self.parser_dict = None
+        self.file_offsets = {}
+        self.line_count = 0
+        # The number of the last log line that changed the parser model and whether the analysis was stopped early.
+        self.last_change_line = 0
+        self.converged = False
+        # The number of lists of dictionaries, of which not all elements were folded because of list_element_fold_num.
+        self.truncated_list_count = 0
+        self.statistics = JSONPGStatistics.RunStatistics(profile=self.config['profile_file'] is not None)
+        if self.config['fold_engine'] not in ('record', 'columnar'):
+            raise ValueError('Unknown fold_engine ' + str(self.config['fold_engine']) + '. Possible engines are: record, columnar')
+        if self.config['fold_engine'] == 'columnar' and self.config['convergence_lines'] is None:
+            # The early stop needs the changes of the parser model after every log line, which are only known after the columns
+            # were folded into the end nodes.
+            self.shape_cache = ColumnarShapeCache(self.config['shape_cache_size'], self.config['column_batch_size'])
+        else:
+            self.shape_cache = ShapeCache(self.config['shape_cache_size'])
+        # The yml of the parser model, which was last written by update_parser.
+        self.written_parser_yml = None
+        # The numbers of the end nodes of the last generated parser model and of the end nodes, which were shared across keys.
+        self.end_node_count = None
+        self.deduplicated_end_node_count = None
+        # The numbers of the read log lines and of the log lines, which could not be decoded, of every input file and whether the
+        # analysis was stopped, since too many log lines could not be decoded. The open quarantine file holds these log lines.
+        self.input_line_counts = {}
+        self.decode_failure_counts = {}
+        self.decode_failure_exceeded = False
+        self.quarantine = None
+
+    # This method sets the module-level configuration to the configuration of the generator.
+    def apply_config(self):
+        configure(self.config)
+
+    # This method folds decoded records, e.g., the results of json.loads, into the parser dictionary. The JSON literals None, True
+    # and False are replaced in place with the strings 'null', 'true' and 'false'. The records after the convergence of the parser
+    # model and records, which are no dictionaries, are skipped.
+    def add_records(self, records):
+        self.apply_config()
+        parser_dict = self.parser_dict
+        change_count = model_change_count
+        truncated_count = truncated_list_count
+        fold_time = 0.0
+        with self.statistics.phase('import'):
+            for record in records:
+                if type(record) is not dict:
+                    continue
+                start_time = time.perf_counter()
+                if discriminator_key is None:
+                    parser_dict = self.shape_cache.fill_parser_dict(JSONPGInput.replace_literals(record), parser_dict)
+                else:
+                    parser_dict = fill_parser_split(JSONPGInput.replace_literals(record), parser_dict, self.shape_cache)
+                fold_time += time.perf_counter() - start_time
+                self.line_count += 1
+                if progress_interval and self.line_count % progress_interval == 0:
+                    self.print_progress()
+                if model_change_count != change_count:
+                    change_count = model_change_count
+                    self.last_change_line = self.line_count
+                elif convergence_lines is not None and self.line_count - self.last_change_line >= convergence_lines:
+                    self.converged = True
+                    break
+            # Fold the values, which are still collected in the columns of the columnar engine.
+            start_time = time.perf_counter()
+            self.shape_cache.flush()
+            fold_time += time.perf_counter() - start_time
+            if model_change_count != change_count:
+                self.last_change_line = self.line_count
+            self.parser_dict = parser_dict
+            self.truncated_list_count += truncated_list_count - truncated_count
+            self.statistics.add_time('fold', fold_time)
+
+    # This method prints the number of analyzed log lines and the throughput since the last progress message.
+    def print_progress(self):
+        lines_per_second = self.statistics.add_progress(self.line_count)
+        if lines_per_second is None:
+            print(str(self.line_count) + ' lines have been imported!')
+        else:
+            print(str(self.line_count) + ' lines have been imported! (' + '%.0f' % lines_per_second + ' lines/s)')
+
+    # This method decodes the cleaned log lines, which are tuples of the form (source, offset, line), one by one and measures the time
+    # of the decoding. The log lines are counted for every source. The log lines, which can not be decoded or are no JSON objects,
+    # are skipped and passed to add_decode_failure. The decoding is stopped if too many log lines could not be decoded.
+    def decode_lines(self, lines, loads):
+        decode_time = 0.0
+        line_counts = self.input_line_counts
+        # The log lines are counted for the source of the previous log line and added to the counters when the source changes.
+        counted_source = None
+        line_count = 0
+        failed = False
+        try:
+            for source, offset, line in lines:
+                if source is not counted_source:
+                    if line_count:
+                        line_counts[counted_source] = line_counts.get(counted_source, 0) + line_count
+                    counted_source = source
+                    line_count = 0
+                line_count += 1
+                start_time = time.perf_counter()
+                try:
+                    record = loads(line)
+                    error = None if type(record) is dict else no_object_error
+                except (ValueError, RecursionError) as e:
+                    error = str(e)
+                decode_time += time.perf_counter() - start_time
+                if error is not None:
+                    line_counts[source] = line_counts.get(source, 0) + line_count
+                    line_count = 0
+                    failed = True
+                    if self.add_decode_failure(source, offset, line, error):
+                        return
+                    continue
+                yield record
+        finally:
+            if line_count:
+                line_counts[counted_source] = line_counts.get(counted_source, 0) + line_count
+            if failed:
+                self.check_decode_failure_rate()
+                self.close_quarantine()
+            self.statistics.add_time('decode', decode_time)
+
+    # This method counts the log line of the source, which could not be decoded, and appends it with its offset in the source and
+    # the error of the JSON parser to the quarantine file. It returns True if the analysis must be stopped, since too many log lines
+    # could not be decoded.
+    def add_decode_failure(self, source, offset, line, error):
+        self.decode_failure_counts[source] = self.decode_failure_counts.get(source, 0) + 1
+        if quarantine_file is not None:
+            if self.quarantine is None:
+                self.quarantine = open(quarantine_file, 'a')
+            self.quarantine.write(json.dumps({'file': source, 'offset': offset, 'error': error,
+                                              'line': line.decode(errors='replace')}) + '\n')
+        return self.check_decode_failure_rate()
+
+    # This method counts the log lines of a chunk of an input file, which was analyzed by a worker process, and adds the log lines,
+    # which could not be decoded, like add_decode_failure.
+    def add_chunk_failures(self, input_file, line_count, failures):
+        self.input_line_counts[input_file] = self.input_line_counts.get(input_file, 0) + line_count
+        try:
+            for offset, line, error in failures:
+                if self.add_decode_failure(input_file, offset, line, error):
+                    return True
+        finally:
+            self.close_quarantine()
+        return self.check_decode_failure_rate()
+
+    # This method returns True and stops the analysis if more than decode_failure_rate_max of the log lines could not be decoded
+    # after decode_failure_min_lines log lines have been read.
+    def check_decode_failure_rate(self):
+        if decode_failure_rate_max is not None and not self.decode_failure_exceeded:
+            line_count = sum(self.input_line_counts.values())
+            if line_count >= decode_failure_min_lines and sum(self.decode_failure_counts.values()) > decode_failure_rate_max * line_count:
+                self.decode_failure_exceeded = True
+        return self.decode_failure_exceeded
+
+    # This method closes the quarantine file, which is opened again by add_decode_failure for the next log line that can not be
+    # decoded.
+    def close_quarantine(self):
+        if self.quarantine is not None:
+            self.quarantine.close()
+            self.quarantine = None
+
+    # This method samples the cleaned log lines, which are tuples of the form (source, offset, line), according to sampling_mode,
+    # decodes them and folds them into the parser dictionary. No further log lines are analyzed after the analysis was stopped,
+    # since too many log lines could not be decoded.
+    def add_located_lines(self, lines):
+        self.apply_config()
+        if self.decode_failure_exceeded:
+            return
+        loads = JSONPGInput.get_json_loads(json_backend)
+        lines = JSONPGInput.sample_lines(lines, sampling_mode, sampling_stride, sampling_size, sampling_seed)
+        self.add_records(self.decode_lines(lines, loads))
+
+    # This method samples the cleaned log lines according to sampling_mode, decodes them and folds them into the parser dictionary.
+    def add_clean_lines(self, lines):
+        self.add_located_lines((None, None, line) for line in lines)
+
+    # This method folds a single decoded record into the parser dictionary.
+    def add_record(self, record):
+        self.add_records([record])
+
+    # This method decodes the JSON log lines, which are of type str or bytes, and folds them into the parser dictionary. The lines
+    # are cleaned the same way as the lines of the input files and empty lines are skipped.
+    def add_lines(self, lines):
+        self.add_located_lines(JSONPGInput.clean_located_block(None, None, (line.encode() if type(line) is str else line
+                                                                            for line in lines)))
+
+    # This method decodes a single JSON log line and folds it into the parser dictionary.
+    def add_line(self, line):
+        self.add_lines([line])
+
+    # This method reads the JSON log lines of a binary stream, e.g., sys.stdin.buffer, and folds them into the parser dictionary
+    # as soon as they are available. The source names the stream in the counters and in the quarantine file.
+    def add_stream(self, stream, source='-'):
+        self.add_located_lines(JSONPGInput.clean_located_block(source, 0, JSONPGInput.read_stream_lines(stream)))
+
+    # This method analyzes the parts of the input files, which have not been analyzed by the generator yet. If no input files are
+    # given, the configured input files are used. Only the analyzed log lines are marked as analyzed in file_offsets.
+    def add_files(self, input_files=None):
+        self.apply_config()
+        if input_files is None:
+            input_files = globals()['input_files']
+        input_ranges = get_input_ranges(input_files, self.file_offsets)
+
+        worker_num = parallel_processes
+        if worker_num is None:
+            # Use all processors if the number of parallel processes is not configured.
+            worker_num = os.cpu_count() or 1
+        if worker_num > 1 and convergence_lines is None and sampling_mode is None and list_element_fold_num == 1:
+            # Import the log data in parallel processes and merge the parser dictionaries of the chunks. The early stop and the
+            # sampling of the log lines need the log lines in their order, so they are only supported by the sequential import.
+            # The further elements of lists are only folded by the sequential import, since the merge only merges the first
+            # elements of the lists.
+            # The merged parser dictionary may hold other end nodes than the plans of the shape cache.
+            self.shape_cache.clear()
+            with self.statistics.phase('import'):
+                self.parser_dict, line_count = fill_parser_dict_parallel(input_ranges, worker_num, parallel_chunk_size,
+                                                                         self.parser_dict, self.add_chunk_failures)
+            self.line_count += line_count
+            self.statistics.line_count = self.line_count
+            stop_file = None
+        else:
+            # Import the log data and fold every log line into the parser dictionary as soon as it is read.
+            tracker = LineOffsetTracker(import_log_lines(input_ranges))
+            self.add_located_lines(tracker)
+            # The input file of the last analyzed log line if the analysis stopped before the end of the input files.
+            stop_file = None
+            if not tracker.complete and tracker.line_offsets:
+                stop_file = next(reversed(tracker.line_offsets))
+        if self.decode_failure_exceeded or sampling_mode is not None:
+            # The input files were not analyzed completely.
+            return
+
+        for input_file, start, end in input_ranges:
+            if input_file == stop_file:
+                if JSONPGInput.get_compression(input_file) is None:
+                    # Continue after the line break of the last analyzed log line. Compressed files are analyzed again as a whole.
+                    self.file_offsets[os.path.abspath(input_file)] = tracker.line_offsets[input_file] + 1
+                break
+            self.file_offsets[os.path.abspath(input_file)] = end
+
+    # This method continues the analysis of the snapshot file. If no file is given, the configured snapshot file is used.
+    def load_snapshot(self, snapshot_file=None):
+        self.apply_config()
+        if snapshot_file is None:
+            snapshot_file = globals()['snapshot_file']
+        with self.statistics.phase('load_snapshot'):
+            self.parser_dict, self.file_offsets = load_snapshot(snapshot_file)
+        self.shape_cache.clear()
+
+    # This method saves the analysis in the snapshot file. If no file is given, the configured snapshot file is used.
+    def save_snapshot(self, snapshot_file=None):
+        self.apply_config()
+        if snapshot_file is None:
+            snapshot_file = globals()['snapshot_file']
+        with self.statistics.phase('save_snapshot'):
+            save_snapshot(snapshot_file, self.parser_dict, self.file_offsets)
+
+    # This method generates the key prefixes and the yml of the parser model and returns the buffers of the parser model.
+    def get_parser_buffers(self):
+        self.apply_config()
+        with self.statistics.phase('key_prefixes'):
+            key_prefixes = generate_key_prefixes(self.parser_dict, key_prefix_list)
+        used_ids = EndNodeRegistry(share_end_nodes)
+        with self.statistics.phase('emission'):
+            buffers = get_parser_buffers(self.parser_dict, key_prefixes, used_ids)
+        self.end_node_count = used_ids.end_node_count
+        self.deduplicated_end_node_count = used_ids.deduplicated_count
+        return buffers
+
+    # This method returns the yml of the parser model as string.
+    def get_parser_yml(self):
+        end_node_buffer, tree_buffer = self.get_parser_buffers()
+        return end_node_buffer.getvalue() + tree_buffer.getvalue() + "\n"
+
+    # This method writes the yml of the parser model to the parser file or to a binary file object. If no file is given, the
+    # configured parser file is used.
+    def write_parser(self, parser_file=None):
+        self.apply_config()
+        if parser_file is None:
+            parser_file = globals()['parser_file']
+        end_node_buffer, tree_buffer = self.get_parser_buffers()
+        with self.statistics.phase('write'):
+            if isinstance(parser_file, str):
+                # Write the strings of the parser directly to the output file.
+                with open(parser_file, 'wb') as file:
+                    end_node_buffer.write(file)
+                    tree_buffer.write(file)
+                    file.write(b"\n")
+            else:
+                end_node_buffer.write(parser_file)
+                tree_buffer.write(parser_file)
+                parser_file.write(b"\n")
+
+    # This method atomically rewrites the parser file if the parser model changed and returns True if the file was written.
+    def update_parser(self, parser_file=None):
+        self.apply_config()
+        if parser_file is None:
+            parser_file = globals()['parser_file']
+        parser_yml = self.get_parser_yml()
+        if parser_yml == self.written_parser_yml:
+            return False
+        with self.statistics.phase('write'):
+            temp_file = parser_file + '.tmp'
+            with open(temp_file, 'wb') as file:
+                file.write(parser_yml.encode())
+            os.replace(temp_file, parser_file)
+        self.written_parser_yml = parser_yml
+        return True
 
-line_id = 0
-log_line_dict = {}
-parser_dict = None
-
-# import log data and preprocess the lines
-for input_file in input_files:
-    print('Import ' + str(input_file) + '!')
-    null = 'null'
-    true = 'true'
-    false = 'false'
-
-    with open(input_file) as f:
-        for line in f:
-            if (line_id + 1) % 100000 == 0:
-                print(str(line_id + 1) + ' lines have been imported!')
-
-            if len(line) < 2:
-                # Do not process empty log lines
-                continue
-
-            # Remove characters that should not o ccur in log data. According to RFC3164 only ascii code symbols 32-126
-            # should occur in log data.
-            line = ''.join([x for x in line if (31 < ord(x) < 127 or ord(x) == 9)])
-            line = line.strip(' \t\n\r')
-
-            log_line_dict[line_id] = eval(line)
-            line_id += 1
-
-    f.close()
-
-    print('Total amount of log lines read: ' + str(line_id))
-
-for line_id in log_line_dict:
-    parser_dict = fill_parser_dict(log_line_dict[line_id], parser_dict)
-
-key_prefixes = generate_key_prefixes(parser_dict, key_prefix_list)
-optional_key_prefix = key_prefixes[0]
-nullable_key_prefix = key_prefixes[1]
-
-end_node_string = "\nParser:"
-
-tree_string = "\n" + 4 * tab_string + "- id: json\n" + 5 * tab_string + "start: True\n" + 5 * tab_string + "type: JsonModelElement\n" +\
-        5 * tab_string + "name: 'model'\n" + 5 * tab_string + "optional_key_prefix: '" + optional_key_prefix + "'\n" + 5 * tab_string +\
-        "nullable_key_prefix: '" + nullable_key_prefix + "'\n" + 5 * tab_string + "key_parser_dict:"
-
-[end_node_string, tree_string] = get_parser_tree_yml(parser_dict, depth=6, end_node_string=end_node_string,
-        tree_string=tree_string)
-
-return_string = end_node_string + tree_string + "\n"
-
-with open(JSONPGConfig.parser_file, 'wb') as file:
-    file.write(return_string.encode())
+    # This method folds the new log lines of the followed sources into the parser dictionary and rewrites the parser file, until
+    # the stop event is set, duration seconds passed or it is interrupted with Ctrl+C.
+    def follow(self, sources=None, parser_file=None, stop_event=None, duration=None):
+        self.apply_config()
+        if sampling_mode is not None or convergence_lines is not None:
+            raise ValueError('The follow mode analyzes all log lines, so sampling_mode and convergence_lines must be None.')
+        if sources is None:
+            sources = globals()['input_files']
+        if parser_file is None:
+            parser_file = globals()['parser_file']
+        if stop_event is None:
+            stop_event = threading.Event()
+        interval = follow_interval
+        debounce = follow_debounce
+        loads = JSONPGInput.get_json_loads(json_backend)
+        # The queue is bounded, so that the threads stop reading if the log lines arrive faster than they are analyzed.
+        line_queue = queue.Queue(16)
+        JSONPGInput.follow_sources(sources, line_queue, stop_event, self.file_offsets, interval)
+
+        end_time = None if duration is None else time.monotonic() + duration
+        # The model change count of the last written parser model and the time at which the changed parser model is written.
+        written_change_count = None
+        write_time = None
+        try:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                if end_time is not None and now >= end_time:
+                    break
+                timeout = interval
+                if write_time is not None:
+                    timeout = min(timeout, max(0.0, write_time - now))
+                if end_time is not None:
+                    timeout = min(timeout, end_time - now)
+                try:
+                    source, offset, lines = line_queue.get(timeout=timeout)
+                except queue.Empty:
+                    pass
+                else:
+                    # The offset of the first line is derived from the offset after the lines.
+                    line_offset = None
+                    if offset is not None:
+                        line_offset = offset - sum(len(line) + 1 for line in lines)
+                    self.add_records(self.decode_lines(JSONPGInput.clean_located_block(source, line_offset, lines), loads))
+                    self.apply_config()
+                    if self.decode_failure_exceeded:
+                        break
+                    if offset is not None:
+                        self.file_offsets[os.path.abspath(source)] = offset
+
+                if model_change_count != written_change_count and write_time is None:
+                    write_time = time.monotonic() + debounce
+                if write_time is not None and time.monotonic() >= write_time:
+                    written_change_count = model_change_count
+                    write_time = None
+                    if self.update_parser(parser_file):
+                        print('The parser model has been updated after ' + str(self.line_count) + ' log lines!')
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop_event.set()
+        if not self.decode_failure_exceeded and self.update_parser(parser_file):
+            print('The parser model has been updated after ' + str(self.line_count) + ' log lines!')
+
+    # This method writes the run statistics together with the statistics of the parser model to the JSON file. If no file is given,
+    # the configured statistics file is used.
+    def write_statistics(self, statistics_file=None):
+        self.apply_config()
+        if statistics_file is None:
+            statistics_file = globals()['statistics_file']
+        self.statistics.line_count = self.line_count
+        self.statistics.model = get_model_statistics(self.parser_dict)
+        self.statistics.counters['shape_cache_hits'] = self.shape_cache.hits
+        self.statistics.counters['shape_cache_misses'] = self.shape_cache.misses
+        self.statistics.counters['shape_cache_shapes'] = len(self.shape_cache.plans)
+        self.statistics.counters['truncated_lists'] = self.truncated_list_count
+        if self.end_node_count is not None:
+            self.statistics.counters['end_nodes'] = self.end_node_count
+            self.statistics.counters['deduplicated_end_nodes'] = self.deduplicated_end_node_count
+        self.statistics.counters['input_lines'] = {str(source): count for source, count in self.input_line_counts.items()}
+        self.statistics.counters['decode_failures'] = {str(source): count for source, count in self.decode_failure_counts.items()}
+        self.statistics.write(statistics_file)
+
+# This function parses the overrides of the configuration parameters of the form name=value. The values are parsed as Python
+# literals and are used as strings if they are no valid literals.
+def parse_config_overrides(overrides):
+    config = {}
+    for override in overrides:
+        name, separator, value = override.partition('=')
+        if not separator:
+            raise ValueError('The configuration override ' + override + ' is not of the form name=value.')
+        try:
+            config[name.strip()] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            config[name.strip()] = value
+    return config
+
+# This function runs the parser generator from the command line. The input files and the parser file default to the configuration
+# in JSONPGConfig and - reads the log lines from the standard input or writes the parser model to the standard output.
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description='Generate a parser model for the logdata-anomaly-miner from JSON log '
+                                                          'lines. The defaults of the parameters are located in JSONPGConfig.py.')
+    argument_parser.add_argument('-i', '--input-files', nargs='+', metavar='FILE',
+                                 help='input log files, - reads the log lines from the standard input')
+    argument_parser.add_argument('-o', '--parser-file', metavar='FILE',
+                                 help='output parser file, - writes the parser model to the standard output')
+    argument_parser.add_argument('-f', '--follow', action='store_true',
+                                 help='follow the input files, named pipes, the standard input or Unix domain sockets (unix:PATH) '
+                                      'and rewrite the parser file whenever the parser model changes, until Ctrl+C is pressed')
+    argument_parser.add_argument('-s', '--set', action='append', default=[], metavar='NAME=VALUE', dest='overrides',
+                                 help='override a configuration parameter of JSONPGConfig, e.g., -s list_element_max_num=5')
+    args = argument_parser.parse_args(argv)
 
-print('Parser done')
+    try:
+        config = parse_config_overrides(args.overrides)
+        if args.input_files is not None:
+            config['input_files'] = args.input_files
+        if args.parser_file is not None:
+            config['parser_file'] = args.parser_file
+        generator = ParserGenerator(**config)
+    except ValueError as e:
+        argument_parser.error(str(e))
+    if args.follow and parser_file == '-':
+        argument_parser.error('The follow mode rewrites the parser file, so it can not write the parser model to the standard output.')
+    if args.follow:
+        try:
+            JSONPGInput.check_follow_sources(input_files)
+        except ValueError as e:
+            argument_parser.error(str(e))
+
+    # Print the messages to the standard error if the parser model is written to the standard output.
+    stdout = sys.stdout.buffer
+    with contextlib.redirect_stdout(sys.stderr if parser_file == '-' else sys.stdout):
+        if snapshot_file is not None and os.path.exists(snapshot_file):
+            # Continue the analysis of a previous run.
+            generator.load_snapshot()
+            print('Snapshot ' + snapshot_file + ' loaded!')
+
+        if args.follow:
+            print('Follow ' + ', '.join(input_files) + '! Press Ctrl+C to stop.')
+            # Stop the follow mode also on SIGTERM, e.g., if it runs as a service, so that the parser model and the snapshot are saved.
+            stop_event = threading.Event()
+            signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+            generator.follow(stop_event=stop_event)
+            print('Total amount of log lines read: ' + str(generator.line_count))
+        else:
+            for is_stdin, group in itertools.groupby(input_files, key=lambda input_file: input_file == '-'):
+                if is_stdin:
+                    print('Import standard input!')
+                    generator.add_stream(sys.stdin.buffer)
+                    print('Total amount of log lines read: ' + str(generator.line_count))
+                else:
+                    generator.add_files(list(group))
+
+        for source, failure_count in generator.decode_failure_counts.items():
+            print(str(failure_count) + ' of ' + str(generator.input_line_counts.get(source, 0)) + ' log lines of ' +
+                  ('the standard input' if source == '-' else str(source)) + ' could not be decoded!')
+        if generator.decode_failure_counts and quarantine_file is not None:
+            print('The log lines, which could not be decoded, have been appended to ' + quarantine_file + '!')
+        if generator.decode_failure_exceeded:
+            print('The analysis was stopped, since more than ' + str(decode_failure_rate_max) +
+                  ' of the log lines could not be decoded! The parser model has not been written.')
+            if statistics_file is not None:
+                generator.write_statistics()
+                print('Statistics written to ' + statistics_file + '!')
+            sys.exit(1)
+
+        if convergence_lines is not None or sampling_mode is not None:
+            print(str(generator.line_count) + ' log lines have been analyzed, the parser model last changed at line ' +
+                  str(generator.last_change_line) + '!')
+            if generator.converged:
+                print('The parser model converged, the analysis was stopped after ' + str(convergence_lines) +
+                      ' log lines without change!')
+
+        if discriminator_key is not None and generator.parser_dict is not None:
+            print('The log lines have been split into ' + str(len(generator.parser_dict)) + ' sub-models by the key ' +
+                  str(discriminator_key) + '!')
+
+        if generator.truncated_list_count > 0:
+            print('Only the first ' + str(list_element_fold_num) + ' elements of ' + str(generator.truncated_list_count) +
+                  ' lists of dictionaries have been analyzed! Increase list_element_fold_num to analyze more elements.')
+
+        if snapshot_file is not None:
+            generator.save_snapshot()
+            print('Snapshot ' + snapshot_file + ' saved!')
+
+        if parser_file == '-':
+            generator.write_parser(stdout)
+            stdout.flush()
+        elif not args.follow:
+            generator.write_parser()
+        if share_end_nodes and generator.end_node_count is not None:
+            print(str(generator.deduplicated_end_node_count) + ' end nodes have been shared across keys, the parser model holds ' +
+                  str(generator.end_node_count) + ' end nodes!')
+
+        if statistics_file is not None:
+            generator.write_statistics()
+            print('Statistics written to ' + statistics_file + '!')
+        if profile_file is not None:
+            generator.statistics.write_profile(profile_file)
+            print('Profile written to ' + profile_file + '!')
+
+        print('Parser done')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+"""This file holds the benchmark suite of the AECID-JSON-PG. Synthetic JSON log lines are generated from a random schema, which is
+determined by a seed, and the phases of the parser generator are measured separately on input files of several sizes: decoding
+of the log lines, folding of the log lines into the parser dictionary, generation of the key prefixes and emission of the
+parser model. The lines per second and the peak memory of every phase are written as JSON file, so that the results of
+different versions can be compared. If a discriminator_key is configured, the size and the nodes of the parser model, which is
+split into sub-models, are compared with the single parser model.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import AECIDjsonpg
+import JSONPGColumns
+import JSONPGInput
+
+# The default parameters of the synthetic log lines.
+default_log_parameters = {'depth': 2, 'key_num': 8, 'array_rate': 0.1, 'null_rate': 0.05, 'optional_rate': 0.2,
+                          'cardinality': 20, 'timestamp_num': 1, 'shape_num': None, 'event_type_num': None}
+
+# The default numbers of log lines of the benchmark.
+default_sizes = [1000, 10000, 100000]
+
+# The phases of the parser generator, which are measured separately.
+phases = ['decode', 'fold', 'key_prefixes', 'emission']
+
+# The kinds of the end nodes of the synthetic log lines.
+leaf_kinds = ['word', 'int', 'float', 'bool', 'wordlist']
+
+# Start time of the timestamps of the synthetic log lines.
+start_timestamp = datetime.datetime(2021, 10, 20)
+
+
+# This function generates a random schema for the synthetic log lines. The schema is a dictionary, which maps every key to a tuple
+# of the form (kind, argument, optional). The argument holds the words of the word kinds and the sub schema of the kinds
+# 'object' and 'array', where 'array' is a list of objects. Objects are nested at most depth levels. The keys of the top level are
+# named by the key_prefix.
+def generate_schema(rng, depth, key_num, array_rate, optional_rate, cardinality, timestamp_num, key_prefix='key'):
+    schema = {}
+    for index in range(timestamp_num):
+        schema['timestamp' + str(index)] = ('timestamp', None, False)
+    for index in range(key_num):
+        optional = rng.random() < optional_rate
+        if depth > 0 and rng.random() < 0.2:
+            kind = 'array' if rng.random() < array_rate / 0.2 else 'object'
+            sub_schema = generate_schema(rng, depth - 1, max(1, key_num // 2), array_rate, optional_rate, cardinality, 0)
+            schema[key_prefix + str(index)] = (kind, sub_schema, optional)
+        else:
+            kind = rng.choice(leaf_kinds)
+            words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(cardinality)]
+            schema[key_prefix + str(index)] = (kind, words, optional)
+    return schema
+
+
+# This function generates a record of the schema. Optional keys are left out in half of the records and every value is null with
+# the probability null_rate. These decisions and the lengths of the arrays are drawn from shape_rng, so that records, which are
+# generated with shape generators of the same state, have the same shape.
+def generate_record(rng, schema, null_rate, line_id, cardinality, shape_rng=None):
+    if shape_rng is None:
+        shape_rng = rng
+    record = {}
+    for key, (kind, argument, optional) in schema.items():
+        if optional and shape_rng.random() < 0.5:
+            continue
+        if kind != 'timestamp' and shape_rng.random() < null_rate:
+            record[key] = None
+        elif kind == 'timestamp':
+            timestamp = start_timestamp + datetime.timedelta(seconds=line_id, microseconds=rng.randrange(1000000))
+            record[key] = timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        elif kind == 'object':
+            record[key] = generate_record(rng, argument, null_rate, line_id, cardinality, shape_rng)
+        elif kind == 'array':
+            record[key] = [generate_record(rng, argument, null_rate, line_id, cardinality, shape_rng)
+                           for _ in range(shape_rng.randint(1, 3))]
+        elif kind == 'word':
+            record[key] = rng.choice(argument)
+        elif kind == 'int':
+            record[key] = rng.randrange(-cardinality // 4, cardinality)
+        elif kind == 'float':
+            record[key] = round(rng.uniform(0, cardinality), 3)
+        elif kind == 'bool':
+            record[key] = rng.random() < 0.5
+        else:
+            record[key] = rng.sample(argument, rng.randint(1, min(3, len(argument))))
+    return record
+
+
+# This function yields synthetic JSON log lines. The same seed and parameters always generate the same log lines. If shape_num is
+# set, the records have at most shape_num different shapes, i.e., different optional keys, null values and array lengths. The
+# shapes are skewed like in real log data: the i-th shape is chosen with a probability proportional to 1 / i. If event_type_num is
+# set, the records are of event_type_num event types, which are stated by the key 'type' and are skewed the same way. The event
+# types share the timestamps, but have their own schemas with differently named keys.
+def generate_log_lines(line_num, seed=0, depth=2, key_num=8, array_rate=0.1, null_rate=0.05, optional_rate=0.2, cardinality=20,
+                       timestamp_num=1, shape_num=None, event_type_num=None):
+    rng = random.Random(seed)
+    schema = generate_schema(rng, depth, key_num, array_rate, optional_rate, cardinality, timestamp_num)
+    if event_type_num is not None:
+        schemas = [schema] + [generate_schema(rng, depth, key_num, array_rate, optional_rate, cardinality, timestamp_num,
+                                              'event' + str(event_type) + '_key') for event_type in range(1, event_type_num)]
+        event_type_weights = [1 / (index + 1) for index in range(event_type_num)]
+    if shape_num is not None:
+        shape_weights = [1 / (index + 1) for index in range(shape_num)]
+    for line_id in range(line_num):
+        shape_rng = None
+        if shape_num is not None:
+            shape_rng = random.Random(seed * shape_num + rng.choices(range(shape_num), shape_weights)[0])
+        if event_type_num is None:
+            record = generate_record(rng, schema, null_rate, line_id, cardinality, shape_rng)
+        else:
+            event_type = rng.choices(range(event_type_num), event_type_weights)[0]
+            record = {'type': 'event' + str(event_type)}
+            record.update(generate_record(rng, schemas[event_type], null_rate, line_id, cardinality, shape_rng))
+        yield json.dumps(record, separators=(',', ':'))
+
+
+# This function writes synthetic JSON log lines to the log file.
+def write_log_file(log_file, line_num, seed=0, **log_parameters):
+    with open(log_file, 'w') as f:
+        for line in generate_log_lines(line_num, seed, **log_parameters):
+            f.write(line + '\n')
+
+
+# This function starts the measurement of a phase and returns the start time and the currently traced memory.
+def start_measurement(trace_memory):
+    if trace_memory:
+        tracemalloc.reset_peak()
+        return time.perf_counter(), tracemalloc.get_traced_memory()[0]
+    return time.perf_counter(), 0
+
+
+# This function stops the measurement of a phase and returns the duration and the peak of the memory that was allocated in
+# addition during the phase. The peak memory is None if the memory is not traced.
+def stop_measurement(measurement, trace_memory):
+    duration = time.perf_counter() - measurement[0]
+    if trace_memory:
+        return duration, tracemalloc.get_traced_memory()[1] - measurement[1]
+    return duration, None
+
+
+# This function runs the phases of the parser generator on the log file and returns the measurements of the phases, the number of
+# log lines and the size of the parser model in bytes. The log lines are decoded again before they are folded, so that the
+# decoded records do not count to the memory of the decoding.
+def run_phases(log_file, trace_memory=False):
+    measurements = {}
+    loads = JSONPGInput.get_json_loads(AECIDjsonpg.json_backend)
+
+    measurement = start_measurement(trace_memory)
+    line_count = 0
+    for _ in JSONPGInput.decode_lines(log_file, loads):
+        line_count += 1
+    measurements['decode'] = stop_measurement(measurement, trace_memory)
+
+    records = list(JSONPGInput.decode_lines(log_file, loads))
+    shape_cache = AECIDjsonpg.ShapeCache(AECIDjsonpg.shape_cache_size)
+    measurement = start_measurement(trace_memory)
+    parser_dict = None
+    for record in records:
+        parser_dict = shape_cache.fill_parser_dict(record, parser_dict)
+    measurements['fold'] = stop_measurement(measurement, trace_memory)
+    del records
+
+    measurement = start_measurement(trace_memory)
+    key_prefixes = AECIDjsonpg.generate_key_prefixes(parser_dict, AECIDjsonpg.key_prefix_list)
+    measurements['key_prefixes'] = stop_measurement(measurement, trace_memory)
+
+    measurement = start_measurement(trace_memory)
+    end_node_buffer, tree_buffer = AECIDjsonpg.get_parser_buffers(parser_dict, key_prefixes)
+    model = end_node_buffer.getvalue() + tree_buffer.getvalue() + '\n'
+    measurements['emission'] = stop_measurement(measurement, trace_memory)
+
+    return measurements, line_count, len(model.encode())
+
+
+# This function generates the single parser model and the parser model, which is split into sub-models by the discriminator_key,
+# from the log file and returns the size in bytes, the numbers of nodes and the duration of the folding of both models. The mean
+# number of nodes per log line states how many nodes the parser has to check for a log line.
+def compare_split(log_file):
+    loads = JSONPGInput.get_json_loads(AECIDjsonpg.json_backend)
+    records = list(JSONPGInput.decode_lines(log_file, loads))
+    comparison = {}
+    for name in ['single', 'split']:
+        shape_cache = AECIDjsonpg.ShapeCache(AECIDjsonpg.shape_cache_size)
+        start_time = time.perf_counter()
+        parser_dict = None
+        for record in records:
+            if name == 'single':
+                parser_dict = shape_cache.fill_parser_dict(record, parser_dict)
+            else:
+                parser_dict = AECIDjsonpg.fill_parser_split(record, parser_dict, shape_cache)
+        duration = time.perf_counter() - start_time
+        end_node_buffer, tree_buffer = AECIDjsonpg.get_parser_buffers(parser_dict)
+        statistics = AECIDjsonpg.get_model_statistics(parser_dict)
+        comparison[name] = {'model_bytes': len((end_node_buffer.getvalue() + tree_buffer.getvalue() + '\n').encode()),
+                            'nodes': statistics['nodes'], 'optional_nodes': statistics['optional_nodes'],
+                            'mean_nodes_per_line': statistics.get('mean_nodes_per_line', statistics['nodes']),
+                            'sub_models': len(parser_dict) if name == 'split' else 1, 'fold_seconds': duration}
+        print(str(len(records)) + ' lines, ' + name + ' model: ' + str(comparison[name]['sub_models']) + ' sub-models, ' +
+              str(comparison[name]['model_bytes']) + ' bytes, ' + str(statistics['nodes']) + ' nodes, ' +
+              '%.1f' % comparison[name]['mean_nodes_per_line'] + ' nodes per line, ' + '%.3f' % duration + ' s folding')
+    return comparison
+
+
+# This function folds the log file with the record engine and with the columnar engine with every installed backend and returns the
+# duration of the folding and the throughput of the engines. The parser models of the engines must be the same.
+def compare_engines(log_file):
+    loads = JSONPGInput.get_json_loads(AECIDjsonpg.json_backend)
+    comparison = {}
+    record_model = None
+    engines = ['record'] + ['columnar_' + backend for backend in JSONPGColumns.column_backends
+                            if backend != 'numpy' or JSONPGColumns.numpy is not None]
+    backend = JSONPGColumns.column_backend
+    try:
+        for name in engines:
+            if name == 'record':
+                shape_cache = AECIDjsonpg.ShapeCache(AECIDjsonpg.shape_cache_size)
+            else:
+                JSONPGColumns.set_column_backend(name[len('columnar_'):])
+                shape_cache = AECIDjsonpg.ColumnarShapeCache(AECIDjsonpg.shape_cache_size, AECIDjsonpg.column_batch_size)
+            # The records are decoded again, since the folding replaces the JSON literals in place.
+            records = list(JSONPGInput.decode_lines(log_file, loads))
+            start_time = time.perf_counter()
+            parser_dict = None
+            for record in records:
+                parser_dict = shape_cache.fill_parser_dict(record, parser_dict)
+            shape_cache.flush()
+            duration = time.perf_counter() - start_time
+            end_node_buffer, tree_buffer = AECIDjsonpg.get_parser_buffers(parser_dict)
+            model = end_node_buffer.getvalue() + tree_buffer.getvalue() + '\n'
+            if record_model is None:
+                record_model = model
+            elif model != record_model:
+                raise ValueError('The parser model of the ' + name + ' engine differs from the parser model of the record engine.')
+            comparison[name] = {'fold_seconds': duration, 'lines_per_second': len(records) / duration if duration > 0 else None}
+            print(str(len(records)) + ' lines, ' + name + ' engine: ' + '%.3f' % duration + ' s folding, ' +
+                  '%.0f' % (len(records) / duration if duration > 0 else float('inf')) + ' lines/s')
+    finally:
+        JSONPGColumns.set_column_backend(backend)
+    return comparison
+
+
+# This function runs the benchmark on synthetic log files with the numbers of log lines in sizes and returns the results. Every
+# size is measured twice, once for the durations and once with tracemalloc for the peak memory, since tracing the memory slows
+# down the phases.
+def run_benchmark(sizes=None, seed=0, **log_parameters):
+    if sizes is None:
+        sizes = default_sizes
+    parameters = dict(default_log_parameters)
+    parameters.update(log_parameters)
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            log_file = os.path.join(temp_dir, 'benchmark_' + str(size) + '.txt')
+            write_log_file(log_file, size, seed, **parameters)
+            measurements, line_count, model_size = run_phases(log_file)
+            tracemalloc.start()
+            memory_measurements = run_phases(log_file, trace_memory=True)[0]
+            tracemalloc.stop()
+
+            result = {'lines': line_count, 'input_bytes': os.path.getsize(log_file), 'model_bytes': model_size, 'phases': {}}
+            for phase in phases:
+                duration = measurements[phase][0]
+                result['phases'][phase] = {'seconds': duration,
+                                           'lines_per_second': line_count / duration if duration > 0 else None,
+                                           'peak_memory_bytes': memory_measurements[phase][1]}
+                print(str(size) + ' lines, ' + phase + ': ' + '%.3f' % duration + ' s, ' +
+                      '%.0f' % (line_count / duration if duration > 0 else float('inf')) + ' lines/s, ' +
+                      str(memory_measurements[phase][1]) + ' bytes peak memory')
+            if AECIDjsonpg.discriminator_key is not None:
+                result['split'] = compare_split(log_file)
+            if AECIDjsonpg.fold_engine == 'columnar':
+                result['engines'] = compare_engines(log_file)
+            results.append(result)
+    return {'version': AECIDjsonpg.__version__, 'python': platform.python_version(),
+            'json_backend': JSONPGInput.get_json_loads(AECIDjsonpg.json_backend).__module__, 'seed': seed,
+            'log_parameters': parameters, 'results': results}
+
+
+if __name__ == '__main__':
+    argument_parser = argparse.ArgumentParser(description='Benchmark the phases of the AECID-JSON-PG on synthetic JSON log lines.')
+    argument_parser.add_argument('-n', '--sizes', nargs='+', type=int, default=default_sizes, metavar='LINES',
+                                 help='numbers of log lines of the benchmark')
+    argument_parser.add_argument('-o', '--output-file', default='-', metavar='FILE',
+                                 help='output file of the results in JSON format, by default - writes the results to the standard '
+                                      'output')
+    argument_parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic log lines')
+    argument_parser.add_argument('--depth', type=int, default=default_log_parameters['depth'],
+                                 help='maximal nesting depth of the objects')
+    argument_parser.add_argument('--key-num', type=int, default=default_log_parameters['key_num'],
+                                 help='number of keys of the top-level object')
+    argument_parser.add_argument('--array-rate', type=float, default=default_log_parameters['array_rate'],
+                                 help='probability that a key holds an array of objects')
+    argument_parser.add_argument('--null-rate', type=float, default=default_log_parameters['null_rate'],
+                                 help='probability that a value is null')
+    argument_parser.add_argument('--optional-rate', type=float, default=default_log_parameters['optional_rate'],
+                                 help='probability that a key is optional')
+    argument_parser.add_argument('--cardinality', type=int, default=default_log_parameters['cardinality'],
+                                 help='number of distinct values of the end nodes')
+    argument_parser.add_argument('--timestamp-num', type=int, default=default_log_parameters['timestamp_num'],
+                                 help='number of timestamp fields')
+    argument_parser.add_argument('--shape-num', type=int, default=default_log_parameters['shape_num'],
+                                 help='number of skewed record shapes, by default every record has a random shape')
+    argument_parser.add_argument('--event-type-num', type=int, default=default_log_parameters['event_type_num'],
+                                 help='number of skewed event types with their own schemas, which are stated by the key type')
+    argument_parser.add_argument('-s', '--set', action='append', default=[], metavar='NAME=VALUE', dest='overrides',
+                                 help='override a configuration parameter of JSONPGConfig, e.g., -s shape_cache_size=0, or '
+                                      '-s discriminator_key=type to compare the split parser model with the single model, or '
+                                      '-s fold_engine=columnar to compare the fold engines')
+    args = argument_parser.parse_args()
+    if args.cardinality < 1:
+        argument_parser.error('The cardinality must be at least 1.')
+    AECIDjsonpg.configure(AECIDjsonpg.parse_config_overrides(args.overrides))
+
+    # Print the messages to the standard error if the results are written to the standard output.
+    with contextlib.redirect_stdout(sys.stderr if args.output_file == '-' else sys.stdout):
+        benchmark = run_benchmark(args.sizes, args.seed, depth=args.depth, key_num=args.key_num, array_rate=args.array_rate,
+                                  null_rate=args.null_rate, optional_rate=args.optional_rate, cardinality=args.cardinality,
+                                  timestamp_num=args.timestamp_num, shape_num=args.shape_num, event_type_num=args.event_type_num)
+    if args.output_file == '-':
+        json.dump(benchmark, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output_file, 'w') as f:
+            json.dump(benchmark, f, indent=2)
+        print('Results written to ' + args.output_file)
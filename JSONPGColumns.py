@@ -0,0 +1,86 @@
+"""This file holds the checks of the columnar engine of the AECID-JSON-PG. The columnar engine collects the values of the end nodes of
+a batch of log lines in columns and classifies the distinct values of every column in one batch instead of every value on its own.
+The checks determine the types, the signs, the date formats and the characters of the values of a column with the built-in
+functions of Python, which process a whole batch per call. Only the signs of the numbers are checked with NumPy if it is
+installed and with arrays of the standard library otherwise.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import array
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional, the numbers are checked with arrays of the standard library without it.
+    numpy = None
+
+# The backends of the sign check of the numbers of the columns. Only the backends that are installed can be used.
+column_backends = ['numpy', 'python']
+
+# The backend, which is used by the sign check.
+column_backend = 'numpy' if numpy is not None else 'python'
+
+
+# This function sets the backend of the sign check. If backend is 'auto' NumPy is used if it is installed.
+def set_column_backend(backend='auto'):
+    global column_backend
+    if backend == 'auto':
+        backend = 'numpy' if numpy is not None else 'python'
+    if backend not in column_backends:
+        raise ValueError('Unknown column backend ' + str(backend) + '. Possible backends are: auto, ' + ', '.join(column_backends))
+    if backend == 'numpy' and numpy is None:
+        raise ImportError('The column backend numpy requires NumPy.')
+    column_backend = backend
+
+
+# This function returns the set of the types of the values.
+def get_value_types(values):
+    return set(map(type, values))
+
+
+# This function returns True if any of the numbers, which are integers or floats, is negative. The numbers are converted into an
+# array of floats, which keeps their signs. Integers, which are too large for floats, are compared one by one.
+def has_negative(numbers):
+    try:
+        if column_backend == 'numpy':
+            return bool((numpy.fromiter(numbers, dtype=numpy.float64, count=len(numbers)) < 0).any())
+        return any(map((0.0).__gt__, array.array('d', numbers)))
+    except OverflowError:
+        return any(number < 0 for number in numbers)
+
+
+# This function returns True if all strings are fully matched by fullmatch or, if it is given, by other_fullmatch. The strings that
+# are not matched by the first function, which usually matches most strings fast, are checked with the second one.
+def match_all(strings, fullmatch, other_fullmatch=None):
+    unmatched = list(itertools.filterfalse(fullmatch, strings))
+    if other_fullmatch is None or not unmatched:
+        return not unmatched
+    return all(map(other_fullmatch, unmatched))
+
+
+# This function returns the set of the characters of the strings.
+def get_chars(strings):
+    return set(''.join(strings))
+
+
+# This function returns True if any of the strings contains any of the characters.
+def contains_any(strings, chars):
+    joined_strings = ''.join(strings)
+    return any(char in joined_strings for char in chars)
+
+
+# This function returns True if any of the strings contains the sequence of characters. The strings are searched at once, if the
+# sequence does not contain the line break, which separates the strings.
+def contains_sequence(strings, sequence):
+    if '\n' in sequence:
+        return any(sequence in string for string in strings)
+    return sequence in '\n'.join(strings)
@@ -19,3 +19,28 @@ optional_dict_chars = [' ', ',', '.', ';', ':', '=', '*', '~', "'", '`', '\\\\',
                        '§', '+', '<', '{', '[', '(', ')', ']', '}', '>']
 problematic_chars = ['@']
 list_element_max_num = 3
+json_backend = 'auto' # JSON parser for the log lines: 'auto', 'orjson', 'ujson' or 'json'
+parallel_processes = 1 # Number of processes that analyze the input files in parallel. None uses all processors
+parallel_chunk_size = 64 * 1024 * 1024 # Size of the chunks in bytes, into which the input files are split for the parallel analysis
+snapshot_file = None # Path to the snapshot of the analysis. If set, a previous analysis is continued with the new log lines
+convergence_lines = None # Number of log lines without a change of the parser model, after which the analysis is stopped
+sampling_mode = None # Sampling of the log lines: None, 'stride' or 'reservoir'
+sampling_stride = 10 # Distance of the analyzed log lines in the sampling mode 'stride'
+sampling_size = 100000 # Number of the analyzed log lines in the sampling mode 'reservoir'
+sampling_seed = 0 # Seed of the random sample in the sampling mode 'reservoir'
+progress_interval = 100000 # Number of log lines between the progress messages with the throughput. None disables the messages
+statistics_file = None # Path to the JSON file of the run statistics with the times of the phases and the properties of the parser model
+profile_file = None # Path to the cProfile statistics of the phases. None disables the profiling
+shape_cache_size = 1000 # Maximum number of record shapes, whose plans are cached to fold repeated shapes directly into the end nodes. 0 disables the cache
+list_element_fold_num = 1 # Number of the analyzed elements of every list of dictionaries, None analyzes all elements
+discriminator_key = None # Key, by whose values the log lines are split into sub-models, e.g., 'type', or None for a single model
+discriminator_value_max_num = 100 # Maximum number of the values of the discriminator key with their own sub-model
+validation_failure_num = 10 # Number of the first failing log lines, which are reported by the validator JSONPGValidator.py
+follow_interval = 1.0 # Seconds between the checks of the followed input files for new log lines in the follow mode
+follow_debounce = 2.0 # Seconds between a change of the parser model and the rewrite of the parser file in the follow mode
+quarantine_file = None # Path to the file, to which the log lines that can not be decoded are appended, or None
+decode_failure_rate_max = None # Maximum share of the log lines that can not be decoded before the analysis is stopped, e.g., 0.01, or None
+decode_failure_min_lines = 1000 # Number of log lines, which are read before the share of the log lines that can not be decoded is checked
+fold_engine = 'record' # Engine that folds the values of log lines of known shapes into the end nodes: 'record' or 'columnar'
+column_batch_size = 10000 # Number of log lines, whose values are collected in columns by the columnar engine before they are folded into the end nodes
+share_end_nodes = False # If True, identical fixed, wordlist and variable end nodes are shared across keys
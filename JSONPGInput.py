@@ -0,0 +1,509 @@
+"""This file holds the functions that read the log files and decode the JSON log lines for the AECID-JSON-PG.
+The lines are read in large blocks of bytes from memory-mapped files or from the stream of a decompressor, cleaned from
+characters that should not occur in log data and decoded with a JSON parser. The JSON literals null, true and false are mapped to the strings 'null', 'true' and 'false', which are used
+by the parser generator. Executing this file measures the throughput of all input readers and of all available JSON
+backends on the given files.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import bz2
+import contextlib
+import functools
+import gzip
+import itertools
+import json
+import lzma
+import mmap
+import os
+import random
+import re
+import socket
+import stat
+import sys
+import threading
+import time
+
+# The JSON backends in the order of their preference. Only the backends that are installed can be used.
+json_backends = ['orjson', 'ujson', 'json']
+
+# Size of the blocks that are read from the input files.
+read_block_size = 1 << 22
+
+# The compressions of the input files with their file extensions, magic bytes and the functions that open the files as binary
+# streams. Compressed files are decompressed while they are read.
+compressions = {
+    'gzip': {'extensions': ['.gz'], 'magic': b'\x1f\x8b', 'open': gzip.open},
+    'bz2': {'extensions': ['.bz2'], 'magic': b'BZh', 'open': bz2.open},
+    'xz': {'extensions': ['.xz'], 'magic': b'\xfd7zXZ\x00', 'open': lzma.open},
+}
+
+# Remove characters that should not occur in log data. According to RFC3164 only ascii code symbols 32-126 should occur in log
+# data. The tabulator is also allowed.
+deleted_bytes = bytes(i for i in range(256) if not (31 < i < 127 or i == 9))
+
+# Integers with 19 or more digits may exceed 64 bits, which orjson converts into floats and ujson rejects.
+long_number_pattern = re.compile(rb'[0-9]{19}')
+
+
+# This function returns the loads function of the JSON backend. If backend is 'auto' the fastest installed backend is used.
+def get_json_loads(backend='auto'):
+    if backend == 'auto':
+        for name in json_backends:
+            try:
+                return get_json_loads(name)
+            except ImportError:
+                continue
+    if backend == 'orjson':
+        import orjson
+        return get_exact_loads(orjson.loads)
+    if backend == 'ujson':
+        import ujson
+        return get_exact_loads(ujson.loads)
+    if backend == 'json':
+        return json.loads
+    raise ValueError('Unknown JSON backend ' + str(backend) + '. Possible backends are: auto, ' + ', '.join(json_backends))
+
+
+# This function returns a loads function, which decodes the lines with the loads function of a fast JSON backend and the lines,
+# which may hold integers that exceed 64 bits, with the json module, which keeps integers of arbitrary precision like eval.
+def get_exact_loads(fast_loads):
+    search_long_number = long_number_pattern.search
+
+    @functools.wraps(fast_loads)
+    def loads(line):
+        if search_long_number(line):
+            return json.loads(line)
+        return fast_loads(line)
+    return loads
+
+
+# This function returns the names of all JSON backends that are installed.
+def get_available_backends():
+    available_backends = []
+    for name in json_backends:
+        try:
+            get_json_loads(name)
+        except ImportError:
+            continue
+        available_backends.append(name)
+    return available_backends
+
+
+# This function replaces the JSON literals null, true and false in the decoded object with the strings that are used by the
+# parser generator. Dictionaries and lists are changed in place. The nested dictionaries and lists are processed from a stack.
+def replace_literals(obj):
+    if obj is None:
+        return 'null'
+    elif obj is True:
+        return 'true'
+    elif obj is False:
+        return 'false'
+    elif type(obj) is not dict and type(obj) is not list:
+        return obj
+
+    stack = [obj]
+    while stack:
+        container = stack.pop()
+        if type(container) is dict:
+            items = container.items()
+        else:
+            items = enumerate(container)
+        for key, value in items:
+            value_type = type(value)
+            if value_type is dict or value_type is list:
+                stack.append(value)
+            elif value is None:
+                container[key] = 'null'
+            elif value_type is bool:
+                container[key] = 'true' if value else 'false'
+    return obj
+
+
+# This function returns the name of the compression of the input file or None if the file is not compressed. The compression is
+# selected by the file extension or, if the extension is unknown, by the magic bytes at the beginning of the file.
+def get_compression(input_file):
+    extension = os.path.splitext(input_file)[1].lower()
+    for name, compression in compressions.items():
+        if extension in compression['extensions']:
+            return name
+    if not os.path.isfile(input_file):
+        return None
+    with open(input_file, 'rb') as f:
+        header = f.read(max(len(compression['magic']) for compression in compressions.values()))
+    for name, compression in compressions.items():
+        if header.startswith(compression['magic']):
+            return name
+    return None
+
+
+# This function reads the input file and yields the lines without the line breaks. Compressed files are decompressed while they
+# are read, regular files are memory-mapped and other files, like named pipes, are read in blocks. If a byte range is given,
+# only the lines that start within the range are yielded, so that a file can be split into chunks at arbitrary offsets. The
+# offsets of compressed files refer to the compressed file, which can only be read as a whole. Therefore, a compressed file is
+# read completely unless the range is empty.
+def read_lines(input_file, block_size=read_block_size, start=0, end=None):
+    compression = get_compression(input_file)
+    if compression is not None:
+        if end is None or start < end:
+            with compressions[compression]['open'](input_file, 'rb') as f:
+                yield from read_stream_lines(f, block_size)
+    elif stat.S_ISREG(os.stat(input_file).st_mode):
+        yield from read_mapped_lines(input_file, block_size, start, end)
+    else:
+        yield from read_buffered_lines(input_file, block_size, start, end)
+
+
+# This function maps the file into the memory and yields the lines without the line breaks. The file is split into blocks at line
+# breaks, so that every line is copied only once from the mapped memory and no rest of a block has to be joined with the next one.
+def read_mapped_lines(input_file, block_size=read_block_size, start=0, end=None):
+    with open(input_file, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if end is None or end > file_size:
+            end = file_size
+        if start >= end:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if start > 0 and mm[start - 1] != 10:
+                # Skip the rest of the line that started in the previous chunk.
+                start = mm.find(b'\n', start) + 1
+                if start == 0 or start >= end:
+                    return
+            # The last line that starts within the range ends at the first line break at or after the end of the range.
+            stop = mm.find(b'\n', end - 1)
+            if stop == -1:
+                stop = file_size
+            position = start
+            while position < stop:
+                block_end = position + block_size
+                if block_end < stop:
+                    block_end = mm.find(b'\n', block_end)
+                    if block_end == -1:
+                        block_end = stop
+                else:
+                    block_end = stop
+                yield from mm[position:block_end].split(b'\n')
+                position = block_end + 1
+
+
+# This function reads the file in large blocks of bytes and yields the lines without the line breaks. The byte range is handled
+# the same way as by read_lines.
+def read_buffered_lines(input_file, block_size=read_block_size, start=0, end=None):
+    with open(input_file, 'rb') as f:
+        position = start
+        if start > 0:
+            # Skip the rest of the line that started in the previous chunk.
+            f.seek(start - 1)
+            if f.read(1) != b'\n':
+                position += len(f.readline())
+        rest = b''
+        while end is None or position < end:
+            block = f.read(block_size)
+            if not block:
+                break
+            lines = (rest + block).split(b'\n')
+            rest = lines.pop()
+            for line in lines:
+                if end is not None and position >= end:
+                    return
+                position += len(line) + 1
+                yield line
+        if rest and (end is None or position < end):
+            yield rest
+
+
+# This function reads a binary stream, e.g., the standard input, in blocks of bytes and yields the lines without the line breaks.
+# The lines are yielded as soon as they are available in the stream, so that log lines can be analyzed while they are piped in.
+def read_stream_lines(stream, block_size=read_block_size):
+    for lines in read_stream_blocks(stream, block_size):
+        yield from lines
+
+
+# This function reads a binary stream in blocks of bytes and yields the lists of the complete lines of the blocks without the line
+# breaks. The rest of the last line is yielded at the end of the stream.
+def read_stream_blocks(stream, block_size=read_block_size):
+    read = getattr(stream, 'read1', stream.read)
+    rest = b''
+    while True:
+        block = read(block_size)
+        if not block:
+            break
+        lines = (rest + block).split(b'\n')
+        rest = lines.pop()
+        if lines:
+            yield lines
+    if rest:
+        yield [rest]
+
+
+# This function follows a growing input file like tail -f and puts the new complete lines into the line queue as tuples of the
+# form (input_file, offset, lines), where offset is the byte offset after the lines.
+def follow_file(input_file, line_queue, stop_event, offset=0, interval=1.0, block_size=read_block_size):
+    f = None
+    rest = b''
+    try:
+        while not stop_event.is_set():
+            try:
+                file_stat = os.stat(input_file)
+            except FileNotFoundError:
+                file_stat = None
+            if f is not None and (file_stat is None or file_stat.st_ino != os.fstat(f.fileno()).st_ino or
+                                  file_stat.st_size < f.tell()):
+                # The file was replaced or truncated, so the new file is read from the beginning.
+                f.close()
+                f = None
+                offset = 0
+                rest = b''
+            if f is None and file_stat is not None:
+                f = open(input_file, 'rb')
+                if offset > file_stat.st_size:
+                    offset = 0
+                f.seek(offset)
+            if f is not None:
+                block = f.read(block_size)
+                if block:
+                    lines = (rest + block).split(b'\n')
+                    rest = lines.pop()
+                    if lines:
+                        line_queue.put((input_file, f.tell() - len(rest), lines))
+                    # Read the next block without waiting, since the file may hold further lines.
+                    continue
+            stop_event.wait(interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+# This function reads the lines of a binary stream and puts them into the line queue as tuples of the form (name, None, lines) as
+# soon as they are available, until the stream ends.
+def follow_stream(stream, name, line_queue, block_size=read_block_size):
+    for lines in read_stream_blocks(stream, block_size):
+        line_queue.put((name, None, lines))
+
+
+# This function follows a named pipe. The pipe is opened again whenever the writing process closes it, until the stop event is set.
+def follow_pipe(input_file, line_queue, stop_event, block_size=read_block_size):
+    while not stop_event.is_set():
+        with open(input_file, 'rb') as f:
+            follow_stream(f, input_file, line_queue, block_size)
+
+
+# This function listens on a Unix domain socket and puts the lines of every connection into the line queue, until the stop event
+# is set. Every connection is read by its own thread.
+def follow_socket(socket_file, line_queue, stop_event, interval=1.0, block_size=read_block_size):
+    if os.path.exists(socket_file) and stat.S_ISSOCK(os.stat(socket_file).st_mode):
+        # Remove the socket of a previous run.
+        os.remove(socket_file)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_file)
+        server.listen()
+        server.settimeout(interval)
+        while not stop_event.is_set():
+            try:
+                connection = server.accept()[0]
+            except socket.timeout:
+                continue
+            connection.settimeout(None)
+            threading.Thread(target=follow_stream, args=(connection.makefile('rb'), socket_file, line_queue, block_size),
+                             daemon=True).start()
+    finally:
+        server.close()
+        # The socket file does not exist if it could not be bound or was removed by another process.
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_file)
+
+
+# This function raises a ValueError if a source can not be followed. Compressed input files are not appended to, so they can not be
+# followed.
+def check_follow_sources(sources):
+    for source in sources:
+        if source == '-' or source.startswith('unix:') or (os.path.exists(source) and stat.S_ISFIFO(os.stat(source).st_mode)):
+            continue
+        if get_compression(source) is not None:
+            raise ValueError('The compressed input file ' + source + ' can not be followed, since it is not appended to.')
+
+
+# This function starts a thread for every source, which puts the new lines of the source into the line queue, and returns the
+# threads. The sources are checked by check_follow_sources before any thread is started.
+def follow_sources(sources, line_queue, stop_event, file_offsets=None, interval=1.0):
+    if file_offsets is None:
+        file_offsets = {}
+    check_follow_sources(sources)
+    threads = []
+    for source in sources:
+        if source == '-':
+            target, args = follow_stream, (sys.stdin.buffer, source, line_queue)
+        elif source.startswith('unix:'):
+            target, args = follow_socket, (source[len('unix:'):], line_queue, stop_event, interval)
+        elif os.path.exists(source) and stat.S_ISFIFO(os.stat(source).st_mode):
+            target, args = follow_pipe, (source, line_queue, stop_event)
+        else:
+            target, args = follow_file, (source, line_queue, stop_event, file_offsets.get(os.path.abspath(source), 0), interval)
+        # The threads, which block while reading streams, must not keep the program alive.
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+# This function splits the byte ranges of the input files, which are tuples of the form (input_file, start, end), into chunks of
+# at most chunk_size bytes and returns them as tuples of the same form. Compressed files can not be split.
+def split_input_ranges(input_ranges, chunk_size):
+    chunks = []
+    for input_file, start, file_end in input_ranges:
+        if get_compression(input_file) is not None:
+            chunks.append((input_file, start, file_end))
+            continue
+        while True:
+            end = min(start + chunk_size, file_end)
+            chunks.append((input_file, start, end))
+            if end >= file_end:
+                break
+            start = end
+    return chunks
+
+
+# This function removes the characters that should not occur in log data from the line and strips it. The line is of type bytes.
+def clean_line(line):
+    return line.translate(None, deleted_bytes).strip(b' \t\n\r')
+
+
+# This function yields the cleaned lines of the input file or of the byte range of the input file. Empty lines are skipped.
+def clean_lines(input_file, start=0, end=None):
+    for line in read_lines(input_file, start=start, end=end):
+        line = clean_line(line)
+        if line:
+            yield line
+
+
+# This function returns the byte offset of the first line, which starts in the byte range of the input file from start, the same
+# way as read_lines. The offsets of compressed files refer to the decompressed data, which is always read from the beginning.
+def get_first_line_offset(input_file, start=0):
+    if start == 0 or get_compression(input_file) is not None:
+        return 0
+    with open(input_file, 'rb') as f:
+        f.seek(start - 1)
+        if f.read(1) == b'\n':
+            return start
+        # Skip the rest of the line that started in the previous chunk.
+        return start + len(f.readline())
+
+
+# This function yields the cleaned lines of the source as tuples of the form (source, offset, line), where offset is the byte
+# offset of the line in the source. The lines are read from the offset of the first line or their offsets are None if the offset is
+# None. Empty lines are skipped.
+def clean_located_block(source, offset, lines):
+    if offset is None:
+        for line in lines:
+            line = clean_line(line)
+            if line:
+                yield source, None, line
+        return
+    for line in lines:
+        cleaned_line = clean_line(line)
+        if cleaned_line:
+            yield source, offset, cleaned_line
+        offset += len(line) + 1
+
+
+# This function yields the cleaned lines of the input file or of the byte range of the input file as tuples of the form
+# (input_file, offset, line) like clean_located_block.
+def clean_located_lines(input_file, start=0, end=None):
+    return clean_located_block(input_file, get_first_line_offset(input_file, start),
+                               read_lines(input_file, start=start, end=end))
+
+
+# This function yields the decoded log lines of the input file or of the byte range of the input file. Empty lines are skipped.
+def decode_lines(input_file, loads=None, start=0, end=None):
+    if loads is None:
+        loads = get_json_loads()
+    for line in clean_lines(input_file, start, end):
+        yield replace_literals(loads(line))
+
+
+# This function yields a uniform random sample of sample_size lines in the order in which they appear. The lines are only
+# yielded after all lines have been read.
+def sample_reservoir(lines, sample_size, seed=None):
+    rng = random.Random(seed)
+    reservoir = []
+    for index, line in enumerate(lines):
+        if index < sample_size:
+            reservoir.append((index, line))
+        else:
+            position = rng.randrange(index + 1)
+            if position < sample_size:
+                reservoir[position] = (index, line)
+    reservoir.sort(key=lambda entry: entry[0])
+    for _, line in reservoir:
+        yield line
+
+
+# This function samples the lines. The mode 'stride' yields every stride-th line starting with the first line, the mode 'reservoir'
+# yields a uniform random sample of sample_size lines and None yields all lines.
+def sample_lines(lines, mode, stride=1, sample_size=None, seed=None):
+    if mode is None:
+        return lines
+    if mode == 'stride':
+        return itertools.islice(lines, 0, None, stride)
+    if mode == 'reservoir':
+        return sample_reservoir(lines, sample_size, seed)
+    raise ValueError('Unknown sampling mode ' + str(mode) + '. Possible modes are: None, stride, reservoir')
+
+
+# This function measures the throughput of the input readers on the input files and prints the megabytes and lines per second.
+# Compressed files are read by their decompressor, the other files by the memory-mapped and by the block reader.
+def benchmark_readers(input_files):
+    results = {}
+    for input_file in input_files:
+        compression = get_compression(input_file)
+        if compression is not None:
+            readers = {compression: read_lines}
+        else:
+            readers = {'mmap': read_mapped_lines, 'buffered': read_buffered_lines}
+        for name, reader in readers.items():
+            line_count = 0
+            byte_count = 0
+            start_time = time.perf_counter()
+            for line in reader(input_file):
+                line_count += 1
+                byte_count += len(line) + 1
+            duration = time.perf_counter() - start_time
+            results[(input_file, name)] = line_count / duration if duration > 0 else float('inf')
+            print(input_file + ' (' + name + '): ' + str(line_count) + ' lines in ' + '%.3f' % duration + ' s (' +
+                  '%.1f' % (byte_count / duration / 1e6) + ' MB/s, ' + '%.0f' % results[(input_file, name)] + ' lines/s)')
+    return results
+
+
+# This function measures the throughput of every installed JSON backend on the input files and prints the lines per second.
+def benchmark_backends(input_files, backends=None):
+    if backends is None:
+        backends = get_available_backends()
+    results = {}
+    for backend in backends:
+        loads = get_json_loads(backend)
+        line_count = 0
+        start_time = time.perf_counter()
+        for input_file in input_files:
+            for _ in decode_lines(input_file, loads):
+                line_count += 1
+        duration = time.perf_counter() - start_time
+        results[backend] = line_count / duration if duration > 0 else float('inf')
+        print(backend + ': ' + str(line_count) + ' lines in ' + '%.3f' % duration + ' s (' + '%.0f' % results[backend] +
+              ' lines/s)')
+    return results
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python3 JSONPGInput.py <input_file> [<input_file> ...]')
+        sys.exit(1)
+    benchmark_readers(sys.argv[1:])
+    benchmark_backends(sys.argv[1:])
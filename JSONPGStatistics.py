@@ -0,0 +1,126 @@
+"""This file holds the instrumentation of the AECID-JSON-PG. The run statistics collect the wall and CPU time and the peak memory
+of the phases of a run, the throughput of the analysis of the log lines and the properties of the generated parser model.
+They can be exported as JSON file. Optionally, the phases are profiled with cProfile.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import contextlib
+import cProfile
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows, so the peak memory is not measured there.
+    resource = None
+
+
+# This function returns the peak resident set size of the process and of its terminated child processes in bytes or None if it can
+# not be measured. The peak is the maximum over the whole lifetime of the process, it never decreases.
+def get_peak_rss():
+    if resource is None:
+        return None
+    peak_rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # The peak resident set size is given in kilobytes on Linux and in bytes on macOS.
+    if sys.platform == 'darwin':
+        return peak_rss
+    return peak_rss * 1024
+
+
+# This class collects the statistics of a run of the parser generator.
+class RunStatistics:
+    # This method initializes the statistics. If profile is True, the phases are profiled with cProfile.
+    def __init__(self, profile=False):
+        self.start_time = time.perf_counter()
+        # The wall and CPU time and the peak memory of the phases.
+        self.phases = {}
+        # The throughput of the analysis at the progress intervals.
+        self.throughput = []
+        self.line_count = 0
+        self.model = None
+        # Further counters of the run, like the hits of the shape cache.
+        self.counters = {}
+        self.profiler = cProfile.Profile() if profile else None
+        self.profiled_phases = 0
+        self.interval_time = None
+        self.interval_line_count = 0
+
+    # This method measures the wall and CPU time of a phase, which is executed in the context. Phases with the same name are
+    # summed up. The phases may be nested, but only the outermost phase is profiled.
+    @contextlib.contextmanager
+    def phase(self, name):
+        if self.profiler is not None:
+            if self.profiled_phases == 0:
+                self.profiler.enable()
+            self.profiled_phases += 1
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        start_rss = get_peak_rss()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - wall_time, time.process_time() - cpu_time)
+            self.add_rss(name, start_rss, get_peak_rss())
+            if self.profiler is not None:
+                self.profiled_phases -= 1
+                if self.profiled_phases == 0:
+                    self.profiler.disable()
+
+    # This method records the peak resident set size of the process before and after the phase. Since the peak of the process never
+    # decreases, the peak after the phase is the maximum of the run up to the end of the phase and is stored as max_rss_bytes. The
+    # growth of the peak during the phase, which is summed up for phases with the same name, states how much memory the phase
+    # needed beyond the previous phases. It is 0 if the phase used less memory than an earlier phase.
+    def add_rss(self, name, start_rss, end_rss):
+        phase = self.phases[name]
+        phase['max_rss_bytes'] = end_rss
+        if start_rss is not None and end_rss is not None:
+            phase['max_rss_growth_bytes'] = (phase['max_rss_growth_bytes'] or 0) + end_rss - start_rss
+
+    # This method adds the wall time and the CPU time to the phase. It is used for the phases that are interleaved with each other,
+    # like the decoding and the folding of the log lines, of which only the wall time is measured.
+    def add_time(self, name, wall_seconds, cpu_seconds=None):
+        phase = self.phases.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': None, 'max_rss_bytes': None,
+                                              'max_rss_growth_bytes': None})
+        phase['wall_seconds'] += wall_seconds
+        if cpu_seconds is not None:
+            phase['cpu_seconds'] = (phase['cpu_seconds'] or 0.0) + cpu_seconds
+
+    # This method records the number of analyzed log lines and returns the throughput in lines per second since the last call.
+    def add_progress(self, line_count):
+        now = time.perf_counter()
+        if self.interval_time is None:
+            self.interval_time = self.start_time
+        duration = now - self.interval_time
+        lines_per_second = (line_count - self.interval_line_count) / duration if duration > 0 else None
+        self.throughput.append({'lines': line_count, 'seconds': now - self.start_time, 'lines_per_second': lines_per_second})
+        self.interval_time = now
+        self.interval_line_count = line_count
+        self.line_count = line_count
+        return lines_per_second
+
+    # This method returns the statistics as dictionary.
+    def get_statistics(self):
+        duration = time.perf_counter() - self.start_time
+        return {'seconds': duration, 'lines': self.line_count,
+                'lines_per_second': self.line_count / duration if duration > 0 else None, 'peak_rss_bytes': get_peak_rss(),
+                'phases': self.phases, 'throughput': self.throughput, 'counters': self.counters, 'model': self.model}
+
+    # This method writes the statistics to the JSON file.
+    def write(self, statistics_file):
+        with open(statistics_file, 'w') as f:
+            json.dump(self.get_statistics(), f, indent=2)
+
+    # This method writes the profile of the phases to the file, which can be analyzed with the pstats module.
+    def write_profile(self, profile_file):
+        if self.profiler is not None:
+            self.profiler.dump_stats(profile_file)
@@ -0,0 +1,399 @@
+"""This file holds the validator of the AECID-JSON-PG. The validator compiles the generated parser model into matchers and replays the
+log lines of the input files against them, so that the quality of the parser model can be checked without the logdata-anomaly-
+miner. It reports the match rate, the first failing log lines with the reasons of the failures and the throughput. The matchers
+cover the model elements, which are generated by the AECID-JSON-PG, and the optional and nullable keys. Executing this file
+validates the configured parser file against the configured or the given input files.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+
+try:
+    import yaml
+except ImportError:
+    # PyYAML is only needed to load the parser model.
+    yaml = None
+
+import AECIDjsonpg
+import JSONPGConfig
+import JSONPGInput
+
+# The kinds of the compiled nodes of the parser model.
+OBJECT = 0
+ARRAY = 1
+END_NODE = 2
+LITERAL = 3
+
+# The values of the literal nodes of the key_parser_dict.
+literal_values = {'EMPTY_OBJECT': {}, 'EMPTY_ARRAY': [], 'NULL_OBJECT': 'null'}
+
+# The patterns of the numbers, which are matched by the DecimalIntegerValueModelElement and the DecimalFloatValueModelElement with
+# and without the optional value sign.
+integer_patterns = {False: re.compile(r'[0-9]+'), True: re.compile(r'[-+]?[0-9]+')}
+float_patterns = {False: re.compile(r'[0-9]+(?:\.[0-9]*)?(?:[eE][-+]?[0-9]+)?'),
+                  True: re.compile(r'[-+]?[0-9]+(?:\.[0-9]*)?(?:[eE][-+]?[0-9]+)?')}
+
+# Maximum number of characters of the failing log lines in the report.
+line_excerpt_length = 300
+
+# The compiled models, the loads function and the number of reported failures of a worker process of the parallel validation.
+worker_arguments = None
+
+
+# This function loads the parser model from the yml file and returns the model elements of the parser.
+def load_parser_model(parser_file):
+    if yaml is None:
+        raise ImportError('The validator requires PyYAML to load the parser model. Install it with pip install pyyaml.')
+    with open(parser_file) as f:
+        model = yaml.safe_load(f)
+    if type(model) is not dict or type(model.get('Parser')) is not list:
+        raise ValueError('The parser file ' + parser_file + ' does not contain a list of Parser elements.')
+    return model['Parser']
+
+
+# This function compiles the end node into a function, which returns True if a value that is neither an object nor an array
+# matches the end node. Numbers are compared as strings. The parser generator stores the strings with sanitized escape
+# characters, while the yml loader resolves the escape characters of double-quoted arguments, so strings also match if only their
+# sanitized string matches.
+def compile_end_node(element):
+    element_type = element.get('type')
+    sanitize_entry = AECIDjsonpg.sanitize_entry
+    if element_type == 'DateTimeModelElement':
+        return AECIDjsonpg.get_date_format_matcher(element['date_format'])
+    if element_type == 'FixedDataModelElement':
+        data = str(element['args'])
+        return lambda value: value == data or str(value) == data or sanitize_entry(value) == data
+    if element_type == 'FixedWordlistDataModelElement':
+        words = {str(word) for word in element['args']}
+        return lambda value: value in words or str(value) in words or sanitize_entry(value) in words
+    if element_type == 'DecimalIntegerValueModelElement':
+        fullmatch = integer_patterns[element.get('value_sign_type') == 'optional'].fullmatch
+        if element.get('value_sign_type') == 'optional':
+            return lambda value: type(value) is int or fullmatch(str(value)) is not None
+        return lambda value: (type(value) is int and value >= 0) or fullmatch(str(value)) is not None
+    if element_type == 'DecimalFloatValueModelElement':
+        fullmatch = float_patterns[element.get('value_sign_type') == 'optional'].fullmatch
+        return lambda value: fullmatch(str(value)) is not None
+    if element_type == 'VariableByteDataModelElement':
+        fullmatch = re.compile('[' + re.escape(str(element['args'])) + ']+').fullmatch
+        return lambda value: fullmatch(str(value)) is not None or (
+                type(value) is str and fullmatch(sanitize_entry(value)) is not None)
+    raise ValueError('The model element ' + str(element.get('id')) + ' of the type ' + str(element_type) +
+                     ' is not supported by the validator.')
+
+
+# This function compiles the key_parser_dict of a JsonModelElement into nodes. Objects are compiled into nodes of the form
+# (OBJECT, keys, key_set, required_key_set), where keys maps every key to a list of the form [nullable, node], arrays into nodes of
+# the form (ARRAY, nodes), end nodes into nodes of the form (END_NODE, matcher, id) and the literals into nodes of the form
+# (LITERAL, literal). The nested dictionaries are processed from a stack instead of recursive calls, like the parser dictionary.
+def compile_key_parser_dict(key_parser_dict, end_nodes, optional_key_prefix, nullable_key_prefix):
+    result = [None]
+    stack = [(key_parser_dict, result, 0)]
+    while stack:
+        spec, target, index = stack.pop()
+        if type(spec) is dict:
+            keys = {}
+            required_keys = []
+            for key, sub_spec in spec.items():
+                key = str(key)
+                nullable = key.startswith(nullable_key_prefix)
+                if nullable:
+                    key = key[len(nullable_key_prefix):]
+                if key.startswith(optional_key_prefix):
+                    key = key[len(optional_key_prefix):]
+                else:
+                    required_keys.append(key)
+                entry = keys[key] = [nullable, None]
+                stack.append((sub_spec, entry, 1))
+            node = (OBJECT, keys, frozenset(keys), frozenset(required_keys))
+        elif type(spec) is list:
+            nodes = [None] * len(spec)
+            for i, sub_spec in enumerate(spec):
+                stack.append((sub_spec, nodes, i))
+            node = (ARRAY, nodes)
+        elif spec in literal_values:
+            node = (LITERAL, spec)
+        elif spec in end_nodes:
+            node = (END_NODE, end_nodes[spec], spec)
+        else:
+            raise ValueError('The key_parser_dict refers to the unknown model element ' + str(spec) + '.')
+        target[index] = node
+    return result[0]
+
+
+# This function compiles the model elements of the parser and returns the compiled models of the start element. The start element
+# is a JsonModelElement or a FirstMatchModelElement of JsonModelElements, of which the first matching one parses a log line.
+def compile_parser_model(elements):
+    elements_by_id = {element.get('id'): element for element in elements}
+    end_nodes = {}
+    for element in elements:
+        if element.get('type') not in ('JsonModelElement', 'FirstMatchModelElement'):
+            end_nodes[element.get('id')] = compile_end_node(element)
+
+    start_elements = [element for element in elements if element.get('start')]
+    if len(start_elements) != 1:
+        raise ValueError('The parser model must have exactly one start element, but has ' + str(len(start_elements)) + '.')
+    start_element = start_elements[0]
+    if start_element.get('type') == 'FirstMatchModelElement':
+        json_elements = []
+        for element_id in start_element['args']:
+            if element_id not in elements_by_id:
+                raise ValueError('The FirstMatchModelElement refers to the unknown model element ' + str(element_id) + '.')
+            json_elements.append(elements_by_id[element_id])
+    else:
+        json_elements = [start_element]
+
+    models = []
+    for element in json_elements:
+        if element.get('type') != 'JsonModelElement':
+            raise ValueError('The model element ' + str(element.get('id')) + ' of the type ' + str(element.get('type')) +
+                             ' is not supported as model of the log lines by the validator.')
+        models.append(compile_key_parser_dict(element['key_parser_dict'], end_nodes, str(element.get('optional_key_prefix', '')),
+                                              str(element.get('nullable_key_prefix', ''))))
+    return models
+
+
+# This function returns the path of the value, which is stored as nested tuples of the form (parent_path, key), as string.
+def get_path_string(path):
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(str(key))
+    return '/' + '/'.join(reversed(keys))
+
+
+# This function matches the record against the compiled model. It returns None if the record matches and otherwise the reason of
+# the first failure as tuple of the form (path, message). The values are processed from a stack instead of recursive calls.
+def match_record(model, record):
+    stack = [(model, record, None)]
+    while stack:
+        node, value, path = stack.pop()
+        kind = node[0]
+        if kind is OBJECT:
+            if type(value) is not dict:
+                return path, 'expected an object'
+            keys = node[1]
+            # The keys of the object are compared with the keys of the model as sets first, since most objects match.
+            if not value.keys() <= node[2]:
+                return (path, next(key for key in value if key not in keys)), 'unexpected key'
+            if not value.keys() >= node[3]:
+                return (path, next(key for key in node[1] if key in node[3] and key not in value)), 'missing key'
+            for key, sub_value in value.items():
+                entry = keys[key]
+                if entry[0] and sub_value == 'null':
+                    continue
+                sub_node = entry[1]
+                # The end nodes, which are most of the nodes, are matched directly instead of from the stack.
+                if sub_node[0] is END_NODE and type(sub_value) is not dict and type(sub_value) is not list:
+                    if not sub_node[1](sub_value):
+                        return (path, key), 'value ' + repr(sub_value) + ' does not match ' + sub_node[2]
+                else:
+                    stack.append((sub_node, sub_value, (path, key)))
+        elif kind is END_NODE:
+            if type(value) is dict or type(value) is list:
+                return path, 'expected a value of ' + node[2]
+            if not node[1](value):
+                return path, 'value ' + repr(value) + ' does not match ' + node[2]
+        elif kind is ARRAY:
+            if type(value) is not list:
+                return path, 'expected an array'
+            nodes = node[1]
+            if len(nodes) == 1:
+                sub_node = nodes[0]
+                if sub_node[0] is END_NODE:
+                    matcher = sub_node[1]
+                    for i, element in enumerate(value):
+                        if type(element) is dict or type(element) is list or not matcher(element):
+                            stack.append((sub_node, element, (path, i)))
+                            break
+                else:
+                    for i, element in enumerate(value):
+                        stack.append((sub_node, element, (path, i)))
+            else:
+                # Every element of the array must match one of the alternatives.
+                for i, element in enumerate(value):
+                    if all(match_record(sub_node, element) is not None for sub_node in nodes):
+                        return (path, i), 'the element matches none of the ' + str(len(nodes)) + ' alternatives'
+        elif value != literal_values[node[1]]:
+            return path, 'expected ' + node[1]
+    return None
+
+
+# This function matches the record against the models. The record matches if any model matches. Otherwise, the reason of the
+# model, whose failure is the deepest in the record, is returned as string. Of failures at the same depth, the failures of values
+# are preferred to unexpected and missing keys, since they are found in the model of the same kind of log lines.
+def match_models(models, record):
+    reasons = []
+    for model in models:
+        reason = match_record(model, record)
+        if reason is None:
+            return None
+        reasons.append(reason)
+    path, message = max(reasons, key=lambda reason: (get_path_string(reason[0]).count('/'),
+                                                     reason[1] not in ('unexpected key', 'missing key')))
+    return get_path_string(path) + ': ' + message
+
+
+# This function validates the log lines in a byte range of an input file and returns the numbers of log lines and of matching log
+# lines and the first failure_num failures. The line numbers of the failures count the lines from the start of the byte range.
+def validate_range(models, loads, input_file, failure_num, start=0, end=None):
+    replace_literals = JSONPGInput.replace_literals
+    clean_line = JSONPGInput.clean_line
+    line_count = 0
+    match_count = 0
+    failures = []
+    for line_number, line in enumerate(JSONPGInput.read_lines(input_file, start=start, end=end), 1):
+        line = clean_line(line)
+        if not line:
+            continue
+        line_count += 1
+        try:
+            record = replace_literals(loads(line))
+        except (ValueError, RecursionError):
+            # Log lines, which are nested too deeply for the recursive json backend, are invalid like in the parser generator.
+            reason = 'invalid JSON'
+        else:
+            reason = match_models(models, record)
+            if reason is None:
+                match_count += 1
+                continue
+        if len(failures) < failure_num:
+            failures.append({'file': input_file, 'line': line_number, 'reason': reason,
+                             'log_line': line[:line_excerpt_length].decode(errors='replace')})
+    return line_count, match_count, failures
+
+
+# This function initializes a worker process of the parallel validation with the compiled models of the parser file.
+def init_validation_worker(parser_file, backend, failure_num):
+    global worker_arguments
+    worker_arguments = (compile_parser_model(load_parser_model(parser_file)), JSONPGInput.get_json_loads(backend), failure_num)
+
+
+# This function validates the log lines in a byte range of an input file. It is executed by the worker processes.
+def validate_chunk(chunk):
+    models, loads, failure_num = worker_arguments
+    input_file, start, end = chunk
+    return validate_range(models, loads, input_file, failure_num, start, end)
+
+
+# This function returns the number of the line, which precedes the first line that starts in the byte range from start, in an
+# uncompressed input file. It is used to number the lines of the failures of the parallel validation.
+def get_line_offset(input_file, start):
+    if start == 0:
+        return 0
+    line_offset = 0
+    with open(input_file, 'rb') as f:
+        position = 0
+        while position < start:
+            block = f.read(min(JSONPGInput.read_block_size, start - position))
+            if not block:
+                break
+            line_offset += block.count(b'\n')
+            position += len(block)
+        f.seek(start - 1)
+        if f.read(1) != b'\n':
+            # The first line that starts within the byte range is the line after the line break that follows the start.
+            line_offset += 1
+    return line_offset
+
+
+# This function validates the parser file against the log lines of the input files and returns the report as dictionary. The first
+# failure_num failing log lines are reported with their positions in the input files and the reasons of the failures. If more than
+# one process is used, the input files are split into chunks of chunk_size bytes, which are validated by a pool of worker
+# processes. None uses all processors.
+def validate(parser_file, input_files, failure_num=None, backend=None, processes=1, chunk_size=None):
+    if failure_num is None:
+        failure_num = JSONPGConfig.validation_failure_num
+    if backend is None:
+        backend = JSONPGConfig.json_backend
+    if chunk_size is None:
+        chunk_size = JSONPGConfig.parallel_chunk_size
+    if processes is None:
+        processes = os.cpu_count() or 1
+    start_time = time.perf_counter()
+    models = compile_parser_model(load_parser_model(parser_file))
+    compile_seconds = time.perf_counter() - start_time
+
+    line_count = 0
+    match_count = 0
+    failures = []
+    start_time = time.perf_counter()
+    if processes > 1:
+        chunks = JSONPGInput.split_input_ranges([(input_file, 0, os.path.getsize(input_file)) for input_file in input_files],
+                                                chunk_size)
+        with multiprocessing.Pool(processes, initializer=init_validation_worker,
+                                  initargs=(parser_file, backend, failure_num)) as pool:
+            # The results are returned in the order of the chunks, so that the first failures of the input files are reported.
+            for (input_file, start, _), (chunk_line_count, chunk_match_count, chunk_failures) in zip(
+                    chunks, pool.imap(validate_chunk, chunks)):
+                line_count += chunk_line_count
+                match_count += chunk_match_count
+                if chunk_failures and len(failures) < failure_num:
+                    line_offset = get_line_offset(input_file, start)
+                    for failure in chunk_failures[:failure_num - len(failures)]:
+                        failure['line'] += line_offset
+                        failures.append(failure)
+    else:
+        loads = JSONPGInput.get_json_loads(backend)
+        for input_file in input_files:
+            file_line_count, file_match_count, file_failures = validate_range(models, loads, input_file,
+                                                                              failure_num - len(failures))
+            line_count += file_line_count
+            match_count += file_match_count
+            failures.extend(file_failures)
+    duration = time.perf_counter() - start_time
+    return {'parser_file': parser_file, 'lines': line_count, 'matched_lines': match_count,
+            'match_rate': match_count / line_count if line_count > 0 else None, 'seconds': duration,
+            'lines_per_second': line_count / duration if duration > 0 else None, 'compile_seconds': compile_seconds,
+            'failures': failures}
+
+
+# This function prints the report of the validation.
+def print_report(report):
+    print('Validated ' + str(report['lines']) + ' log lines against ' + report['parser_file'] + ' in ' + '%.3f' % report['seconds'] +
+          ' s (' + '%.0f' % (report['lines_per_second'] or 0) + ' lines/s)')
+    if report['match_rate'] is not None:
+        print('Matched ' + str(report['matched_lines']) + ' log lines (' + '%.2f' % (100 * report['match_rate']) + ' %)')
+    for failure in report['failures']:
+        print(failure['file'] + ':' + str(failure['line']) + ': ' + failure['reason'])
+        print('    ' + failure['log_line'])
+
+
+if __name__ == '__main__':
+    argument_parser = argparse.ArgumentParser(description='Validate the parser model of the AECID-JSON-PG against JSON log lines.')
+    argument_parser.add_argument('input_files', nargs='*', default=JSONPGConfig.input_files, metavar='INPUT_FILE',
+                                 help='input files with the log lines, by default the input_files of JSONPGConfig')
+    argument_parser.add_argument('-p', '--parser-file', default=JSONPGConfig.parser_file,
+                                 help='parser model in yml format, by default the parser_file of JSONPGConfig')
+    argument_parser.add_argument('-n', '--failure-num', type=int, default=JSONPGConfig.validation_failure_num,
+                                 help='number of the first failing log lines, which are reported')
+    argument_parser.add_argument('-j', '--processes', type=int, default=JSONPGConfig.parallel_processes,
+                                 help='number of processes that validate chunks of the input files in parallel, by default the '
+                                      'parallel_processes of JSONPGConfig')
+    argument_parser.add_argument('-m', '--min-match-rate', type=float, default=None, metavar='RATE',
+                                 help='exit with status 1 if less than this fraction of the log lines matches, e.g., 0.99')
+    argument_parser.add_argument('-o', '--output-file', default=None, metavar='FILE',
+                                 help='output file of the report in JSON format')
+    args = argument_parser.parse_args()
+    validation_report = validate(args.parser_file, args.input_files, args.failure_num, processes=args.processes)
+    print_report(validation_report)
+    if args.output_file is not None:
+        with open(args.output_file, 'w') as f:
+            json.dump(validation_report, f, indent=2)
+        print('Report written to ' + args.output_file)
+    if args.min_match_rate is not None and (validation_report['match_rate'] or 0) < args.min_match_rate:
+        sys.exit(1)
@@ -0,0 +1,55 @@
+"""This file holds the fixtures of the tests of the AECID-JSON-PG.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# The modules of the parser generator are located in the parent directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# This function returns a random JSON value of at most the depth. The scalars are always strings and the lists either hold
+# dictionaries or a single string, since the wordlists of values of different types can not be sorted.
+def generate_value(rng, depth):
+    r = rng.random()
+    if depth > 0 and r < 0.2:
+        return {rng.choice('abc'): generate_value(rng, depth - 1) for _ in range(rng.randint(1, 2))}
+    if depth > 0 and r < 0.35:
+        return [{rng.choice('abc'): generate_value(rng, depth - 1)} for _ in range(rng.randint(1, 2))]
+    if r < 0.5:
+        return None
+    if r < 0.85:
+        return rng.choice(['x', 'y', 'z1', 'u', 'v'])
+    return [rng.choice(['p', 'q'])]
+
+
+# This function returns random records, whose keys change their types, null values and structures between the records.
+def generate_records(seed, record_num=40, depth=2):
+    rng = random.Random(seed)
+    return [{'key' + str(rng.randint(0, 2)): generate_value(rng, depth), 'k': generate_value(rng, depth)} for _ in range(record_num)]
+
+
+# This fixture returns a function, which writes the records as JSON log lines or the strings as they are to a log file in the
+# temporary directory and returns its path.
+@pytest.fixture
+def write_log_file(tmp_path):
+    def write(records, name='log.txt'):
+        log_file = str(tmp_path / name)
+        with open(log_file, 'w') as f:
+            for record in records:
+                f.write((record if type(record) is str else json.dumps(record)) + '\n')
+        return log_file
+    return write
@@ -0,0 +1,29 @@
+"""This file tests the generator of the synthetic log lines of the benchmark.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+
+import pytest
+
+from JSONPGBenchmark import generate_log_lines
+
+
+@pytest.mark.parametrize('cardinality', [1, 2, 3, 20])
+def test_cardinality(cardinality):
+    log_lines = list(generate_log_lines(200, seed=1, key_num=16, cardinality=cardinality))
+    assert len(log_lines) == 200
+    for log_line in log_lines:
+        assert type(json.loads(log_line)) is dict
+
+
+def test_same_seed_same_log_lines():
+    assert list(generate_log_lines(50, seed=3)) == list(generate_log_lines(50, seed=3))
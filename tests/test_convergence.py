@@ -0,0 +1,75 @@
+"""This file tests the early stop of the analysis after the convergence of the parser model and the sampling of the log lines.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+
+from AECIDjsonpg import ParserGenerator
+
+
+# This function returns the records of a log file, whose parser model converges at the beginning and changes again in the tail.
+def get_records(record_num=550):
+    records = [{'id': 'a', 'value': 'b'} for _ in range(record_num - 50)]
+    records += [{'id': 'a', 'value': 'b', 'late': 'c'} for _ in range(50)]
+    return records
+
+
+def test_convergence_stops_early(write_log_file):
+    log_file = write_log_file(get_records())
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, convergence_lines=100)
+    generator.add_files()
+    assert generator.converged
+    assert generator.line_count == 101
+    assert 'late' not in generator.get_parser_yml()
+
+
+def test_resume_after_convergence_reads_the_rest(write_log_file, tmp_path):
+    log_file = write_log_file(get_records())
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, convergence_lines=100)
+    generator.add_files()
+    # Only the analyzed log lines are marked as analyzed.
+    assert generator.file_offsets[os.path.abspath(log_file)] < os.path.getsize(log_file)
+    generator.save_snapshot(snapshot_file)
+    with open(log_file, 'a') as f:
+        f.write(json.dumps({'id': 'a', 'value': 'b'}) + '\n')
+
+    resumed_generator = ParserGenerator(input_files=[log_file], progress_interval=None)
+    resumed_generator.load_snapshot(snapshot_file)
+    resumed_generator.add_files()
+    assert resumed_generator.line_count == 550 - 101 + 1
+    assert resumed_generator.file_offsets[os.path.abspath(log_file)] == os.path.getsize(log_file)
+    assert 'late' in resumed_generator.get_parser_yml()
+
+
+def test_complete_analysis_marks_the_whole_file(write_log_file):
+    log_file = write_log_file(get_records())
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, convergence_lines=1000)
+    generator.add_files()
+    assert not generator.converged
+    assert generator.file_offsets[os.path.abspath(log_file)] == os.path.getsize(log_file)
+
+
+def test_sampling_does_not_mark_the_file(write_log_file):
+    log_file = write_log_file(get_records())
+    for config in [{'sampling_mode': 'stride', 'sampling_stride': 7}, {'sampling_mode': 'reservoir', 'sampling_size': 20}]:
+        generator = ParserGenerator(input_files=[log_file], progress_interval=None, **config)
+        generator.add_files()
+        assert generator.line_count < 550
+        assert os.path.abspath(log_file) not in generator.file_offsets
+
+
+def test_stride_sampling(write_log_file):
+    log_file = write_log_file([{'id': str(index)} for index in range(100)])
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, sampling_mode='stride', sampling_stride=10)
+    generator.add_files()
+    assert generator.line_count == 10
@@ -0,0 +1,64 @@
+"""This file tests the sharing of identical end nodes across the keys of the parser model.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+import JSONPGValidator
+from AECIDjsonpg import ParserGenerator
+
+
+# This function returns records, whose keys have the same fixed values, wordlists or variable values as other keys.
+def get_records():
+    records = []
+    for i in range(40):
+        records.append({'source': 'abc'[i % 3], 'target': 'abc'[(i + 1) % 3], 'status': 'ok', 'result': 'ok',
+                        'user': 'user %d' % (i * 31), 'group': 'group %d' % (i * 17), 'size': i,
+                        'items': [{'state': 'ok', 'kind': 'abc'[i % 3]}]})
+    return records
+
+
+# This function generates the parser model of the log file, writes it to a parser file in the temporary directory and returns
+# the generator and the path of the parser file.
+def write_parser_file(tmp_path, log_file, share_end_nodes):
+    parser_file = str(tmp_path / ('shared.yml' if share_end_nodes else 'parser.yml'))
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, share_end_nodes=share_end_nodes)
+    generator.add_files()
+    generator.write_parser(parser_file)
+    return generator, parser_file
+
+
+def test_shared_end_nodes(write_log_file, tmp_path):
+    log_file = write_log_file(get_records())
+    generator, parser_file = write_parser_file(tmp_path, log_file, False)
+    shared_generator, shared_parser_file = write_parser_file(tmp_path, log_file, True)
+    assert generator.deduplicated_end_node_count == 0
+    # The fixed values ok, the wordlists of a, b and c and the variable values are shared.
+    assert shared_generator.deduplicated_end_node_count == 5
+    assert shared_generator.end_node_count == generator.end_node_count - 5
+    with open(shared_parser_file) as f:
+        assert f.read().count('type: FixedWordlistDataModelElement') == 1
+
+
+@pytest.mark.parametrize('share_end_nodes', [False, True])
+def test_shared_end_nodes_match_the_log_lines(write_log_file, tmp_path, share_end_nodes):
+    log_file = write_log_file(get_records())
+    parser_file = write_parser_file(tmp_path, log_file, share_end_nodes)[1]
+    report = JSONPGValidator.validate(parser_file, [log_file])
+    assert report['match_rate'] == 1.0
+
+
+def test_end_node_ids_are_numbered_by_key():
+    generator = ParserGenerator(progress_interval=None)
+    generator.add_records([{'a': 'x', 'b': [{'a': 'y'}]}])
+    parser_yml = generator.get_parser_yml()
+    assert "name: 'a_str0'" in parser_yml
+    assert "name: 'a_str1'" in parser_yml
@@ -0,0 +1,96 @@
+"""This file tests the follow mode, which folds the new log lines of growing input files into the parser model.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+import pytest
+
+import AECIDjsonpg
+import JSONPGInput
+from AECIDjsonpg import ParserGenerator
+
+
+# This function waits until the condition is True and fails after the timeout in seconds.
+def wait_for(condition, timeout=10.0):
+    end_time = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end_time
+        time.sleep(0.01)
+
+
+def test_growing_file_is_followed(write_log_file, tmp_path):
+    log_file = write_log_file([{'a': 'x'}])
+    parser_file = str(tmp_path / 'parser.yml')
+    generator = ParserGenerator(progress_interval=None, follow_interval=0.05, follow_debounce=0.05)
+    stop_event = threading.Event()
+
+    # This function appends a log line with a new key after the first log line was analyzed and stops the follow mode after the
+    # new log line was analyzed.
+    def append_line():
+        wait_for(lambda: generator.line_count == 1)
+        with open(log_file, 'a') as f:
+            f.write(json.dumps({'a': 'y', 'b': 'z'}) + '\n')
+        wait_for(lambda: generator.line_count == 2)
+        stop_event.set()
+
+    thread = threading.Thread(target=append_line, daemon=True)
+    thread.start()
+    generator.follow([log_file], parser_file, stop_event, duration=10)
+    thread.join()
+    assert generator.line_count == 2
+    assert generator.file_offsets[os.path.abspath(log_file)] == os.path.getsize(log_file)
+    with open(parser_file) as f:
+        assert f.read() == generator.get_parser_yml()
+    assert '_b:' in generator.get_parser_yml()
+
+
+def test_compressed_files_are_rejected(tmp_path):
+    log_file = str(tmp_path / 'log.txt.gz')
+    with gzip.open(log_file, 'wt') as f:
+        f.write(json.dumps({'a': 'x'}) + '\n')
+    parser_file = str(tmp_path / 'parser.yml')
+    with pytest.raises(ValueError):
+        ParserGenerator(progress_interval=None).follow([log_file], parser_file, duration=10)
+    with pytest.raises(SystemExit) as exit_info:
+        AECIDjsonpg.main(['-f', '-i', log_file, '-o', parser_file, '-s', 'progress_interval=None'])
+    assert exit_info.value.code == 2
+    assert not os.path.exists(parser_file)
+
+
+def test_socket_is_followed_until_its_file_is_removed(tmp_path):
+    socket_file = str(tmp_path / 'log.sock')
+    line_queue = queue.Queue()
+    stop_event = threading.Event()
+
+    # This function sends a log line over the socket, waits for the line and removes the socket file, before the follow mode is
+    # stopped.
+    def send_line():
+        wait_for(lambda: os.path.exists(socket_file))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_file)
+            client.sendall(b'{"a": "x"}\n')
+        lines.append(line_queue.get(timeout=10))
+        os.remove(socket_file)
+        stop_event.set()
+
+    lines = []
+    thread = threading.Thread(target=send_line, daemon=True)
+    thread.start()
+    JSONPGInput.follow_socket(socket_file, line_queue, stop_event, interval=0.05)
+    thread.join()
+    assert lines == [(socket_file, None, [b'{"a": "x"}'])]
@@ -0,0 +1,84 @@
+"""This file tests the folding of the further elements of lists of dictionaries within list_element_fold_num.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import copy
+import random
+
+import pytest
+
+from AECIDjsonpg import ParserGenerator
+
+
+# This function returns a random value, whose lists of dictionaries have different lengths and may hold other values.
+def generate_value(rng, depth):
+    r = rng.random()
+    if depth > 0 and r < 0.35:
+        return [{rng.choice('ab'): generate_value(rng, depth - 1)} if rng.random() < 0.8 else rng.choice(['s', None])
+                for _ in range(rng.randint(1, 4))]
+    if depth > 0 and r < 0.5:
+        return {rng.choice('ab'): generate_value(rng, depth - 1)}
+    if r < 0.6:
+        return None
+    return rng.choice(['x', 'y', 'z'])
+
+
+# This function folds the records and returns the generator.
+def fold_records(records, **config):
+    generator = ParserGenerator(progress_interval=None, **config)
+    generator.add_records(copy.deepcopy(records))
+    return generator
+
+
+def test_only_the_first_element_by_default():
+    generator = fold_records([{'list': [{'a': 'x'}]}, {'list': [{'a': 'x'}, {'b': 'y'}]}])
+    parser_yml = generator.get_parser_yml()
+    assert 'a:' in parser_yml and 'b:' not in parser_yml
+    assert generator.truncated_list_count == 0
+
+
+def test_all_elements():
+    records = [{'list': [{'a': 'x'}]}, {'list': [{'a': 'x'}, {'a': 'y', 'b': 'z'}]}]
+    parser_yml = fold_records(records, list_element_fold_num=None).get_parser_yml()
+    assert ' a: a_list0' in parser_yml
+    assert '_b: b_str0' in parser_yml
+
+
+def test_elements_after_another_value():
+    records = [{'list': [{'a': 'x'}]}] + [{'list': ['s', {'a': value}]} for value in ['y', 'z']]
+    parser_yml = fold_records(records, list_element_fold_num=2).get_parser_yml()
+    assert all('"' + value + '"' in parser_yml for value in 'xyz')
+
+
+def test_truncated_lists_are_counted():
+    records = [{'list': [{'a': 'x'}] * length} for length in [1, 2, 3, 4, 2, 5]]
+    assert fold_records(records, list_element_fold_num=2).truncated_list_count == 3
+    assert fold_records(records, list_element_fold_num=None).truncated_list_count == 0
+
+
+@pytest.mark.parametrize('list_element_fold_num', [2, 3, None])
+@pytest.mark.parametrize('seed', range(10))
+def test_same_result_with_and_without_shape_cache(seed, list_element_fold_num):
+    rng = random.Random(seed)
+    records = [{'l': generate_value(rng, 3), 'm': generate_value(rng, 2)} for _ in range(60)]
+    cached = fold_records(records, list_element_fold_num=list_element_fold_num)
+    uncached = fold_records(records, list_element_fold_num=list_element_fold_num, shape_cache_size=0)
+    columnar = fold_records(records, list_element_fold_num=list_element_fold_num, fold_engine='columnar', column_batch_size=7)
+    assert cached.truncated_list_count == uncached.truncated_list_count == columnar.truncated_list_count
+    assert cached.get_parser_yml() == uncached.get_parser_yml() == columnar.get_parser_yml()
+
+
+def test_snapshot_with_another_budget_is_rejected(tmp_path):
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+    fold_records([{'list': [{'a': 'x'}, {'b': 'y'}]}], list_element_fold_num=None).save_snapshot(snapshot_file)
+    with pytest.raises(ValueError, match='list_element_fold_num'):
+        ParserGenerator(list_element_fold_num=2).load_snapshot(snapshot_file)
+    ParserGenerator(list_element_fold_num=None).load_snapshot(snapshot_file)
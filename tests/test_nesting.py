@@ -0,0 +1,76 @@
+"""This file tests the analysis of deeply nested log lines, which must not reach the recursion limit.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+
+import pytest
+import yaml
+
+import AECIDjsonpg
+from AECIDjsonpg import ParserGenerator, convert_to_lists, convert_to_string
+
+
+# This function returns the value nested in depth lists.
+def nest(value, depth):
+    for _ in range(depth):
+        value = [value]
+    return value
+
+
+def test_deeply_nested_values_are_rendered():
+    depth = sys.getrecursionlimit() + 100
+    for values in (['x'], ['x', 'y']):
+        generator = ParserGenerator(progress_interval=None)
+        generator.add_records([{'a': nest(value, depth)} for value in values])
+        parser_yml = generator.get_parser_yml()
+        # The outermost list is the list of the end node.
+        assert '[' * (depth - 1) + "'x'" + ']' * (depth - 1) in parser_yml
+        yaml.safe_load(parser_yml)
+
+
+def test_deeply_nested_dictionaries_are_rendered():
+    record = 'x'
+    for _ in range(sys.getrecursionlimit() + 100):
+        record = {'a': record}
+    generator = ParserGenerator(progress_interval=None)
+    generator.add_records([record])
+    assert generator.get_parser_yml().count('a:') == sys.getrecursionlimit() + 100
+
+
+def test_strings_of_nested_values():
+    for value in [(), ('x',), (1, ('a', "b'c"), ()), (('x', (-2.5,)),), 'x', 3]:
+        assert convert_to_string(value) == str(convert_to_lists(value))
+
+
+# The nested lists of a record are only searched for dictionaries once, so the searches do not depend on the depth of the lists.
+@pytest.mark.parametrize('shape_cache_size', [0, 1000])
+def test_nested_lists_are_searched_once(monkeypatch, shape_cache_size):
+    includes_dict = AECIDjsonpg.includes_dict
+    searches = []
+
+    # This function counts the calls of includes_dict, which search a list that was not searched before.
+    def count_searches(obj, dict_lists=None):
+        if type(obj) is list and (dict_lists is None or id(obj) not in dict_lists):
+            searches.append(obj)
+        return includes_dict(obj, dict_lists)
+
+    monkeypatch.setattr(AECIDjsonpg, 'includes_dict', count_searches)
+    search_counts = []
+    for depth in (100, 1000):
+        searches.clear()
+        value = {'b': 1}
+        for _ in range(depth):
+            value = [value, 'x']
+        generator = ParserGenerator(progress_interval=None, shape_cache_size=shape_cache_size)
+        generator.add_records([{'a': value}] * 3)
+        search_counts.append(len(searches))
+    assert search_counts[0] == search_counts[1] <= 6
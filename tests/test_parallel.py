@@ -0,0 +1,73 @@
+"""This file tests that the parallel analysis generates the same parser model as the sequential analysis.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from AECIDjsonpg import ParserGenerator
+from conftest import generate_records
+
+chunk_sizes = [64, 200, 700, 1 << 20]
+
+
+# This function analyzes the log file and returns the yml of the parser model.
+def get_parser_yml(log_file, **config):
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, **config)
+    generator.add_files()
+    return generator.get_parser_yml()
+
+
+# A node, which only becomes inconsistent in a later chunk, keeps the null values, which appeared after a list of dictionaries.
+@pytest.mark.parametrize('chunk_size', chunk_sizes)
+def test_nullable_after_list_of_dictionaries(write_log_file, chunk_size):
+    records = [{'key1': {'a': 'x'}, 'pad': 'p' * 40}] * 4 + [{'key1': [{'b': 'y'}]}, {'key1': None}, {'key1': 'z'}]
+    log_file = write_log_file(records)
+    sequential_yml = get_parser_yml(log_file)
+    assert '+key1:' in sequential_yml
+    assert get_parser_yml(log_file, parallel_processes=2, parallel_chunk_size=chunk_size) == sequential_yml
+
+
+# The values of later chunks, which are of the type of the node of an earlier chunk, but not of the type of their first value, are
+# folded into the node of the earlier chunk.
+@pytest.mark.parametrize('chunk_size', chunk_sizes)
+def test_values_of_the_type_of_an_earlier_chunk(write_log_file, chunk_size):
+    records = [{'key1': {'a': 'x'}, 'pad': 'p' * 40}] * 4 + [{'key1': 'z'}, {'key1': {'c': 'y'}}]
+    log_file = write_log_file(records)
+    sequential_yml = get_parser_yml(log_file)
+    assert '_c:' in sequential_yml
+    assert get_parser_yml(log_file, parallel_processes=2, parallel_chunk_size=chunk_size) == sequential_yml
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_records(write_log_file, seed):
+    log_file = write_log_file(generate_records(seed))
+    sequential_yml = get_parser_yml(log_file)
+    for chunk_size in chunk_sizes:
+        assert get_parser_yml(log_file, parallel_processes=2, parallel_chunk_size=chunk_size) == sequential_yml
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_records_split_by_discriminator(write_log_file, seed):
+    log_file = write_log_file(generate_records(seed))
+    sequential_yml = get_parser_yml(log_file, discriminator_key='k')
+    for chunk_size in chunk_sizes:
+        assert get_parser_yml(log_file, parallel_processes=2, parallel_chunk_size=chunk_size, discriminator_key='k') == sequential_yml
+
+
+# The elements of a later chunk, which the first element of its list of dictionaries skips, because it is no dictionary, are folded
+# into the dictionary of the list of an earlier chunk.
+@pytest.mark.parametrize('chunk_size', [20, 40] + chunk_sizes)
+def test_list_elements_after_an_element_of_another_type(write_log_file, chunk_size):
+    records = [{}, {'w': [{}]}, {}, {}, {'y': 'k4', 'w': 3.5}, {'w': [[], {}]}, {'w': [{'d': []}]}]
+    log_file = write_log_file(records)
+    sequential_yml = get_parser_yml(log_file)
+    assert '- _d:\n                  "EMPTY_ARRAY"' in sequential_yml
+    assert get_parser_yml(log_file, parallel_processes=2, parallel_chunk_size=chunk_size) == sequential_yml
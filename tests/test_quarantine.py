@@ -0,0 +1,89 @@
+"""This file tests the quarantine of the log lines, which can not be decoded, and the stop of the analysis after too many of them.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+
+import pytest
+
+import AECIDjsonpg
+from AECIDjsonpg import ParserGenerator
+
+# A log line, which is valid JSON, but nested too deeply for the recursive json backend.
+deep_line = '[' * 100000 + ']' * 100000
+
+
+# This function returns log lines, of which the lines at the positions 2, 4 and 6 can not be decoded or are no JSON objects.
+def get_lines():
+    lines = [json.dumps({'id': str(i)}) for i in range(8)]
+    lines[2] = '{"id":'
+    lines[4] = '"no object"'
+    lines[6] = deep_line
+    return lines
+
+
+# This function returns the offsets of the lines in the log file, which were written by write_log_file.
+def get_offsets(lines):
+    offsets = []
+    offset = 0
+    for line in lines:
+        offsets.append(offset)
+        offset += len(line) + 1
+    return offsets
+
+
+@pytest.mark.parametrize('parallel_processes', [1, 2])
+def test_quarantine_holds_the_failed_lines(write_log_file, tmp_path, parallel_processes):
+    lines = get_lines()
+    log_file = write_log_file(lines)
+    quarantine_file = str(tmp_path / 'quarantine.json')
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, json_backend='json', quarantine_file=quarantine_file,
+                                parallel_processes=parallel_processes, parallel_chunk_size=128)
+    generator.add_files()
+    assert generator.line_count == 5
+    assert generator.input_line_counts == {log_file: 8}
+    assert generator.decode_failure_counts == {log_file: 3}
+    with open(quarantine_file) as f:
+        quarantined = sorted((json.loads(line) for line in f), key=lambda failure: failure['offset'])
+    offsets = get_offsets(lines)
+    assert [(failure['file'], failure['offset'], failure['line']) for failure in quarantined] == [
+        (log_file, offsets[i], lines[i]) for i in (2, 4, 6)]
+    assert quarantined[1]['error'] == AECIDjsonpg.no_object_error
+    assert all(failure['error'] for failure in quarantined)
+
+
+def test_read_lines_are_counted_alike(write_log_file, capsys):
+    log_file = write_log_file(get_lines())
+    totals = []
+    for parallel_processes in (1, 2):
+        ParserGenerator(input_files=[log_file], progress_interval=None, json_backend='json', parallel_processes=parallel_processes,
+                        parallel_chunk_size=128).add_files()
+        totals.append([line for line in capsys.readouterr().out.splitlines() if line.startswith('Total amount of log lines read')])
+    assert totals[0] == totals[1] == ['Total amount of log lines read: 8']
+
+
+def test_failure_rate_stops_the_analysis(write_log_file, tmp_path):
+    log_file = write_log_file(get_lines())
+    parser_file = str(tmp_path / 'parser.yml')
+    with pytest.raises(SystemExit) as exit_info:
+        AECIDjsonpg.main(['-i', log_file, '-o', parser_file, '-s', 'progress_interval=None', '-s', 'decode_failure_rate_max=0.2',
+                          '-s', 'decode_failure_min_lines=1'])
+    assert exit_info.value.code == 1
+    assert not os.path.exists(parser_file)
+
+
+def test_failure_rate_below_the_maximum(write_log_file, tmp_path):
+    log_file = write_log_file(get_lines())
+    parser_file = str(tmp_path / 'parser.yml')
+    AECIDjsonpg.main(['-i', log_file, '-o', parser_file, '-s', 'progress_interval=None', '-s', 'decode_failure_rate_max=0.5',
+                      '-s', 'decode_failure_min_lines=1'])
+    assert os.path.exists(parser_file)
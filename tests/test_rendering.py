@@ -0,0 +1,70 @@
+"""This file tests that the incremental rendering of the parser model generates the same yml as a full rendering.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import copy
+
+import pytest
+
+from AECIDjsonpg import ParserGenerator
+from conftest import generate_records
+
+
+# This function returns the yml of the parser model of the records, which is rendered once by a new generator.
+def get_fresh_parser_yml(records, **config):
+    generator = ParserGenerator(progress_interval=None, **config)
+    generator.add_records(generate_copy(records))
+    return generator.get_parser_yml()
+
+
+# This function returns a copy of the records, since the JSON literals of the records are replaced when they are folded.
+def generate_copy(records):
+    return copy.deepcopy(records)
+
+
+@pytest.mark.parametrize('config', [{}, {'share_end_nodes': True}, {'discriminator_key': 'k'}, {'fold_engine': 'columnar'}])
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_rendering_equals_full_rendering(seed, config):
+    records = generate_records(seed, record_num=60)
+    generator = ParserGenerator(progress_interval=None, **config)
+    for end in range(10, 70, 10):
+        generator.add_records(generate_copy(records[end - 10:end]))
+        assert generator.get_parser_yml() == get_fresh_parser_yml(records[:end], **config)
+
+
+def test_unchanged_model_is_rendered_alike():
+    records = generate_records(1)
+    generator = ParserGenerator(progress_interval=None)
+    generator.add_records(generate_copy(records))
+    parser_yml = generator.get_parser_yml()
+    # Records, which do not change the parser model, keep the rendered fragments.
+    generator.add_records(generate_copy(records))
+    assert generator.parser_dict['k'].fragment.valid
+    assert generator.get_parser_yml() == parser_yml
+
+
+def test_rendering_with_another_configuration():
+    records = generate_records(2)
+    generator = ParserGenerator(progress_interval=None)
+    generator.add_records(generate_copy(records))
+    generator.get_parser_yml()
+    generator.config['tab_string'] = '    '
+    assert generator.get_parser_yml() == get_fresh_parser_yml(records, tab_string='    ')
+
+
+def test_rendering_after_a_merge(write_log_file):
+    records = generate_records(4, record_num=80)
+    log_file = write_log_file(records[:40], 'first.txt')
+    generator = ParserGenerator(progress_interval=None, parallel_processes=2, parallel_chunk_size=256)
+    generator.add_files([log_file])
+    generator.get_parser_yml()
+    generator.add_files([write_log_file(records[40:], 'second.txt')])
+    assert generator.get_parser_yml() == get_fresh_parser_yml(records)
@@ -0,0 +1,105 @@
+"""This file tests that an analysis, which is continued from a snapshot, generates the same parser model as a single analysis.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import os
+import pickle
+
+import pytest
+
+from AECIDjsonpg import ParserGenerator
+from conftest import generate_records
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_snapshot_continues_with_new_files(write_log_file, tmp_path, seed):
+    records = generate_records(seed, record_num=60)
+    first_file = write_log_file(records[:30], 'first.txt')
+    second_file = write_log_file(records[30:], 'second.txt')
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+
+    generator = ParserGenerator(progress_interval=None)
+    generator.add_files([first_file])
+    generator.save_snapshot(snapshot_file)
+    resumed_generator = ParserGenerator(progress_interval=None)
+    resumed_generator.load_snapshot(snapshot_file)
+    resumed_generator.add_files([first_file, second_file])
+    # The first file has already been analyzed.
+    assert resumed_generator.line_count == 30
+
+    single_generator = ParserGenerator(progress_interval=None)
+    single_generator.add_files([first_file, second_file])
+    assert resumed_generator.get_parser_yml() == single_generator.get_parser_yml()
+
+
+def test_snapshot_continues_after_the_analyzed_part_of_a_file(write_log_file, tmp_path):
+    records = generate_records(7, record_num=60)
+    log_file = write_log_file(records[:30])
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, snapshot_file=snapshot_file)
+    generator.add_files()
+    generator.save_snapshot()
+
+    write_log_file(records)
+    resumed_generator = ParserGenerator(input_files=[log_file], progress_interval=None, snapshot_file=snapshot_file)
+    resumed_generator.load_snapshot()
+    resumed_generator.add_files()
+    assert resumed_generator.line_count == 30
+    assert resumed_generator.file_offsets[os.path.abspath(log_file)] == os.path.getsize(log_file)
+
+    single_generator = ParserGenerator(input_files=[log_file], progress_interval=None)
+    single_generator.add_files()
+    assert resumed_generator.get_parser_yml() == single_generator.get_parser_yml()
+
+
+def test_snapshot_of_a_split_analysis(write_log_file, tmp_path):
+    records = generate_records(3, record_num=60)
+    first_file = write_log_file(records[:30], 'first.txt')
+    second_file = write_log_file(records[30:], 'second.txt')
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+    generator = ParserGenerator(progress_interval=None, discriminator_key='k')
+    generator.add_files([first_file])
+    generator.save_snapshot(snapshot_file)
+    resumed_generator = ParserGenerator(progress_interval=None, discriminator_key='k')
+    resumed_generator.load_snapshot(snapshot_file)
+    resumed_generator.add_files([second_file])
+
+    single_generator = ParserGenerator(progress_interval=None, discriminator_key='k')
+    single_generator.add_files([first_file, second_file])
+    assert resumed_generator.get_parser_yml() == single_generator.get_parser_yml()
+
+
+def test_snapshot_with_another_configuration_is_rejected(write_log_file, tmp_path):
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+    generator = ParserGenerator(progress_interval=None)
+    generator.add_files([write_log_file(generate_records(0))])
+    generator.save_snapshot(snapshot_file)
+    with pytest.raises(ValueError, match='different configuration'):
+        ParserGenerator(list_element_max_num=5).load_snapshot(snapshot_file)
+    with pytest.raises(ValueError, match='different configuration'):
+        ParserGenerator(discriminator_key='k').load_snapshot(snapshot_file)
+
+
+def test_snapshot_of_another_version_is_rejected(tmp_path):
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+    with gzip.open(snapshot_file, 'wb') as f:
+        pickle.dump({'version': 0, 'config': {}, 'parser_dict': None, 'file_offsets': {}}, f)
+    with pytest.raises(ValueError, match='unsupported version'):
+        ParserGenerator().load_snapshot(snapshot_file)
+
+
+def test_snapshot_with_other_classes_is_rejected(tmp_path):
+    snapshot_file = str(tmp_path / 'snapshot.gz')
+    with gzip.open(snapshot_file, 'wb') as f:
+        pickle.dump({'version': 0, 'parser_dict': os.getcwd}, f)
+    with pytest.raises(pickle.UnpicklingError):
+        ParserGenerator().load_snapshot(snapshot_file)
@@ -0,0 +1,103 @@
+"""This file tests that the validator matches the log lines, from which the parser model was generated.
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import random
+
+import pytest
+
+import JSONPGValidator
+from AECIDjsonpg import ParserGenerator
+
+# A log line, which is valid JSON, but nested too deeply for the recursive json backend.
+deep_line = '[' * 100000 + ']' * 100000
+
+
+# This function generates the parser model of the log file, writes it to the parser file in the temporary directory and returns
+# the path of the parser file.
+def write_parser_file(tmp_path, log_file, **config):
+    parser_file = str(tmp_path / 'parser.yml')
+    generator = ParserGenerator(input_files=[log_file], progress_interval=None, **config)
+    generator.add_files()
+    generator.write_parser(parser_file)
+    return parser_file
+
+
+# This function returns records with all types of end nodes, which the parser generator emits.
+def get_records():
+    records = []
+    for i in range(30):
+        records.append({'time': '2024-01-0%dT10:00:00.%06dZ' % (i % 9 + 1, i), 'fixed': 'a', 'word': 'wxy'[i % 3],
+                        'int': i - 10 if i % 2 else i, 'float': i / 4, 'var': 'text %d' % (i * 7919), 'times': [
+                        '2024-01-01T10:00:0%d.000000Z' % (i % 10)], 'null': None if i % 3 else 'n',
+                        'list': [{'a': str(i), 'b': i % 2 == 0}]})
+        if i % 4 == 0:
+            records[-1]['optional'] = 'o'
+    return records
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_generated_model_matches_its_log_lines(write_log_file, tmp_path, processes):
+    log_file = write_log_file(get_records())
+    parser_file = write_parser_file(tmp_path, log_file)
+    report = JSONPGValidator.validate(parser_file, [log_file], processes=processes, chunk_size=256)
+    assert report['lines'] == 30
+    assert report['match_rate'] == 1.0
+    assert report['failures'] == []
+
+
+# This function returns random records, whose keys are optional and nullable, but keep the types of their values, since the parser
+# model only describes the first type of an inconsistent node.
+def generate_consistent_records(seed, record_num=60):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(record_num):
+        record = {}
+        if rng.random() < 0.7:
+            record['word'] = rng.choice(['x', 'y', 'z']) if rng.random() < 0.8 else None
+        if rng.random() < 0.7:
+            record['int'] = rng.randint(-5, 500)
+        if rng.random() < 0.7:
+            record['items'] = [{'name': rng.choice(['a', 'b']), 'size': rng.randint(0, 9)} for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.7:
+            record['nested'] = {'text': 'value ' + str(rng.randint(0, 1000)), 'tags': [rng.choice(['p', 'q'])]}
+        records.append(record)
+    return records
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_generated_model_matches_random_log_lines(write_log_file, tmp_path, seed):
+    log_file = write_log_file(generate_consistent_records(seed))
+    parser_file = write_parser_file(tmp_path, log_file)
+    assert JSONPGValidator.validate(parser_file, [log_file])['match_rate'] == 1.0
+
+
+def test_split_model_matches_its_log_lines(write_log_file, tmp_path):
+    log_file = write_log_file(generate_consistent_records(3, record_num=100))
+    parser_file = write_parser_file(tmp_path, log_file, discriminator_key='word')
+    assert JSONPGValidator.validate(parser_file, [log_file])['match_rate'] == 1.0
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_failing_log_lines_are_reported(write_log_file, tmp_path, processes):
+    records = get_records()
+    parser_file = write_parser_file(tmp_path, write_log_file(records))
+    records[5]['fixed'] = 'b'
+    del records[7]['int']
+    records[9]['unknown'] = 'u'
+    lines = [record for record in records] + ['{"time":', deep_line]
+    log_file = write_log_file(lines, 'other.txt')
+    report = JSONPGValidator.validate(parser_file, [log_file], backend='json', processes=processes, chunk_size=256)
+    assert report['lines'] == 32
+    assert report['matched_lines'] == 27
+    assert [failure['line'] for failure in report['failures']] == [6, 8, 10, 31, 32]
+    assert report['failures'][3]['reason'] == report['failures'][4]['reason'] == 'invalid JSON'
+    assert all(failure['file'] == log_file for failure in report['failures'])